@@ -0,0 +1,74 @@
+"""
+Benchmark of 3MF export of an N x N grid of finely meshed spheres (5 x 5 by
+default), building the whole XML tree in memory as previously done and streaming
+it into the archive.
+
+Usage: python benchmarks/bench_3mf.py [N]
+"""
+
+import sys
+import xml.etree.cElementTree as ET
+from io import BytesIO
+from time import perf_counter
+from tracemalloc import start, stop, get_traced_memory
+from zipfile import ZipFile, ZIP_DEFLATED
+
+from cadquery import Compound, Location, Solid
+from cadquery.occ_impl.exporters.threemf import ThreeMFWriter
+
+
+def baseline(shapes, f):
+
+    # previous implementation: one element per vertex and triangle
+    model = ET.Element("model")
+    resources = ET.SubElement(model, "resources")
+
+    for i, s in enumerate(shapes):
+        vertices, triangles = s.tessellate(1e-3, 0.1)
+
+        obj = ET.SubElement(resources, "object", id=str(i), type="model")
+        mesh = ET.SubElement(obj, "mesh")
+
+        vs = ET.SubElement(mesh, "vertices")
+        for v in vertices:
+            ET.SubElement(vs, "vertex", x=str(v.x), y=str(v.y), z=str(v.z))
+
+        ts = ET.SubElement(mesh, "triangles")
+        for t in triangles:
+            ET.SubElement(ts, "triangle", v1=str(t[0]), v2=str(t[1]), v3=str(t[2]))
+
+    with ZipFile(f, "w", ZIP_DEFLATED) as zf:
+        zf.writestr("3D/3dmodel.model", ET.tostring(model, xml_declaration=True))
+
+
+def main(n: int = 5):
+
+    sphere = Solid.makeSphere(1)
+    shapes = [
+        sphere.moved(Location((3 * i, 3 * j, 0))) for i in range(n) for j in range(n)
+    ]
+    c = Compound.makeCompound(shapes)
+    c.mesh(1e-3, 0.1)
+
+    ntri = sum(len(s.tessellate(1e-3, 0.1)[1]) for s in shapes)
+    print(f"{n * n} spheres, {ntri} triangles")
+
+    for name, f in (
+        ("baseline", lambda: baseline(shapes, BytesIO())),
+        ("streaming", lambda: ThreeMFWriter(c, 1e-3, 0.1).write3mf(BytesIO())),
+    ):
+        t0 = perf_counter()
+        f()
+        t1 = perf_counter()
+
+        # peak memory is measured in a separate run, tracing slows down the export
+        start()
+        f()
+        _, peak = get_traced_memory()
+        stop()
+
+        print(f"{name} {t1 - t0:.3f}s {peak / 1e6:.0f}MB")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,60 @@
+"""
+Benchmark of classifying N random points (20000 by default) with respect to a
+filleted plate with holes and a dome, with the exact classifier and with ray
+parity on triangulations of increasing resolution.
+
+Usage: python benchmarks/bench_classify.py [N]
+"""
+
+import sys
+from time import perf_counter
+
+from numpy.random import default_rng
+
+from cadquery import Workplane
+
+
+def main(n: int = 20000):
+
+    part = (
+        Workplane()
+        .box(40, 30, 10)
+        .faces(">Z")
+        .workplane()
+        .rarray(8, 8, 4, 3)
+        .hole(3)
+        .edges("|Z")
+        .fillet(2)
+        .union(Workplane().sphere(8).translate((0, 0, 8)))
+        .val()
+    )
+
+    pts = default_rng(0).uniform((-25, -20, -8), (25, 20, 18), (n, 3))
+
+    t0 = perf_counter()
+    exact = part.classify(pts)
+    t1 = perf_counter()
+
+    print(f"exact              {t1 - t0:7.3f}s")
+
+    for tol in (1e-2, 1e-3, 1e-4):
+        # a copy without the triangulation of the previous tolerance
+        shape = part.copy()
+
+        t0 = perf_counter()
+        rv = shape.classify(pts, mesh=tol)
+        t1 = perf_counter()
+
+        triangles = len(shape._tessellateArrays(tol)[1])
+
+        # points closer to the boundary than the tolerance may differ
+        diff = ((rv != exact) & (exact != 2)).sum()
+
+        print(
+            f"mesh={tol:<6} {triangles:6} triangles {t1 - t0:7.3f}s"
+            f" {diff} points differ"
+        )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
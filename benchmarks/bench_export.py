@@ -0,0 +1,46 @@
+"""
+Benchmark of exporting a plate with an N x N grid of holes (10 x 10 by default)
+to STL, 3MF, AMF, TJS, GLB and STEP, one call per format and with a single
+export_many call.
+
+Usage: python benchmarks/bench_export.py [N]
+"""
+
+import sys
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from cadquery import Assembly, Workplane, exporters
+
+
+FORMATS = ("stl", "3mf", "amf", "tjs", "glb", "step")
+
+
+def main(n: int = 10):
+
+    w = Workplane().box(2 * n, 2 * n, 1).faces(">Z").workplane().rarray(2, 2, n, n)
+    s = w.hole(1).val()
+
+    with TemporaryDirectory() as d:
+
+        # previous approach: every call meshes a fresh copy
+        t0 = perf_counter()
+        for ext in FORMATS:
+            if ext == "glb":
+                Assembly().add(s.copy()).export(f"{d}/a.{ext}", tolerance=0.01)
+            else:
+                exporters.export(s.copy(), f"{d}/a.{ext}", tolerance=0.01)
+        t1 = perf_counter()
+        res = exporters.export_many(
+            s.copy(), [f"{d}/b.{ext}" for ext in FORMATS], tolerance=0.01
+        )
+        t2 = perf_counter()
+
+    for r in res:
+        print(f"{r.exportType:5} {r.time:.3f}s {r.size / 1e6:.2f}MB")
+
+    print(f"one by one {t1 - t0:.3f}s export_many {t2 - t1:.3f}s")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,59 @@
+"""
+Benchmark of GLB export with RWGltf_CafWriter and with the quantized writer, for a
+build plate with N copies of the same bracket (50 by default) and for N independent
+copies.
+
+Usage: python benchmarks/bench_glb.py [N]
+"""
+
+import sys
+from io import BytesIO
+from time import perf_counter
+
+from cadquery import Assembly, Color, Location, Workplane
+
+
+def main(n: int = 50):
+
+    bracket = (
+        Workplane()
+        .box(20, 10, 2)
+        .faces(">Z")
+        .workplane()
+        .pushPoints([(-6, 0), (6, 0)])
+        .hole(3)
+        .edges("|Z")
+        .fillet(1)
+        .val()
+    )
+
+    for name, part in (("instances", lambda: bracket), ("copies", bracket.copy)):
+        assy = Assembly(name="plate")
+
+        for i in range(n):
+            assy.add(
+                part(),
+                name=f"bracket{i}",
+                loc=Location((25 * (i % 10), 15 * (i // 10), 0)),
+                color=Color("orange"),
+            )
+
+        sizes = []
+
+        for quantize in (False, True):
+            f = BytesIO()
+
+            t0 = perf_counter()
+            assy.export(f, "GLB", tolerance=0.01, quantize=quantize)
+            t1 = perf_counter()
+
+            sizes.append(len(f.getvalue()))
+            print(
+                f"{name:9} quantize={quantize!s:5} {t1 - t0:.3f}s {sizes[-1] / 1e3:.0f}kB"
+            )
+
+        print(f"{name:9} size reduction {1 - sizes[1] / sizes[0]:.0%}")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,55 @@
+"""
+Benchmark of the conversion of scanned points (an N x N grid, 1000 x 1000 by
+default) to OCCT arrays, through Vectors and directly from the NumPy array.
+
+Usage: python benchmarks/bench_harray.py [N]
+"""
+
+import sys
+from time import perf_counter
+
+from numpy import linspace, meshgrid, sin, stack
+
+from cadquery import Face, Vector
+from cadquery.occ_impl.shapes import _pts_to_harray, _pts_to_harray2
+
+
+def main(n: int = 1000):
+
+    x, y = meshgrid(linspace(0, 1, n), linspace(0, 1, n), indexing="ij")
+    grid = stack((x, y, 0.1 * sin(6 * x) * sin(6 * y)), axis=-1)
+
+    pts = grid.reshape(-1, 3)
+
+    print(f"{n * n} points")
+
+    t0 = perf_counter()
+    vecs = [Vector(*p) for p in pts.tolist()]
+    _pts_to_harray(vecs)
+    t1 = perf_counter()
+    _pts_to_harray(pts)
+    t2 = perf_counter()
+
+    print(f"1D: Vectors {t1 - t0:.3f}s array {t2 - t1:.3f}s")
+
+    t0 = perf_counter()
+    rows = [[Vector(*p) for p in row] for row in grid.tolist()]
+    _pts_to_harray2(rows)
+    t1 = perf_counter()
+    _pts_to_harray2(grid)
+    t2 = perf_counter()
+
+    print(f"2D: Vectors {t1 - t0:.3f}s array {t2 - t1:.3f}s")
+
+    # the fit itself is only timed on a coarser grid
+    step = max(n // 100, 1)
+
+    t0 = perf_counter()
+    Face.makeSplineApprox(grid[::step, ::step], tol=1e-3)
+    t1 = perf_counter()
+
+    print(f"surface fit on {grid[::step, ::step].shape[:2]} points {t1 - t0:.3f}s")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
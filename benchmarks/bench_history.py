@@ -0,0 +1,76 @@
+"""
+Benchmark of the history policies of CQContext for a chain of N steps (300 by
+default), unions of spheres with a plate and translations of the result, which copy
+it. Every policy is run in a separate process, the growth of the resident memory
+and the BIN size of the retained shapes are reported.
+
+Usage: python benchmarks/bench_history.py [N]
+"""
+
+import subprocess
+import sys
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Optional
+
+from cadquery import Workplane
+from cadquery.cq import CQContext
+
+
+def rss() -> float:
+    """
+    Resident memory of this process in MB.
+    """
+
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1e3
+
+    return 0
+
+
+def run(n: int, history: str, snapshotDir: Optional[str] = None):
+
+    w = Workplane()
+    w.ctx = CQContext(history, snapshotDir=snapshotDir)
+
+    m0 = rss()
+    t0 = perf_counter()
+
+    r = w.box(100, 100, 10).tag("base")
+    for i in range(n):
+        if i % 3:
+            # the moved part is a copy
+            r = r.translate((0, 0, 1))
+        else:
+            sphere = Workplane().sphere(2 + (i % 5) / 10)
+            r = r.union(sphere.translate((i % 10 * 9 - 40, i // 10 % 10 * 9 - 40, 5)))
+
+    t1 = perf_counter()
+    info = r.historyInfo()
+
+    name = history if snapshotDir is None else f"{history}+dir"
+    print(
+        f"{name:10} {t1 - t0:6.2f}s rss +{rss() - m0:5.1f}MB "
+        f"retained {info['retained'] / 1e6:5.2f}MB disk {info['disk'] / 1e6:5.2f}MB"
+    )
+
+
+def main(n: int = 300):
+
+    for history in ("full", "checkpoint", "tags", "tags+dir"):
+        subprocess.run([sys.executable, __file__, str(n), history], check=True)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2:
+        n, history = int(sys.argv[1]), sys.argv[2]
+
+        if history.endswith("+dir"):
+            with TemporaryDirectory() as d:
+                run(n, history[:-4], d)
+        else:
+            run(n, history)
+    else:
+        main(*map(int, sys.argv[1:]))
@@ -0,0 +1,52 @@
+"""
+Benchmark of instanced pattern holes on an N x N grid (100 x 100 by default).
+
+Half of the grid lies outside of the plate to exercise the pruning of the tools.
+Note that the boolean operation itself dominates and scales superlinearly with
+the number of holes, use a smaller N for a quick run.
+
+Usage: python benchmarks/bench_holes.py [N]
+"""
+
+import sys
+from time import perf_counter
+
+from cadquery import Workplane, Solid, Vector
+
+
+def baseline(w: Workplane, d: float) -> Solid:
+
+    # previous implementation: cleaned tool per point and an unpruned cut
+    h = Solid.makeCylinder(d / 2, 1, Vector(), Vector(0, 0, -1))
+    tools = w.eachpoint(lambda loc: h.moved(loc), True).vals()
+
+    return w.findSolid().cut(*tools).clean()
+
+
+def main(n: int = 100):
+
+    pitch = 2.0
+    plate = (
+        Workplane()
+        .center(n * pitch / 4, 0)
+        .box(n * pitch / 2, n * pitch, 1)
+        .faces(">Z")
+        .workplane(centerOption="ProjectedOrigin")
+    )
+    w = plate.rarray(pitch, pitch, n, n)
+
+    print(f"{n * n} holes, {n * n // 2} on the plate")
+
+    t0 = perf_counter()
+    ref = baseline(w, 0.5)
+    t1 = perf_counter()
+    res = w.hole(0.5).val()
+    t2 = perf_counter()
+
+    assert abs(ref.Volume() - res.Volume()) < 1e-6 * ref.Volume()
+
+    print(f"baseline {t1 - t0:.3f}s instanced {t2 - t1:.3f}s")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
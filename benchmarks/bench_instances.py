@@ -0,0 +1,49 @@
+"""
+Benchmark of 3MF and AMF export of a build plate with N copies of the same bracket
+(200 by default), with independent copies and with instances sharing one TShape.
+
+Usage: python benchmarks/bench_instances.py [N]
+"""
+
+import sys
+from os.path import getsize
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from cadquery import Compound, Location, Workplane, exporters
+
+
+def main(n: int = 200):
+
+    bracket = (
+        Workplane()
+        .box(20, 10, 2)
+        .faces(">Z")
+        .workplane()
+        .pushPoints([(-6, 0), (6, 0)])
+        .hole(3)
+        .edges("|Z")
+        .fillet(1)
+        .val()
+    )
+
+    locs = [Location((25 * (i % 20), 15 * (i // 20), 0)) for i in range(n)]
+    instances = Compound.makeCompound([bracket.moved(l) for l in locs])
+    copies = Compound.makeCompound([bracket.copy().moved(l) for l in locs])
+
+    print(f"{n} brackets")
+
+    with TemporaryDirectory() as d:
+        for ext in ("3mf", "amf"):
+            for name, c in (("copies", copies), ("instances", instances)):
+                fname = f"{d}/{name}.{ext}"
+
+                t0 = perf_counter()
+                exporters.export(c, fname, tolerance=0.01)
+                t1 = perf_counter()
+
+                print(f"{ext} {name:9} {t1 - t0:.3f}s {getsize(fname) / 1e6:.2f}MB")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
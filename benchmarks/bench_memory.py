@@ -0,0 +1,67 @@
+"""
+Benchmark of exporting a part N times (20 by default) to bytes in memory and, as
+previously required, to a temporary file that is read back and deleted.
+
+Usage: python benchmarks/bench_memory.py [N]
+"""
+
+import os
+import sys
+from io import BytesIO
+from tempfile import mkstemp
+from time import perf_counter
+
+from cadquery import Assembly, Workplane, exporters
+
+
+def main(n: int = 20):
+
+    part = (
+        Workplane()
+        .box(40, 30, 10)
+        .faces(">Z")
+        .workplane()
+        .rarray(8, 8, 4, 3)
+        .hole(3)
+        .edges("|Z")
+        .fillet(2)
+        .val()
+    )
+    part.mesh(0.1, 0.1)
+    assy = Assembly().add(part)
+
+    def writer(exportType):
+        if exportType == "GLB":
+            return lambda f: assy.export(f, "GLB")
+
+        return lambda f: exporters.export(part, f, exportType)
+
+    for exportType in ("STEP", "BREP", "VTP", "3MF", "STL", "VRML", "GLB"):
+        write = writer(exportType)
+
+        t0 = perf_counter()
+        for _ in range(n):
+            h, fname = mkstemp()
+            os.close(h)
+            write(fname)
+
+            with open(fname, "rb") as f:
+                f.read()
+
+            os.remove(fname)
+        t1 = perf_counter()
+
+        for _ in range(n):
+            f = BytesIO()
+            write(f)
+            f.getvalue()
+        t2 = perf_counter()
+
+        print(
+            f"{exportType:5} temp file {(t1 - t0) / n * 1e3:7.2f}ms"
+            f" memory {(t2 - t1) / n * 1e3:7.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,53 @@
+"""
+Benchmark of Plane coordinate transforms of 1e5 points, one at a time and in a
+single call on an (N, 3) array.
+
+Usage: python benchmarks/bench_plane.py [N]
+"""
+
+import sys
+from time import perf_counter
+
+from numpy import abs as np_abs
+from numpy.random import default_rng
+
+from cadquery import Plane, Vector, Workplane
+
+
+def main(n: int = 100_000):
+
+    plane = Plane(origin=(1, 2, 3), xDir=(1, 1, 0), normal=(0, -1, 1))
+    pts = default_rng(0).uniform(-10, 10, (n, 3))
+    vecs = [Vector(*p) for p in pts.tolist()]
+
+    print(f"{n} points")
+
+    t0 = perf_counter()
+    world_loop = [plane.toWorldCoords(v) for v in vecs]
+    t1 = perf_counter()
+    world = plane.toWorldCoords(pts)
+    t2 = perf_counter()
+
+    assert all(
+        np_abs(world[i] - world_loop[i].toTuple()).max() < 1e-9 for i in range(0, n, 97)
+    )
+
+    print(f"toWorldCoords: loop {t1 - t0:.3f}s array {t2 - t1:.4f}s")
+
+    t0 = perf_counter()
+    [plane.toLocalCoords(v) for v in vecs]
+    t1 = perf_counter()
+    plane.toLocalCoords(pts)
+    t2 = perf_counter()
+
+    print(f"toLocalCoords: loop {t1 - t0:.3f}s array {t2 - t1:.4f}s")
+
+    t0 = perf_counter()
+    Workplane(plane).pushPoints(pts[:, :2])
+    t1 = perf_counter()
+
+    print(f"pushPoints: {t1 - t0:.3f}s")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
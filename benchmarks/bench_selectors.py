@@ -0,0 +1,62 @@
+"""
+Benchmark of the vectorized direction and Nth selectors on a shape with 10k+ faces.
+
+Usage: python benchmarks/bench_selectors.py [N]
+"""
+
+import sys
+from timeit import timeit
+
+from cadquery import Solid, Compound, Vector, Location
+from cadquery.selectors import (
+    ParallelDirSelector,
+    PerpendicularDirSelector,
+    DirectionMinMaxSelector,
+)
+
+
+class ScalarParallel(ParallelDirSelector):
+    def test(self, vec):
+        return super().test(vec)
+
+
+class ScalarPerpendicular(PerpendicularDirSelector):
+    def test(self, vec):
+        return super().test(vec)
+
+
+class ScalarMinMax(DirectionMinMaxSelector):
+    def key(self, obj):
+        return super().key(obj)
+
+
+def main(n: int = 2000):
+
+    box = Solid.makeBox(1, 1, 1)
+    shape = Compound.makeCompound(
+        box.moved(Location(Vector(2 * (i % 50), 2 * (i // 50), 0), Vector(1, 1, 1), i))
+        for i in range(n)
+    )
+    faces = shape.Faces()
+
+    print(f"{len(faces)} faces")
+
+    d = Vector(0, 0, 1)
+
+    for vectorized, scalar in (
+        (ParallelDirSelector(d), ScalarParallel(d)),
+        (PerpendicularDirSelector(d), ScalarPerpendicular(d)),
+        (DirectionMinMaxSelector(d), ScalarMinMax(d)),
+    ):
+        assert vectorized.filter(faces) == scalar.filter(faces)
+
+        t_vec = timeit(lambda: vectorized.filter(faces), number=3) / 3
+        t_scalar = timeit(lambda: scalar.filter(faces), number=3) / 3
+
+        print(
+            f"{type(vectorized).__name__:<26} vectorized {t_vec:.3f}s scalar {t_scalar:.3f}s"
+        )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
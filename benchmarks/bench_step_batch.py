@@ -0,0 +1,55 @@
+"""
+Benchmark of STEP export of N parts (200 by default) to separate files, one
+Shape.exportStep call per part and in batches with 1 to the number of CPUs worker
+processes.
+
+Usage: python benchmarks/bench_step_batch.py [N]
+"""
+
+import sys
+from multiprocessing import cpu_count
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from cadquery import Workplane
+from cadquery.occ_impl.exporters import exportStepBatch
+
+
+def main(n: int = 200):
+
+    parts = [
+        Workplane()
+        .box(20 + i % 10, 10, 2)
+        .faces(">Z")
+        .workplane()
+        .pushPoints([(-6, 0), (6, 0)])
+        .hole(3)
+        .edges("|Z")
+        .fillet(1)
+        .val()
+        for i in range(n)
+    ]
+
+    print(f"{n} parts, {cpu_count()} CPUs")
+
+    with TemporaryDirectory() as d:
+        t0 = perf_counter()
+        for i, p in enumerate(parts):
+            p.exportStep(f"{d}/serial{i}.step")
+        t1 = perf_counter()
+
+        print(f"exportStep    {t1 - t0:.3f}s {n / (t1 - t0):.0f} files/s")
+
+        for processes in sorted({1, cpu_count()}):
+            report = exportStepBatch(
+                ((p, f"{d}/batch{i}.step") for i, p in enumerate(parts)), processes
+            )
+
+            print(
+                f"batch ({processes} proc) {report.time:.3f}s "
+                f"{report.throughput:.0f} files/s {len(report.failures)} failures"
+            )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
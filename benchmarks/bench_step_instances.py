@@ -0,0 +1,64 @@
+"""
+Benchmark of STEP assembly export with and without geometric deduplication, for a
+build plate with N brackets (50 by default), each built separately and colored in
+one of two colors.
+
+Usage: python benchmarks/bench_step_instances.py [N]
+"""
+
+import sys
+from io import BytesIO
+from time import perf_counter
+
+from cadquery import Assembly, Color, Location, Workplane
+from cadquery.occ_impl.assembly import countParts, toCAF
+
+
+def bracket() -> Workplane:
+
+    return (
+        Workplane()
+        .box(20, 10, 2)
+        .faces(">Z")
+        .workplane()
+        .pushPoints([(-6, 0), (6, 0)])
+        .hole(3)
+        .edges("|Z")
+        .fillet(1)
+    )
+
+
+def main(n: int = 50):
+
+    assy = Assembly(name="plate")
+
+    for i in range(n):
+        assy.add(
+            bracket(),
+            name=f"bracket{i}",
+            loc=Location((25 * (i % 10), 15 * (i // 10), 0)),
+            color=Color("orange" if i % 2 else "blue"),
+        )
+
+    times = []
+
+    for dedupe in (False, True):
+        parts, instances = countParts(toCAF(assy, True, dedupe=dedupe)[1])
+
+        f = BytesIO()
+
+        t0 = perf_counter()
+        assy.export(f, "STEP", dedupe=dedupe)
+        t1 = perf_counter()
+
+        times.append(t1 - t0)
+        print(
+            f"dedupe={dedupe!s:5} {parts} parts {instances} instances "
+            f"{times[-1]:.3f}s {len(f.getvalue()) / 1e3:.0f}kB"
+        )
+
+    print(f"time saved {times[0] - times[1]:.3f}s ({1 - times[1] / times[0]:.0%})")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
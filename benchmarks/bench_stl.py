@@ -0,0 +1,73 @@
+"""
+Benchmark of binary STL export of an N x N grid of finely meshed spheres (7 x 7 by
+default, about 1.25M triangles) with StlAPI_Writer and with the array based writer,
+starting from the shape, with serial and parallel face extraction, and from an
+existing array tessellation.
+
+Usage: python benchmarks/bench_stl.py [N]
+"""
+
+import sys
+from io import BytesIO
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from OCP.BRepMesh import BRepMesh_IncrementalMesh
+from OCP.StlAPI import StlAPI_Writer
+
+from cadquery import Compound, Location, Solid
+from cadquery.occ_impl.exporters.mesh import tessellateParallel
+from cadquery.occ_impl.exporters.stl import writeStl
+
+TOL = 1e-4
+ATOL = 0.1
+
+
+def main(n: int = 7):
+
+    shapes = [
+        Solid.makeSphere(1.2).moved(Location((3 * i, 3 * j, 0)))
+        for i in range(n)
+        for j in range(n)
+    ]
+    c = Compound.makeCompound(shapes)
+
+    # meshing is done by OCCT, faces are meshed in parallel
+    for parallel in (False, True):
+        t0 = perf_counter()
+        BRepMesh_IncrementalMesh(c.copy().wrapped, TOL, True, ATOL, parallel)
+        t1 = perf_counter()
+
+        print(f"mesh parallel={parallel} {t1 - t0:.3f}s")
+
+    BRepMesh_IncrementalMesh(c.wrapped, TOL, True, ATOL, True)
+
+    tessellation = c._tessellateArrays(TOL, ATOL)
+    print(f"{n * n} spheres, {len(tessellation[1])} triangles")
+
+    writer = StlAPI_Writer()
+    writer.ASCIIMode = False
+
+    with TemporaryDirectory() as d:
+        for name, f in (
+            ("StlAPI_Writer", lambda: writer.Write(c.wrapped, f"{d}/stlapi.stl")),
+            (
+                "serial extraction",
+                lambda: writeStl(c._tessellateArrays(TOL, ATOL), BytesIO()),
+            ),
+            (
+                "parallel extraction",
+                lambda: writeStl(tessellateParallel(c, TOL, ATOL), BytesIO()),
+            ),
+            ("arrays to file", lambda: writeStl(tessellation, f"{d}/arrays.stl")),
+            ("arrays to stream", lambda: writeStl(tessellation, BytesIO())),
+        ):
+            t0 = perf_counter()
+            f()
+            t1 = perf_counter()
+
+            print(f"{name:19} {t1 - t0:.3f}s")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
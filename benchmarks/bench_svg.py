@@ -0,0 +1,54 @@
+"""
+Benchmark of SVG export of the six standard views and an isometric view of N lines
+of extruded text (2 by default): one getSVG call per view, getSVGViews in a single
+process and in worker processes, with exact and polygonal hidden line removal.
+
+Usage: python benchmarks/bench_svg.py [N]
+"""
+
+import sys
+from time import perf_counter
+
+from cadquery import Workplane
+from cadquery.occ_impl.exporters.svg import getSVG, getSVGViews
+
+DIRS = [
+    (1, 0, 0),
+    (-1, 0, 0),
+    (0, 1, 0),
+    (0, -1, 0),
+    (0, 0, 1),
+    (0, 0, -1),
+    (1, 1, 1),
+]
+
+
+def main(n: int = 2):
+
+    w = Workplane()
+    for i in range(n):
+        w = w.add(Workplane().center(0, 15 * i).text("CadQuery HLR", 10, 3))
+
+    shape = w.combine().val()
+
+    print(f"{n} lines of text, {len(shape.Faces())} faces")
+
+    for name, f in (
+        ("getSVG", lambda s: [getSVG(s, {"projectionDir": d}) for d in DIRS]),
+        ("views 1 process", lambda s: getSVGViews(s, DIRS, processes=1)),
+        ("views", lambda s: getSVGViews(s, DIRS)),
+        ("fast 1 process", lambda s: getSVGViews(s, DIRS, {"fast": True}, 1)),
+        ("fast", lambda s: getSVGViews(s, DIRS, {"fast": True})),
+    ):
+        # fresh copy without triangulation, meshing is included in the fast timings
+        s = shape.copy()
+
+        t0 = perf_counter()
+        f(s)
+        t1 = perf_counter()
+
+        print(f"{name:16} {t1 - t0:.3f}s")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
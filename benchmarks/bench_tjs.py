@@ -0,0 +1,40 @@
+"""
+Benchmark of TJS export of a finely meshed sphere (tolerance 1e-4 by default) as
+JSON arrays and as binary meshes with embedded and sidecar buffers.
+
+Usage: python benchmarks/bench_tjs.py [-log10(tolerance)]
+"""
+
+import sys
+from os.path import getsize
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from cadquery import Solid, exporters
+
+
+def main(n: int = 4):
+
+    tol = 10.0 ** -n
+    s = Solid.makeSphere(5)
+    s.mesh(tol)
+
+    with TemporaryDirectory() as d:
+        for name, opt in (
+            ("json", None),
+            ("base64", {"binary": True, "buffers": "base64"}),
+            ("bin", {"binary": True, "buffers": "bin"}),
+        ):
+            t0 = perf_counter()
+            exporters.export(s, f"{d}/{name}.tjs", tolerance=tol, opt=opt)
+            t1 = perf_counter()
+
+            size = getsize(f"{d}/{name}.tjs")
+            if name == "bin":
+                size += getsize(f"{d}/{name}.bin")
+
+            print(f"{name:6} {t1 - t0:.3f}s {size / 1e6:.2f}MB")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -7,7 +7,7 @@ except PackageNotFoundError:
     __version__ = "2.7-dev"
 
 # these items point to the OCC implementation
-from .occ_impl.geom import Plane, BoundBox, Vector, Matrix, Location
+from .occ_impl.geom import Plane, BoundBox, Vector, Matrix, Location, LocationArray
 from .occ_impl.shapes import (
     Shape,
     Vertex,
@@ -55,6 +55,7 @@ __all__ = [
     "Matrix",
     "Vector",
     "Location",
+    "LocationArray",
     "sortWiresByBuildOrder",
     "Shape",
     "Vertex",
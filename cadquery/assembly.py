@@ -1,4 +1,5 @@
 from functools import reduce
+from io import BytesIO
 from typing import (
     Union,
     Optional,
@@ -526,6 +527,8 @@ class Assembly(object):
             See :meth:`~cadquery.occ_impl.exporters.assembly.exportAssembly`.
         :param ascii: STL only - Sets whether or not STL export should be text or binary
         :type ascii: bool
+        :param quantize: GLB only - Write a compact GLB using KHR_mesh_quantization
+        :type quantize: bool
         """
 
         return self.export(
@@ -534,7 +537,7 @@ class Assembly(object):
 
     def export(
         self,
-        path: str,
+        path: Union[str, BytesIO],
         exportType: Optional[ExportLiterals] = None,
         mode: STEPExportModeLiterals = "default",
         tolerance: float = 0.1,
@@ -544,8 +547,9 @@ class Assembly(object):
         """
         Save assembly to a file.
 
-        :param path: Path and filename for writing.
-        :param exportType: export format (default: None, results in format being inferred form the path)
+        :param path: Path and filename or a writable binary stream for writing.
+        :param exportType: export format (default: None, results in format being inferred form the path).
+            Required when writing to a stream.
         :param mode: STEP only - See :meth:`~cadquery.occ_impl.exporters.assembly.exportAssembly`.
         :param tolerance: the deflection tolerance, in model units. Only used for glTF, VRML. Default 0.1.
         :param angularTolerance: the angular tolerance, in radians. Only used for glTF, VRML. Default 0.1.
@@ -553,6 +557,8 @@ class Assembly(object):
             See :meth:`~cadquery.occ_impl.exporters.assembly.exportAssembly`.
         :param ascii: STL only - Sets whether or not STL export should be text or binary
         :type ascii: bool
+        :param quantize: GLB only - Write a compact GLB using KHR_mesh_quantization
+        :type quantize: bool
         """
 
         # Make sure the export mode setting is correct
@@ -560,6 +566,11 @@ class Assembly(object):
             raise ValueError(f"Unknown assembly export mode {mode} for STEP")
 
         if exportType is None:
+            if not isinstance(path, str):
+                raise ValueError(
+                    "Specify export type explicitly when exporting to a stream"
+                )
+
             t = path.split(".")[-1].upper()
             if t in ("STEP", "XML", "XBF", "VRML", "VTKJS", "GLTF", "GLB", "STL"):
                 exportType = cast(ExportLiterals, t)
@@ -575,7 +586,16 @@ class Assembly(object):
         elif exportType == "VRML":
             exportVRML(self, path, tolerance, angularTolerance)
         elif exportType == "GLTF" or exportType == "GLB":
-            exportGLTF(self, path, None, tolerance, angularTolerance)
+            # streams have no extension to infer binary from
+            binary = None if isinstance(path, str) else exportType == "GLB"
+            exportGLTF(
+                self,
+                path,
+                binary,
+                tolerance,
+                angularTolerance,
+                bool(kwargs.get("quantize", False)),
+            )
         elif exportType == "VTKJS":
             exportVTKJS(self, path)
         elif exportType == "STL":
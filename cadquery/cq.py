@@ -1,9 +1,15 @@
 # Copyright (c) CadQuery Development Team.
 # Distributed under the terms of the Apache 2 License.
 
+import atexit
 import math
+import os
 from copy import copy
+from io import BytesIO
 from itertools import chain
+from tempfile import mkstemp
+from concurrent.futures import Executor, ProcessPoolExecutor
+from weakref import ref, finalize, ReferenceType, WeakKeyDictionary
 from typing import (
     overload,
     Sequence,
@@ -18,12 +24,15 @@ from typing import (
     cast,
     Dict,
     Iterator,
+    TYPE_CHECKING,
 )
 from typing_extensions import Literal
 from inspect import Parameter, Signature
 
+from numpy import arange, float64, meshgrid, ndarray, stack
+from numpy.typing import NDArray
 
-from .occ_impl.geom import Vector, Plane, Location
+from .occ_impl.geom import Vector, Plane, Location, LocationArray, _toPoints
 from .occ_impl.shapes import (
     Shape,
     Vertex,
@@ -40,7 +49,7 @@ from .occ_impl.shapes import (
 from .occ_impl.exporters.svg import getSVG, exportSVG
 from .occ_impl.exporters import export
 
-from .utils import deprecate, deprecate_kwarg_name, get_arity
+from .utils import deprecate, deprecate_kwarg_name, get_arity, mpContext
 
 from .selectors import (
     Selector,
@@ -49,9 +58,14 @@ from .selectors import (
 
 from .sketch import Sketch
 
+if TYPE_CHECKING:
+    from .record import Graph
+
 CQObject = Union[Vector, Location, Shape, Sketch]
 VectorLike = Union[Tuple[float, float], Tuple[float, float, float], Vector]
 CombineMode = Union[bool, Literal["cut", "a", "s"]]  # a : additive, s: subtractive
+HistoryMode = Literal["full", "checkpoint", "tags"]
+ParallelMode = Union[bool, int, Executor]
 TOL = 1e-6
 
 T = TypeVar("T", bound="Workplane")
@@ -69,6 +83,253 @@ def _selectShapes(objects: Iterable[Any]) -> List[Shape]:
     return [el for el in objects if isinstance(el, Shape)]
 
 
+_pools: Dict[Optional[int], ProcessPoolExecutor] = {}
+
+
+@atexit.register
+def _shutdown():
+
+    for pool in _pools.values():
+        pool.shutdown(cancel_futures=True)
+
+    _pools.clear()
+
+
+def _map(
+    f: Callable[[Any], Any],
+    items: Sequence[Any],
+    parallel: ParallelMode = False,
+    chunksize: Optional[int] = None,
+) -> List[Any]:
+    """
+    Map f over items, optionally in worker processes. Workers are reused between
+    calls unless an executor is provided.
+    """
+
+    if not parallel:
+        return [f(el) for el in items]
+
+    if isinstance(parallel, Executor):
+        executor = parallel
+        workers = os.cpu_count() or 1
+    else:
+        if parallel is True:
+            workers = os.cpu_count() or 1
+        elif isinstance(parallel, int) and parallel > 0:
+            workers = parallel
+        else:
+            raise ValueError(
+                f"Invalid parallel value {parallel!r}, use a bool, a positive int or an Executor"
+            )
+
+        if workers not in _pools:
+            _pools[workers] = ProcessPoolExecutor(workers, mp_context=mpContext())
+
+        executor = _pools[workers]
+
+    # few chunks per worker to balance the load and limit the IPC overhead
+    if chunksize is None:
+        chunksize = max(1, math.ceil(len(items) / (4 * workers)))
+
+    return list(executor.map(f, items, chunksize=chunksize))
+
+
+def _selectSolids(objects: Iterable[Any]) -> List[Solid]:
+
+    rv = []
+
+    for obj in objects:
+        if isinstance(obj, Solid):
+            rv.append(obj)
+        # _entities(...) needed due to weird behavior with shelled object unpacking
+        elif isinstance(obj, Compound):
+            rv.extend(Solid(el) for el in obj._entities("Solid"))
+
+    return rv
+
+
+def _notifying(f: Callable[..., Any]) -> Callable[..., Any]:
+    def _f(self: "_Stack", *args):
+
+        rv = f(self, *args)
+        self._changed()
+
+        return rv
+
+    return _f
+
+
+class _Stack(List[Any]):
+    """
+    Stack of a Workplane. In place modifications are reported to the context
+    of its owners, so that the base index stays valid.
+    """
+
+    _owners: List[ReferenceType]
+
+    def __init__(self, *args):
+
+        super().__init__(*args)
+        self._owners = []
+
+    def __reduce__(self):
+
+        # owners are weakly referenced and registered again when unpickled
+        return (_Stack, (list(self),))
+
+    def _own(self, obj: "Workplane"):
+
+        if not any(r() is obj for r in self._owners):
+            self._owners.append(ref(obj))
+
+    def _changed(self):
+
+        for r in self._owners:
+            obj = r()
+            if obj is not None and obj._objects is self:
+                obj.ctx._modified(obj)
+
+    append = _notifying(list.append)
+    extend = _notifying(list.extend)
+    insert = _notifying(list.insert)
+    pop = _notifying(list.pop)
+    remove = _notifying(list.remove)
+    clear = _notifying(list.clear)
+    __setitem__ = _notifying(list.__setitem__)
+    __delitem__ = _notifying(list.__delitem__)
+    __iadd__ = _notifying(list.__iadd__)
+    __imul__ = _notifying(list.__imul__)
+
+
+class _Snapshot(object):
+    """
+    Stack of a trimmed Workplane. Shapes are held by weak references, so that
+    they are released once not used anymore. If a snapshot directory is given,
+    they are also written there in the BIN format and can be restored after
+    being released.
+    """
+
+    refs: List[Optional[ReferenceType]]
+    others: List[Any]
+    classes: List[type]
+    states: List[Dict[str, Any]]
+    data: Optional[bytes]
+    path: Optional[str]
+
+    def __init__(self, objects: List[CQObject], snapshotDir: Optional[str] = None):
+
+        shapes = _selectShapes(objects)
+
+        self.refs = [ref(o) if isinstance(o, Shape) else None for o in objects]
+        self.others = [None if isinstance(o, Shape) else o for o in objects]
+        self.classes = [type(o) for o in objects]
+        self.states = [
+            {k: v for k, v in s.__dict__.items() if k != "wrapped"} for s in shapes
+        ]
+
+        self.data = None
+        self.path = None
+
+        if snapshotDir is not None and shapes:
+            fd, self.path = mkstemp(suffix=".bin", dir=snapshotDir)
+            os.close(fd)
+
+            Compound.makeCompound(shapes).exportBin(self.path)
+
+            finalize(self, _Snapshot._remove, self.path)
+
+    @staticmethod
+    def _remove(path: str):
+
+        if os.path.exists(path):
+            os.remove(path)
+
+    def __getstate__(self) -> Dict[str, Any]:
+
+        rv = self.__dict__.copy()
+
+        # weak references cannot be pickled, shapes are restored from data
+        rv["refs"] = [None if r is None else False for r in self.refs]
+        rv["data"] = self._read()
+        rv["path"] = None
+
+        return rv
+
+    def _shapes(self) -> Optional[List[Shape]]:
+
+        shapes = [r() if r else None for r in self.refs if r is not None]
+
+        return None if any(s is None for s in shapes) else cast(List[Shape], shapes)
+
+    def _read(self) -> Optional[bytes]:
+
+        if self.path is not None:
+            with open(self.path, "rb") as f:
+                return f.read()
+
+        shapes = self._shapes()
+
+        if shapes is not None:
+            stream = BytesIO()
+            Compound.makeCompound(shapes).exportBin(stream)
+
+            return stream.getvalue()
+
+        return self.data
+
+    def contains(self, types: Tuple[type, ...]) -> bool:
+        """
+        Check if objects of given types might be present without restoring.
+        """
+
+        return any(issubclass(t, types + (Compound,)) for t in self.classes)
+
+    def size(self) -> int:
+        """
+        Size of the serialized data.
+        """
+
+        if self.path is not None:
+            return os.path.getsize(self.path)
+
+        return len(self.data or b"")
+
+    def restore(self) -> List[Any]:
+        """
+        Restore the original objects. If any of the shapes is not alive
+        anymore, all shapes are restored from the serialized data.
+
+        :raises ValueError: if the shapes were released and not serialized.
+        """
+
+        shapes = self._shapes()
+
+        if shapes is None:
+            data = self.data if self.path is None else self._read()
+
+            if data is None:
+                raise ValueError(
+                    "The shapes of this object were released by the history policy"
+                )
+
+            classes = [c for c, r in zip(self.classes, self.refs) if r is not None]
+            shapes = []
+
+            for el, cls, state in zip(
+                Compound.importBin(BytesIO(data)), classes, self.states
+            ):
+                obj: Shape = object.__new__(cls)
+                obj.wrapped = el.wrapped
+                obj.__dict__.update(state)
+                shapes.append(obj)
+
+        it = iter(shapes)
+
+        return [
+            next(it) if r is not None else o for r, o in zip(self.refs, self.others)
+        ]
+
+
 class CQContext(object):
     """
     A shared context for modeling.
@@ -82,8 +343,33 @@ class CQContext(object):
     firstPoint: Optional[Vector]
     tolerance: float
     tags: Dict[str, "Workplane"]
+    history: HistoryMode
+    checkpoint: int
+    snapshotDir: Optional[str]
+    graph: Optional["Graph"]
+
+    _pending: List[ReferenceType]
+    _bases: "WeakKeyDictionary[Workplane, Tuple[int, Optional[ReferenceType]]]"
+    _version: int
 
-    def __init__(self):
+    def __init__(
+        self,
+        history: HistoryMode = "full",
+        checkpoint: int = 10,
+        snapshotDir: Optional[str] = None,
+    ):
+        """
+        :param history: History retention policy. "full" keeps the stacks of all
+            intermediate objects in memory. "checkpoint" keeps every checkpoint-th
+            object and the tagged ones. "tags" keeps only the tagged ones. Stacks
+            of other intermediate objects only weakly reference their shapes and
+            are restored on access (e.g. by end or findSolid) while the shapes
+            are alive.
+        :param checkpoint: Checkpoint interval.
+        :param snapshotDir: Directory to write the shapes of trimmed stacks to,
+            so that they can be restored after being released. If None, they are
+            not written and accessing a released stack raises a ValueError.
+        """
         self.pendingWires = (
             []
         )  # a list of wires that have been created and need to be extruded
@@ -95,6 +381,136 @@ class CQContext(object):
         self.tolerance = 0.0001  # user specified tolerance
         self.tags = {}
 
+        self.history = history
+        self.checkpoint = checkpoint
+        self.snapshotDir = snapshotDir
+
+        self.graph = None  # recorded operations
+
+        self._pending = []  # trimming candidates holding solids
+
+        self._bases = WeakKeyDictionary()  # nearest object with solids
+        self._version = 0  # incremented when the index is invalidated
+
+    def __getstate__(self) -> Dict[str, Any]:
+
+        rv = self.__dict__.copy()
+
+        # weak references cannot be pickled
+        rv["_pending"] = []
+        rv["_bases"] = None
+
+        # recorded operations are not pickled
+        rv["graph"] = None
+
+        return rv
+
+    def __setstate__(self, state: Dict[str, Any]):
+
+        self.__dict__.update(state)
+        self._bases = WeakKeyDictionary()
+
+    def _base(self, obj: "Workplane") -> Optional["Workplane"]:
+        """
+        Find the nearest object in the parent chain (including obj) with solids
+        on its stack. Results are indexed, so that repeated lookups and lookups
+        from newly created objects take constant time.
+        """
+
+        visited = []
+        rv = None
+
+        node: Optional[Workplane] = obj
+        while node is not None:
+            entry = self._bases.get(node)
+
+            # bases are weakly referenced to not keep the keys alive
+            if entry is not None and entry[0] == self._version:
+                if entry[1] is None:
+                    break
+                elif entry[1]() is not None:
+                    rv = entry[1]()
+                    break
+
+            visited.append(node)
+
+            # avoid restoring trimmed stacks without solids
+            if (
+                node._snapshot is None or node._snapshot.contains((Solid,))
+            ) and _selectSolids(node.objects):
+                rv = node
+                break
+
+            node = node.parent
+
+        for el in visited:
+            self._bases[el] = (self._version, ref(rv) if rv else None)
+
+        return rv
+
+    def _modified(self, obj: "Workplane"):
+        """
+        Invalidate the index if solids were added to or removed from the stack
+        of an indexed object.
+        """
+
+        entry = self._bases.get(obj)
+
+        if entry is not None and entry[0] == self._version:
+            base = entry[1]() if entry[1] else None
+
+            if (base is obj) != bool(_selectSolids(obj._objects)):
+                self._version += 1
+
+    def _retained(self, obj: "Workplane") -> bool:
+        """
+        Check if the stack of obj is retained by the history policy.
+        """
+
+        if self.history == "full" or obj._tag is not None:
+            return True
+        elif self.history == "checkpoint":
+            return obj._depth % max(self.checkpoint, 1) == 0
+
+        return False
+
+    def _trim(self, obj: "Workplane"):
+        """
+        Replace the stack of obj by a snapshot unless it is retained.
+        """
+
+        if obj._snapshot is None and not self._retained(obj):
+            obj._snapshot = _Snapshot(obj._objects, self.snapshotDir)
+            obj._objects = []
+
+    def _update(self, obj: "Workplane"):
+        """
+        Apply the history policy after obj was created.
+        """
+
+        if self.history == "full":
+            return
+
+        # the new object holds a solid, so older solids are not the base anymore
+        if any(isinstance(o, (Solid, Compound)) for o in obj._objects):
+            for r in self._pending:
+                el = r()
+                if el is not None and el is not obj:
+                    self._trim(el)
+
+            self._pending = [ref(obj)]
+
+        # trim the grandparent, the parent can be still used by the new object
+        parent = obj.parent.parent if obj.parent else None
+
+        if parent is None or parent._snapshot is not None:
+            pass
+        elif any(isinstance(o, (Solid, Compound)) for o in parent._objects):
+            if not any(r() is parent for r in self._pending):
+                self._pending.append(ref(parent))
+        else:
+            self._trim(parent)
+
     def popPendingEdges(self, errorOnEmpty: bool = True) -> List[Edge]:
         """
         Get and clear pending edges.
@@ -146,12 +562,14 @@ class Workplane(object):
         :meth:`workplane`
     """
 
-    objects: List[CQObject]
     ctx: CQContext
     parent: Optional["Workplane"]
     plane: Plane
 
     _tag: Optional[str]
+    _objects: List[CQObject]
+    _snapshot: Optional[_Snapshot] = None
+    _depth: int = 0
 
     @overload
     def __init__(self, obj: CQObject) -> None:
@@ -201,15 +619,90 @@ class Workplane(object):
             )
 
         self.plane = tmpPlane
+        self.parent = None
+        self.ctx = CQContext()
+        self._tag = None
+
         # Changed so that workplane has the center as the first item on the stack
         if obj:
             self.objects = [obj]
         else:
             self.objects = []
 
-        self.parent = None
-        self.ctx = CQContext()
-        self._tag = None
+    @property
+    def objects(self) -> List[CQObject]:
+        """
+        Objects on the stack.
+        """
+
+        if self._snapshot is not None:
+            self._setObjects(self._snapshot.restore())
+            self._snapshot = None
+
+            if any(isinstance(o, (Solid, Compound)) for o in self._objects):
+                self.ctx._pending.append(ref(self))
+
+        return self._objects
+
+    @objects.setter
+    def objects(self, objects: List[CQObject]):
+
+        self._setObjects(objects)
+        self._snapshot = None
+
+        self.ctx._modified(self)
+
+    def _setObjects(self, objects: List[CQObject]):
+
+        # the stack can be modified in place, which is reported to the context
+        stack = objects if isinstance(objects, _Stack) else _Stack(objects)
+        stack._own(self)
+
+        self._objects = stack
+
+    def __setstate__(self, state: Dict[str, Any]):
+
+        # also used by copy, the stack can be shared with the copy
+        self.__dict__.update(state)
+
+        if isinstance(self._objects, _Stack):
+            self._objects._own(self)
+
+    def historyInfo(self) -> Dict[str, int]:
+        """
+        Report the memory retained by the history of this object.
+
+        :return: dictionary with the number of objects in the parent chain
+            ("nodes"), the number of objects with trimmed stacks ("trimmed"),
+            the number of retained shapes ("shapes"), the BIN size of the retained
+            shapes ("retained") and the size of the snapshots in memory
+            ("memory") and on disk ("disk") in bytes.
+        """
+
+        rv = dict(nodes=0, trimmed=0, shapes=0, retained=0, memory=0, disk=0)
+        shapes = []
+
+        node: Optional[Workplane] = self
+        while node is not None:
+            rv["nodes"] += 1
+
+            if node._snapshot is not None:
+                rv["trimmed"] += 1
+                key = "disk" if node._snapshot.path else "memory"
+                rv[key] += node._snapshot.size()
+            else:
+                shapes.extend(_selectShapes(node._objects))
+
+            node = node.parent
+
+        rv["shapes"] = len(shapes)
+
+        if shapes:
+            stream = BytesIO()
+            Compound.makeCompound(shapes).exportBin(stream)
+            rv["retained"] = len(stream.getvalue())
+
+        return rv
 
     def tag(self: T, name: str) -> T:
         """
@@ -445,6 +938,9 @@ class Workplane(object):
             self._mergeTags(obj)
         else:
             self.objects.append(obj)
+
+        self.ctx._modified(self)
+
         return self
 
     def val(self) -> CQObject:
@@ -652,6 +1148,9 @@ class Workplane(object):
         s = self.__class__(plane)
         s.parent = self
         s.ctx = self.ctx
+        s._depth = self._depth + 1
+
+        self.ctx._update(s)
 
         # a new workplane has the center of the workplane on the stack
         return s
@@ -667,6 +1166,10 @@ class Workplane(object):
         out = copy(obj)
         out.parent = self
         out.ctx = self.ctx
+        out._depth = self._depth + 1
+
+        self.ctx._update(out)
+
         return out
 
     def workplaneFromTagged(self, name: str) -> "Workplane":
@@ -733,7 +1236,20 @@ class Workplane(object):
 
     def _findType(self, types, searchStack=True, searchParents=True):
 
-        if searchStack:
+        # solids are looked up using the index of the context
+        if types == (Solid,) and searchParents:
+            base = (
+                self.ctx._base(self)
+                if searchStack
+                else self.parent and self.ctx._base(self.parent)
+            )
+
+            return Compound.makeCompound(_selectSolids(base.objects)) if base else None
+
+        # avoid restoring trimmed stacks without relevant objects
+        if searchStack and (
+            self._snapshot is None or self._snapshot.contains(tuple(types))
+        ):
             rv = []
             for obj in self.objects:
                 if isinstance(obj, types):
@@ -1385,6 +1901,11 @@ class Workplane(object):
         ns.parent = self
         ns.objects = list(objlist)
         ns.ctx = self.ctx
+        ns._depth = self._depth + 1
+
+        self.ctx._update(ns)
+        self.ctx._base(ns)
+
         return ns
 
     def _findFromPoint(self, useLocalCoords: bool = False) -> Vector:
@@ -1476,18 +1997,19 @@ class Workplane(object):
         if isinstance(center, bool):
             center = (center, center)
 
-        lpoints = []  # coordinates relative to bottom left point
-        for x in range(xCount):
-            for y in range(yCount):
-                lpoints.append(Vector(xSpacing * x, ySpacing * y))
+        # coordinates relative to bottom left point
+        x, y = meshgrid(
+            arange(xCount, dtype=float64) * xSpacing,
+            arange(yCount, dtype=float64) * ySpacing,
+            indexing="ij",
+        )
+        lpoints = stack((x.ravel(), y.ravel()), axis=1)
 
         # shift points down and left relative to origin if requested
-        offset = Vector()
         if center[0]:
-            offset += Vector(-xSpacing * (xCount - 1) * 0.5, 0)
+            lpoints[:, 0] -= xSpacing * (xCount - 1) * 0.5
         if center[1]:
-            offset += Vector(0, -ySpacing * (yCount - 1) * 0.5)
-        lpoints = [x + offset for x in lpoints]
+            lpoints[:, 1] -= ySpacing * (yCount - 1) * 0.5
 
         return self.pushPoints(lpoints)
 
@@ -1544,13 +2066,15 @@ class Workplane(object):
 
         return self.pushPoints(locs)
 
-    def pushPoints(self: T, pntList: Iterable[Union[VectorLike, Location]]) -> T:
+    def pushPoints(
+        self: T, pntList: Union[Iterable[Union[VectorLike, Location]], NDArray[float64]]
+    ) -> T:
         """
         Pushes a list of points onto the stack as vertices.
         The points are in the 2D coordinate space of the workplane face
 
         :param pntList: a list of points to push onto the stack
-        :type pntList: list of 2-tuples, in *local* coordinates
+        :type pntList: list of 2-tuples or an (N, 2) array, in *local* coordinates
         :return: a new workplane with the desired points on the stack.
 
         A common use is to provide a list of points for a subsequent operation, such as creating
@@ -1569,11 +2093,21 @@ class Workplane(object):
         Here the circle function operates on all three points, and is then extruded to create three
         holes. See :meth:`circle` for how it works.
         """
-        vecs: List[Union[Location, Vector]] = []
-        for pnt in pntList:
-            vecs.append(
-                pnt if isinstance(pnt, Location) else self.plane.toWorldCoords(pnt)
+        vecs: List[Union[Location, Vector]]
+
+        # points are converted to global coordinates all at once
+        if isinstance(pntList, ndarray):
+            vecs = [Vector(*p) for p in self.plane.toWorldCoords(pntList).tolist()]
+        else:
+            pntList = list(pntList)
+            pnts = iter(
+                self.plane.toWorldCoords(
+                    _toPoints(p for p in pntList if not isinstance(p, Location))
+                ).tolist()
             )
+            vecs = [
+                p if isinstance(p, Location) else Vector(*next(pnts)) for p in pntList
+            ]
 
         return self.newObject(vecs)
 
@@ -1830,7 +2364,7 @@ class Workplane(object):
         self, pts: Iterable[VectorLike], includeCurrent: bool
     ) -> List[Vector]:
 
-        vecs = [self.plane.toWorldCoords(p) for p in pts]
+        vecs = [Vector(*p) for p in self.plane.toWorldCoords(_toPoints(pts)).tolist()]
 
         if includeCurrent:
             gstartPoint = self._findFromPoint(False)
@@ -2024,8 +2558,8 @@ class Workplane(object):
         """
 
         diff = stop - start
-        allPoints = self._toVectors(
-            (func(start + diff * t / N) for t in range(N + 1)), False
+        allPoints = self.plane.toWorldCoords(
+            _toPoints(func(start + diff * t / N) for t in range(N + 1))
         )
 
         e = Edge.makeSplineApprox(
@@ -2070,13 +2604,13 @@ class Workplane(object):
         """
 
         diff = stop - start
-        allPoints = []
-
-        for i in range(N + 1):
-            generator = (
-                func(start + diff * i / N, start + diff * j / N) for j in range(N + 1)
+        allPoints = self.plane.toWorldCoords(
+            _toPoints(
+                func(start + diff * i / N, start + diff * j / N)
+                for i in range(N + 1)
+                for j in range(N + 1)
             )
-            allPoints.append(self._toVectors(generator, False))
+        ).reshape(N + 1, N + 1, 3)
 
         f = Face.makeSplineApprox(
             allPoints, tol=tol, smoothing=smoothing, minDeg=minDeg, maxDeg=maxDeg
@@ -2440,6 +2974,8 @@ class Workplane(object):
         useLocalCoordinates: bool = False,
         combine: CombineMode = True,
         clean: bool = True,
+        parallel: ParallelMode = False,
+        chunksize: Optional[int] = None,
     ) -> T:
         """
         Runs the provided function on each value in the stack, and collects the return values into
@@ -2453,6 +2989,10 @@ class Workplane(object):
             "cut" or "s" to remove the resulting solid from the parent solids if found.
             False to keep the resulting solid separated from the parent solids.
         :param clean: call :meth:`clean` afterwards to have a clean shape
+        :param parallel: call the function in worker processes. True to use all cores,
+            an int to use a given number of processes or an Executor to control the
+            workers explicitly. Pools created for True or int are reused.
+        :param chunksize: number of stack items sent to a worker at once
 
 
         The callback function must accept one argument, which is the item on the stack, and return
@@ -2474,17 +3014,23 @@ class Workplane(object):
         about the fact that the working plane is different than the global coordinate system.
 
 
+        In parallel mode the callback and the stack items must be picklable, i.e. the
+        callback has to be a module level function. Shapes are transferred in the BIN format
+        and all results are combined with the base in one operation.
+
         TODO: wrapper object for Wire will clean up forConstruction flag everywhere
         """
+        if useLocalCoordinates:
+            # TODO: this needs to work for all types of objects, not just vectors!
+            objs = [self.plane.toLocalCoords(obj) for obj in self.objects]
+        else:
+            objs = self.objects
+
         results = []
-        for obj in self.objects:
+        for r in _map(callback, objs, parallel, chunksize):
 
             if useLocalCoordinates:
-                # TODO: this needs to work for all types of objects, not just vectors!
-                r = callback(self.plane.toLocalCoords(obj))
                 r = r.transformShape(self.plane.rG)
-            else:
-                r = callback(obj)
 
             if isinstance(r, Wire):
                 if not r.forConstruction:
@@ -2499,6 +3045,8 @@ class Workplane(object):
         useLocalCoordinates: bool = False,
         combine: CombineMode = False,
         clean: bool = True,
+        parallel: ParallelMode = False,
+        chunksize: Optional[int] = None,
     ) -> T:
         """
         Same as each(), except arg is translated by the positions on the stack. If arg is a callback function, then the function is called for each point on the stack, and the resulting shape is used.
@@ -2509,6 +3057,8 @@ class Workplane(object):
             "cut" or "s" to remove the resulting solid from the parent solids if found.
             False to keep the resulting solid separated from the parent solids.
         :param clean: call :meth:`clean` afterwards to have a clean shape
+        :param parallel: call the function in worker processes, see :meth:`each`
+        :param chunksize: number of locations sent to a worker at once
 
 
         The resulting object has a point on the stack for each object on the original stack.
@@ -2519,49 +3069,50 @@ class Workplane(object):
         workplane/coordinate system
         """
 
-        # convert stack to a list of points
-        pnts = []
+        # convert stack to an array of locations
         plane = self.plane
         loc = self.plane.location
 
         if len(self.objects) == 0:
             # nothing on the stack. here, we'll assume we should operate with the
             # origin as the context point
-            pnts.append(Location())
+            pnts = LocationArray((Location(),))
+        elif not any(isinstance(o, Location) for o in self.objects):
+            # only points on the stack, convert them in one go
+            pnts = loc.inverse * LocationArray.fromPoints(
+                [
+                    (o._faces if isinstance(o, Sketch) else cast(Shape, o))
+                    .Center()
+                    .toTuple()
+                    for o in self.objects
+                ],
+                plane,
+            )
         else:
-            for o in self.objects:
-                if isinstance(o, (Vector, Shape)):
-                    pnts.append(loc.inverse * Location(plane, o.Center()))
-                elif isinstance(o, Sketch):
-                    pnts.append(loc.inverse * Location(plane, o._faces.Center()))
-                else:
-                    pnts.append(o)
+            pnts = LocationArray(
+                loc.inverse * Location(plane, o.Center())
+                if isinstance(o, (Vector, Shape))
+                else loc.inverse * Location(plane, o._faces.Center())
+                if isinstance(o, Sketch)
+                else o
+                for o in self.objects
+            )
+
+        # compose all the locations at once
+        locs = (loc * pnts if useLocalCoordinates else pnts * loc).toLocations()
 
         if isinstance(arg, Workplane):
-            if useLocalCoordinates:
-                res = [
-                    v.moved(p).move(loc)
-                    for v in arg.vals()
-                    for p in pnts
-                    if isinstance(v, Shape)
-                ]
-            else:
-                res = [
-                    v.moved(p * loc)
-                    for v in arg.vals()
-                    for p in pnts
-                    if isinstance(v, Shape)
-                ]
+            res = [v.moved(l) for v in arg.vals() for l in locs if isinstance(v, Shape)]
         elif isinstance(arg, Shape):
-            if useLocalCoordinates:
-                res = [arg.moved(p).move(loc) for p in pnts]
-            else:
-                res = [arg.moved(p * loc) for p in pnts]
+            res = [arg.moved(l) for l in locs]
         elif callable(arg):
             if useLocalCoordinates:
-                res = [arg(p).move(loc) for p in pnts]
+                res = [
+                    r.move(loc)
+                    for r in _map(arg, pnts.toLocations(), parallel, chunksize)
+                ]
             else:
-                res = [arg(p * loc) for p in pnts]
+                res = _map(arg, locs, parallel, chunksize)
         else:
             raise ValueError(f"{arg} is not supported")
 
@@ -2769,22 +3320,12 @@ class Workplane(object):
         # Our list of new edges that will go into a new CQ object
         edges = []
 
-        if includeCurrent:
-            startPoint = self._findFromPoint(False)
-            points = listOfXYTuple
-        else:
-            startPoint = self.plane.toWorldCoords(listOfXYTuple[0])
-            points = listOfXYTuple[1:]
-
         # Draw a line for each set of points, starting from the from-point of the original CQ object
-        for curTuple in points:
-            endPoint = self.plane.toWorldCoords(curTuple)
+        points = self._toVectors(listOfXYTuple, includeCurrent)
 
+        for startPoint, endPoint in zip(points, points[1:]):
             edges.append(Edge.makeLine(startPoint, endPoint))
 
-            # We need to move the start point for the next line that we draw or we get stuck at the same startPoint
-            startPoint = endPoint
-
             if not forConstruction:
                 self._addPendingEdge(edges[-1])
 
@@ -2857,13 +3398,23 @@ class Workplane(object):
         """
         ctxSolid = self.findSolid()
 
-        # will contain all of the counterbores as a single compound
-        results = cast(List[Shape], self.eachpoint(fcn, useLocalCoords).vals())
+        # tools are not cleaned, so that the instances can share the same TShape
+        results = cast(
+            List[Shape], self.eachpoint(fcn, useLocalCoords, clean=False).vals()
+        )
+
+        # all remaining tools are cut in one boolean operation
+        tools = ctxSolid._overlapping(results)
 
-        s = ctxSolid.cut(*results)
+        if tools:
+            s = ctxSolid.cut(*tools)
 
-        if clean:
-            s = s.clean()
+            # the whole result is cleaned: keeping the untouched faces out of the
+            # unification does not make it faster, it still visits every face
+            if clean:
+                s = s.clean()
+        else:
+            s = ctxSolid  # the solid is not modified
 
         return self.newObject([s])
 
@@ -4478,6 +5029,38 @@ class Workplane(object):
 
         return self.newObject(rv)
 
+    def record(self: T) -> T:
+        """
+        Start recording the operations applied to this object and to the objects
+        derived from it. Use :meth:`graph` to obtain the recorded operations.
+
+        Arguments can be specified using :class:`~cadquery.record.Param` objects,
+        which can be changed when replaying. Example::
+
+            from cadquery.record import Param
+
+            r = Workplane().record().box(Param("length", 10), 2, 2).edges().fillet(0.5)
+            g = r.graph().optimize()
+            r2 = g.replay(length=20)
+
+        :return: a recording copy of this object
+        """
+
+        from .record import Graph
+
+        return Graph.record(self)
+
+    def graph(self) -> "Graph":
+        """
+        Graph of the recorded operations leading to this object.
+
+        :raises ValueError: if the object was not recorded
+        """
+
+        from .record import Graph
+
+        return Graph.of(self)
+
     def _repr_javascript_(self) -> Any:
         """
         Special method for rendering current object in a jupyter notebook
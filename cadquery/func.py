@@ -48,6 +48,7 @@ from .occ_impl.shapes import (
     loft,
     check,
     closest,
+    PreparedShape,
     setThreads,
     project,
     faceOn,
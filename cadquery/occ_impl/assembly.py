@@ -1,4 +1,8 @@
+from hashlib import sha1
+from io import BytesIO
 from typing import (
+    Hashable,
+    Set,
     Union,
     Iterable,
     Iterator,
@@ -24,7 +28,7 @@ from OCP.XCAFApp import XCAFApp_Application
 from OCP.BinXCAFDrivers import BinXCAFDrivers
 from OCP.XmlXCAFDrivers import XmlXCAFDrivers
 from OCP.TDataStd import TDataStd_Name
-from OCP.TDF import TDF_Label
+from OCP.TDF import TDF_Label, TDF_LabelSequence
 from OCP.TopLoc import TopLoc_Location
 from OCP.Quantity import (
     Quantity_ColorRGBA,
@@ -36,6 +40,8 @@ from OCP.BRepAlgoAPI import BRepAlgoAPI_Fuse
 from OCP.TopTools import TopTools_ListOfShape
 from OCP.BOPAlgo import BOPAlgo_GlueEnum, BOPAlgo_MakeConnected
 from OCP.TopoDS import TopoDS_Shape
+from OCP.TopAbs import TopAbs_Orientation
+from OCP.BinTools import BinTools, BinTools_FormatVersion
 from OCP.gp import gp_EulerSequence
 
 from vtkmodules.vtkRenderingCore import (
@@ -300,7 +306,18 @@ def toCAF(
     tolerance: float = 1e-3,
     angularTolerance: float = 0.1,
     binary: bool = True,
+    dedupe: bool = False,
 ) -> Tuple[TDF_Label, TDocStd_Document]:
+    """
+    Convert an assembly to an XCAF document.
+
+    By default parts are shared per (color, object). With dedupe, parts with the
+    same geometry are stored once, regardless of the object they were added with,
+    and colors are set on the instances. For STEP the colors are set on the parts,
+    which are shared per color. A shared part is named after its first instance,
+    e.g. identical "bolt" and "pin" objects become one part named "bolt", the
+    instances keep their names. Hashing the geometry makes the conversion slower.
+    """
 
     # prepare a doc
     app = XCAFApp_Application.GetApplication_s()
@@ -319,10 +336,36 @@ def toCAF(
     ctool = XCAFDoc_DocumentTool.ColorTool_s(doc.Main())
     ltool = XCAFDoc_DocumentTool.LayerTool_s(doc.Main())
 
-    # used to store labels with unique part-color combinations
-    unique_objs: Dict[Tuple[Color | None, AssemblyObjects], TDF_Label] = {}
+    # used to store labels of unique parts
+    unique_objs: Dict[Hashable, TDF_Label] = {}
     # used to cache unique, possibly meshed, compounds; allows to avoid redundant meshing operations if same object is referenced multiple times in an assy
-    compounds: Dict[AssemblyObjects, Compound] = {}
+    compounds: Dict[Hashable, Compound] = {}
+    # content hashes of the parts, keyed by the identity of their shapes
+    hashes: Dict[Tuple[Tuple[Shape, TopAbs_Orientation], ...], Hashable] = {}
+
+    def _partKey(el: AssemblyProtocol) -> Hashable:
+
+        identity = tuple((s, s.wrapped.Orientation()) for s in el.shapes)
+
+        # subshape names, colors and layers refer to the shapes of the part itself
+        if el._subshape_names or el._subshape_colors or el._subshape_layers:
+            return identity
+
+        if identity not in hashes:
+            data = BytesIO()
+            BinTools.Write_s(
+                Compound.makeCompound(el.shapes).wrapped,
+                data,
+                False,
+                False,
+                BinTools_FormatVersion.BinTools_FormatVersion_CURRENT,
+            )
+            hashes[identity] = sha1(data.getvalue()).digest()
+
+        return hashes[identity]
+
+    # parts with an instance without a location
+    unlocated: Set[Hashable] = set()
 
     def _toCAF(el: AssemblyProtocol, ancestor: TDF_Label | None) -> TDF_Label:
 
@@ -337,8 +380,23 @@ def toCAF(
         # add a leaf with the actual part if needed
         if el.obj:
             # get/register unique parts referenced in the assy
-            key0 = (current_color, el.obj)  # (color, shape)
-            key1 = el.obj  # shape
+            key0: Hashable
+            key1: Hashable
+
+            if dedupe:
+                key1 = _partKey(el)
+                # STEP keeps the colors of parts only
+                key0 = (current_color if coloredSTEP else None, key1)
+            else:
+                key0 = (current_color, el.obj)  # (color, shape)
+                key1 = el.obj  # shape
+
+            # instances without a location cannot be told apart by the STEP writer;
+            # the part of an element with children is always added without one
+            if dedupe and (el.children or el.loc.wrapped.IsIdentity()):
+                if key0 in unlocated:
+                    key0 = (key0, len(unlocated))
+                unlocated.add(key0)
 
             if key0 in unique_objs:
                 lab = unique_objs[key0]
@@ -436,6 +494,40 @@ def toCAF(
     return top, doc
 
 
+def countParts(doc: TDocStd_Document) -> Tuple[int, int]:
+    """
+    Count the unique parts and the part instances of an XCAF document.
+    """
+
+    tool = XCAFDoc_DocumentTool.ShapeTool_s(doc.Main())
+
+    labels = TDF_LabelSequence()
+    tool.GetShapes(labels)
+
+    parts = sum(1 for l in labels if not tool.IsAssembly_s(l))
+
+    def _count(l: TDF_Label) -> int:
+
+        if not tool.IsAssembly_s(l):
+            return 1
+
+        components = TDF_LabelSequence()
+        tool.GetComponents_s(l, components)
+
+        rv = 0
+        for c in components:
+            ref = TDF_Label()
+            tool.GetReferredShape_s(c, ref)
+            rv += _count(ref)
+
+        return rv
+
+    roots = TDF_LabelSequence()
+    tool.GetFreeShapes(roots)
+
+    return parts, sum(_count(l) for l in roots)
+
+
 def _loc2vtk(
     loc: Location,
 ) -> Tuple[Tuple[float, float, float], Tuple[float, float, float]]:
@@ -1,21 +1,53 @@
-import tempfile
 import os
 import io as StringIO
 
-from typing import IO, Optional, Union, cast, Dict, Any, Iterable
+from contextlib import contextmanager
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
+from os import PathLike
+from threading import Lock
+from time import perf_counter
+from typing import (
+    IO,
+    Optional,
+    Union,
+    cast,
+    Dict,
+    Any,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Sequence,
+    Tuple,
+    TYPE_CHECKING,
+)
 from typing_extensions import Literal
 
 from OCP.VrmlAPI import VrmlAPI
+from OCP.BRepMesh import BRepMesh_IncrementalMesh
 
-from ...utils import deprecate
+from ...utils import deprecate, pathOrTemp
 from ..shapes import Shape, compound
 
-from .svg import getSVG
-from .json import JsonMesh
+from .svg import getSVG, getSVGViews
+from .json import JsonMesh, exportBinaryMesh
 from .amf import AmfWriter
 from .threemf import ThreeMFWriter
+from .mesh import (
+    Tessellation,
+    Tessellations,
+    tessellateInstances,
+    flatten,
+    merge,
+    toLists,
+)
+
+if TYPE_CHECKING:
+    from ..assembly import AssemblyProtocol
 from .dxf import exportDXF, DxfDocument
 from .vtk import exportVTP
+from .step import exportStepBatch, StepBatchReport, StepResult
 
 
 class ExportTypes:
@@ -36,10 +68,53 @@ ExportLiterals = Literal[
     "STL", "STEP", "AMF", "SVG", "TJS", "DXF", "VRML", "VTP", "3MF", "BREP", "BIN"
 ]
 
+ExportTarget = Union[
+    str, Tuple[str, Optional[str]], Tuple[str, Optional[str], Dict[str, Any]]
+]
+
+
+class ExportResult(NamedTuple):
+    """
+    Outcome of a single target of :func:`export_many`.
+    """
+
+    fname: str
+    exportType: str
+    time: float  # wall time of the writer in seconds
+    size: int  # file size in bytes
+
+
+# formats written from the shared tessellation buffers
+MESH_TYPES = (ExportTypes.TJS, ExportTypes.AMF, ExportTypes.THREEMF)
+
+# formats handled natively by Assembly.export
+ASSY_TYPES = ("STEP", "XML", "XBF", "VRML", "VTKJS", "GLTF", "GLB", "STL")
+
+# formats written without a mesh
+NOMESH_TYPES = ("STEP", "SVG", "DXF", "BREP", "BIN", "XML", "XBF")
+
+# formats meshed by VTK
+VTK_TYPES = ("VTP", "VTKJS")
+
+
+def _binaryOpt(opt: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Options of the binary mesh TJS format, None for the JSON arrays format.
+    """
+
+    rv = dict(opt or {})
+
+    if rv.pop("binary", False):
+        return rv
+    elif rv:
+        raise ValueError(f"TJS options {', '.join(rv)} require binary=True")
+
+    return None
+
 
 def export(
     w: Union[Shape, Iterable[Shape]],
-    fname: str,
+    fname: Union[str, BytesIO],
     exportType: Optional[ExportLiterals] = None,
     tolerance: float = 0.1,
     angularTolerance: float = 0.1,
@@ -50,8 +125,9 @@ def export(
     Export Workplane or Shape to file. Multiple entities are converted to compound.
 
     :param w:  Shape or Iterable[Shape] (e.g. Workplane) to be exported.
-    :param fname: output filename.
+    :param fname: output filename or writable binary stream.
     :param exportType: the exportFormat to use. If None will be inferred from the extension. Default: None.
+        Required when writing to a stream.
     :param tolerance: the deflection tolerance, in model units. Default 0.1.
     :param angularTolerance: the angular tolerance, in radians. Default 0.1.
     :param opt: additional options passed to the specific exporter. Default None.
@@ -69,6 +145,11 @@ def export(
         shape = compound(*w)
 
     if exportType is None:
+        if not isinstance(fname, str):
+            raise ValueError(
+                "Specify export type explicitly when exporting to a stream"
+            )
+
         t = fname.split(".")[-1].upper()
         if t in ExportTypes.__dict__.values():
             exportType = cast(ExportLiterals, t)
@@ -76,33 +157,25 @@ def export(
             raise ValueError("Unknown extensions, specify export type explicitly")
 
     if exportType == ExportTypes.TJS:
-        tess = shape.tessellate(tolerance, angularTolerance)
-        mesher = JsonMesh()
+        binaryOpt = _binaryOpt(opt)
 
-        # add vertices
-        for v in tess[0]:
-            mesher.addVertex(v.x, v.y, v.z)
-
-        # add triangles
-        for ixs in tess[1]:
-            mesher.addTriangleFace(*ixs)
-
-        with open(fname, "w") as f:
-            f.write(mesher.toJson())
+        if binaryOpt is not None:
+            exportBinaryMesh(shape, fname, tolerance, angularTolerance, **binaryOpt)
+        else:
+            tess = shape.tessellate(tolerance, angularTolerance)
+            _writeText(fname, _toJson(tess))
 
     elif exportType == ExportTypes.SVG:
-        with open(fname, "w") as f:
-            f.write(getSVG(shape, opt))
+        _writeText(fname, getSVG(shape, opt))
 
     elif exportType == ExportTypes.AMF:
-        tess = shape.tessellate(tolerance, angularTolerance)
-        aw = AmfWriter(tess)
-        with open(fname, "wb") as f:
+        aw = _amfWriter(tessellateInstances(shape, tolerance, angularTolerance))
+        with _open(fname) as f:
             aw.writeAmf(f)
 
     elif exportType == ExportTypes.THREEMF:
         tmfw = ThreeMFWriter(shape, tolerance, angularTolerance, **opt)
-        with open(fname, "wb") as f:
+        with _open(fname) as f:
             tmfw.write3mf(f)
 
     elif exportType == ExportTypes.DXF:
@@ -121,7 +194,10 @@ def export(
 
     elif exportType == ExportTypes.VRML:
         shape.mesh(tolerance, angularTolerance)
-        VrmlAPI.Write_s(shape.wrapped, fname)
+
+        # VrmlAPI only writes to files
+        with pathOrTemp(fname, ".wrl") as path:
+            VrmlAPI.Write_s(shape.wrapped, path)
 
     elif exportType == ExportTypes.VTP:
         exportVTP(shape, fname, tolerance, angularTolerance)
@@ -136,6 +212,231 @@ def export(
         raise ValueError("Unknown export type")
 
 
+def toBytes(
+    w: Union[Shape, Iterable[Shape]],
+    exportType: ExportLiterals,
+    tolerance: float = 0.1,
+    angularTolerance: float = 0.1,
+    opt: Optional[Dict[str, Any]] = None,
+) -> bytes:
+    """
+    Export Workplane or Shape in memory. Accepts the same arguments as :func:`export`.
+
+    :return: the content of the exported file.
+    """
+
+    f = BytesIO()
+    export(w, f, exportType, tolerance, angularTolerance, opt)
+
+    return f.getvalue()
+
+
+@contextmanager
+def _open(fname: Union[str, BytesIO]) -> Iterator[IO[bytes]]:
+
+    if isinstance(fname, (str, PathLike)):
+        with open(fname, "wb") as f:
+            yield f
+    else:
+        yield fname
+
+
+def _writeText(fname: Union[str, BytesIO], text: str):
+
+    if isinstance(fname, (str, PathLike)):
+        with open(fname, "w") as f:
+            f.write(text)
+    else:
+        fname.write(text.encode())
+
+
+def _toJson(tess: Tessellation) -> str:
+
+    mesher = JsonMesh()
+
+    # add vertices
+    for v in tess[0]:
+        mesher.addVertex(*v)
+
+    # add triangles
+    for ixs in tess[1]:
+        mesher.addTriangleFace(*ixs)
+
+    return mesher.toJson()
+
+
+def _amfWriter(tess: Tessellations) -> AmfWriter:
+
+    return AmfWriter(
+        toLists(merge(tess.parts)), [toLists(b) for b in tess.bases], tess.instances
+    )
+
+
+def export_many(
+    w: Union[Shape, Iterable[Shape], "AssemblyProtocol"],
+    targets: Iterable[ExportTarget],
+    tolerance: float = 0.1,
+    angularTolerance: float = 0.1,
+    threads: Optional[int] = None,
+) -> List[ExportResult]:
+    """
+    Export Workplane, Shape or Assembly to multiple files at once.
+
+    The object is meshed once per distinct tolerance. The tessellation is shared by the
+    TJS, AMF and 3MF writers and the triangulation stored on the shape is reused by the
+    STL, VRML and glTF writers. The writers of a given tolerance run concurrently.
+    Formats that do not need a mesh are written first, VTK based formats (VTP, VTKJS)
+    mesh on their own and are written last.
+
+    :param w: Shape, Iterable[Shape] (e.g. Workplane) or Assembly to be exported.
+    :param targets: output filenames or (fname, exportType[, opt]) tuples. If exportType
+        is None it is inferred from the extension. opt is passed to the specific exporter,
+        the tolerance and angularTolerance keys override the defaults for a given target.
+    :param tolerance: the deflection tolerance, in model units. Default 0.1.
+    :param angularTolerance: the angular tolerance, in radians. Default 0.1.
+    :param threads: number of writer threads. Default None, i.e. the executor default.
+    :return: ExportResult (fname, exportType, time, size) for every target, in order.
+    """
+
+    from ...assembly import Assembly
+
+    shape: Shape
+    assy: Optional[Assembly] = None
+
+    if isinstance(w, Shape):
+        shape = w
+    elif isinstance(w, Assembly):
+        assy = w
+        shape = assy.toCompound()
+    else:
+        shape = compound(*cast(Iterable[Shape], w))
+
+    # DXF export needs the original object (e.g. Workplane) to use its plane
+    dxf = shape if assy else cast(Union[Shape, Iterable[Shape]], w)
+
+    valid = set(ExportTypes.__dict__.values()) | set(ASSY_TYPES)
+
+    # targets per phase: None - no mesh, (tol, atol) - shared mesh, () - VTK
+    phases: Dict[Any, List[Tuple[int, str, str, Dict[str, Any], float, float]]] = {}
+    n = 0
+
+    for target in targets:
+        if isinstance(target, str):
+            fname, exportType, opt = target, None, {}
+        else:
+            fname, exportType, *rest = target
+            opt = dict(rest[0]) if rest else {}
+
+        if exportType is None:
+            exportType = fname.split(".")[-1].upper()
+
+        if exportType not in valid:
+            raise ValueError(f"Unknown export type {exportType} for {fname}")
+
+        tol = opt.pop("tolerance", tolerance)
+        atol = opt.pop("angularTolerance", angularTolerance)
+
+        if exportType == ExportTypes.TJS:
+            _binaryOpt(opt)  # fail before writing anything
+
+        if exportType in NOMESH_TYPES:
+            key: Any = None
+        elif exportType in VTK_TYPES or (assy and exportType == ExportTypes.VRML):
+            key = ()
+        else:
+            key = (tol, atol)
+
+        phases.setdefault(key, []).append((n, fname, exportType, opt, tol, atol))
+        n += 1
+
+    rv: List[Any] = [None] * n
+    lock = Lock()
+
+    def _write(
+        fname: str,
+        exportType: str,
+        opt: Dict[str, Any],
+        tol: float,
+        atol: float,
+        tess: Tessellations,
+    ) -> ExportResult:
+
+        t0 = perf_counter()
+
+        binaryOpt = _binaryOpt(opt) if exportType == ExportTypes.TJS else None
+
+        if binaryOpt is not None:
+            exportBinaryMesh(shape, fname, tol, atol, **binaryOpt)
+
+        elif exportType == ExportTypes.TJS:
+            with open(fname, "w") as f:
+                f.write(_toJson(toLists(flatten(tess))))
+
+        elif exportType == ExportTypes.AMF:
+            with open(fname, "wb") as f:
+                _amfWriter(tess).writeAmf(f)
+
+        elif exportType == ExportTypes.THREEMF:
+            ThreeMFWriter(shape, tol, atol, tessellations=tess, **opt).write3mf(fname)
+
+        else:
+            # OCCT writers rely on global state (e.g. STEP settings or the location of
+            # the assembly), so they are run one at a time
+            with lock:
+                if exportType in ASSY_TYPES and (assy or exportType in ("GLTF", "GLB")):
+                    (assy or Assembly().add(shape)).export(
+                        fname,
+                        cast(Any, exportType),
+                        tolerance=tol,
+                        angularTolerance=atol,
+                        **opt,
+                    )
+                else:
+                    export(
+                        dxf if exportType == ExportTypes.DXF else shape,
+                        fname,
+                        cast(ExportLiterals, exportType),
+                        tol,
+                        atol,
+                        opt,
+                    )
+
+        return ExportResult(
+            fname, exportType, perf_counter() - t0, os.path.getsize(fname)
+        )
+
+    def _order(key: Any) -> Tuple[int, float, float]:
+
+        # coarse tolerances first, since OCCT only ever refines an existing triangulation
+        if key is None:
+            return (0, 0.0, 0.0)
+        elif key == ():
+            return (2, 0.0, 0.0)
+        else:
+            return (1, -key[0], -key[1])
+
+    with ThreadPoolExecutor(threads) as executor:
+        for key in sorted(phases, key=_order):
+            group = phases[key]
+            tess = Tessellations([], [], [])
+
+            if key:
+                BRepMesh_IncrementalMesh(shape.wrapped, key[0], True, key[1], True)
+
+                if any(el[2] in MESH_TYPES for el in group):
+                    tess = tessellateInstances(shape, *key)
+
+            futures = [
+                (i, executor.submit(_write, fname, exportType, opt, tol, atol, tess),)
+                for i, fname, exportType, opt, tol, atol in group
+            ]
+
+            for i, future in futures:
+                rv[i] = future.result()
+
+    return rv
+
+
 @deprecate()
 def toString(shape, exportType, tolerance=0.1, angularTolerance=0.05):
     s = StringIO.StringIO()
@@ -197,22 +498,17 @@ def exportShape(
         tmfw.write3mf(fileLike)
     else:
 
-        # all these types required writing to a file and then
-        # re-reading. this is due to the fact that FreeCAD writes these
-        (h, outFileName) = tempfile.mkstemp()
-        # weird, but we need to close this file. the next step is going to write to
-        # it from c code, so it needs to be closed.
-        os.close(h)
+        # these types are written to a binary stream and decoded
+        data = BytesIO()
 
         if exportType == ExportTypes.STEP:
-            shape.exportStep(outFileName)
+            shape.exportStep(data)
         elif exportType == ExportTypes.STL:
-            shape.exportStl(outFileName, tolerance, angularTolerance, True)
+            shape.exportStl(data, tolerance, angularTolerance, True)
         else:
             raise ValueError("No idea how i got here")
 
-        res = readAndDeleteFile(outFileName)
-        fileLike.write(res)
+        fileLike.write(data.getvalue().decode())
 
 
 @deprecate()
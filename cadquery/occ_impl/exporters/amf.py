@@ -2,32 +2,66 @@ import xml.etree.cElementTree as ET
 
 
 class AmfWriter(object):
-    def __init__(self, tessellation):
+    def __init__(self, tessellation, bases=(), instances=()):
+        """
+        Initialize the writer.
+
+        Repeated parts can be written once: bases are their tessellations and instances
+        the (base index, Location) pairs of all copies, which are written as a constellation.
+        """
 
         self.units = "mm"
         self.tessellation = tessellation
+        self.bases = bases
+        self.instances = instances
 
     def writeAmf(self, outFile):
         amf = ET.Element("amf", units=self.units)
-        # TODO: if result is a compound, we need to loop through them
-        object = ET.SubElement(amf, "object", id="0")
+
+        if len(self.tessellation[0]) or not self.bases:
+            self._addObject(amf, "0", self.tessellation)
+
+        # repeated parts are placed by a constellation
+        for i, tessellation in enumerate(self.bases):
+            self._addObject(amf, str(i + 1), tessellation)
+
+        if self.instances:
+            constellation = ET.SubElement(
+                amf, "constellation", id=str(len(self.bases) + 1)
+            )
+
+            for i, loc in self.instances:
+                instance = ET.SubElement(constellation, "instance", objectid=str(i + 1))
+                (x, y, z), (rx, ry, rz) = loc.toTuple()
+
+                for tag, val in zip(
+                    ("deltax", "deltay", "deltaz", "rx", "ry", "rz"),
+                    (x, y, z, rx, ry, rz),
+                ):
+                    ET.SubElement(instance, tag).text = str(val)
+
+        amf = ET.ElementTree(amf).write(outFile, xml_declaration=True)
+
+    def _addObject(self, amf, id, tessellation):
+
+        object = ET.SubElement(amf, "object", id=id)
         mesh = ET.SubElement(object, "mesh")
         vertices = ET.SubElement(mesh, "vertices")
         volume = ET.SubElement(mesh, "volume")
 
         # add vertices
-        for v in self.tessellation[0]:
+        for vx, vy, vz in tessellation[0]:
             vtx = ET.SubElement(vertices, "vertex")
             coord = ET.SubElement(vtx, "coordinates")
             x = ET.SubElement(coord, "x")
-            x.text = str(v.x)
+            x.text = str(vx)
             y = ET.SubElement(coord, "y")
-            y.text = str(v.y)
+            y.text = str(vy)
             z = ET.SubElement(coord, "z")
-            z.text = str(v.z)
+            z.text = str(vz)
 
         # add triangles
-        for t in self.tessellation[1]:
+        for t in tessellation[1]:
             triangle = ET.SubElement(volume, "triangle")
             v1 = ET.SubElement(triangle, "v1")
             v1.text = str(t[0])
@@ -35,5 +69,3 @@ class AmfWriter(object):
             v2.text = str(t[1])
             v3 = ET.SubElement(triangle, "v3")
             v3.text = str(t[2])
-
-        amf = ET.ElementTree(amf).write(outFile, xml_declaration=True)
@@ -1,9 +1,11 @@
 import os.path
 import uuid
 
+from io import BytesIO
+
 from tempfile import TemporaryDirectory
-from shutil import make_archive
-from typing import Optional
+from shutil import copyfileobj, make_archive
+from typing import Optional, Union
 from typing_extensions import Literal
 
 from vtkmodules.vtkIOExport import vtkJSONSceneExporter, vtkVRMLExporter
@@ -16,6 +18,7 @@ from OCP.IFSelect import IFSelect_ReturnStatus
 from OCP.TDF import TDF_Label
 from OCP.TDataStd import TDataStd_Name
 from OCP.TDocStd import TDocStd_Document
+from OCP.CDF import CDF_Application
 from OCP.XCAFApp import XCAFApp_Application
 from OCP.XCAFDoc import XCAFDoc_DocumentTool, XCAFDoc_ColorGen
 from OCP.XmlXCAFDrivers import (
@@ -35,9 +38,11 @@ from OCP.TColStd import TColStd_IndexedDataMapOfStringString
 from OCP.Message import Message_ProgressRange
 from OCP.Interface import Interface_Static
 
+from ...utils import pathOrTemp
 from ..assembly import AssemblyProtocol, toCAF, toVTK, toFusedCAF
 from ..geom import Location
 from ..shapes import Shape, Compound
+from .gltf import exportGLB
 
 
 class ExportModes:
@@ -50,7 +55,7 @@ STEPExportModeLiterals = Literal["default", "fused"]
 
 def exportAssembly(
     assy: AssemblyProtocol,
-    path: str,
+    path: Union[str, BytesIO],
     mode: STEPExportModeLiterals = "default",
     **kwargs,
 ) -> bool:
@@ -60,7 +65,7 @@ def exportAssembly(
     kwargs is used to provide optional keyword arguments to configure the exporter.
 
     :param assy: assembly
-    :param path: Path and filename for writing
+    :param path: Path and filename or a writable binary stream for writing
     :param mode: STEP export mode. The options are "default", and "fused" (a single fused compound).
         It is possible that fused mode may exhibit low performance.
     :param fuzzy_tol: OCCT fuse operation tolerance setting used only for fused assembly export.
@@ -76,6 +81,10 @@ def exportAssembly(
     :param precision_mode: Controls the uncertainty value for STEP entities. Specify -1, 0, or 1. Default 0.
         See OCCT documentation.
     :type precision_mode: int
+    :param dedupe: Write parts with the same geometry once, also when added as different
+        objects. Parts are still split per color and a shared part is named after
+        its first instance. Default True.
+    :type dedupe: bool
     """
 
     # Handle the extra settings for the STEP export
@@ -85,12 +94,13 @@ def exportAssembly(
     precision_mode = kwargs["precision_mode"] if "precision_mode" in kwargs else 0
     fuzzy_tol = kwargs["fuzzy_tol"] if "fuzzy_tol" in kwargs else None
     glue = kwargs["glue"] if "glue" in kwargs else False
+    dedupe = kwargs["dedupe"] if "dedupe" in kwargs else True
 
     # Handle the doc differently based on which mode we are using
     if mode == "fused":
         _, doc = toFusedCAF(assy, glue, fuzzy_tol)
     else:  # Includes "default"
-        _, doc = toCAF(assy, True)
+        _, doc = toCAF(assy, True, dedupe=dedupe)
 
     session = XSControl_WorkSession()
     writer = STEPCAFControl_Writer(session, False)
@@ -102,14 +112,17 @@ def exportAssembly(
     Interface_Static.SetIVal_s("write.stepcaf.subshapes.name", 1)
     writer.Transfer(doc, STEPControl_StepModelType.STEPControl_AsIs)
 
-    status = writer.Write(path)
+    if isinstance(path, str):
+        status = writer.Write(path)
+    else:
+        status = writer.WriteStream(path)
 
     return status == IFSelect_ReturnStatus.IFSelect_RetDone
 
 
 def exportStepMeta(
     assy: AssemblyProtocol,
-    path: str,
+    path: Union[str, BytesIO],
     write_pcurves: bool = True,
     precision_mode: int = 0,
 ) -> bool:
@@ -122,7 +135,7 @@ def exportStepMeta(
     names attached to layers instead.
 
     :param assy: assembly
-    :param path: Path and filename for writing
+    :param path: Path and filename or a writable binary stream for writing
     :param write_pcurves: Enable or disable writing parametric curves to the STEP file. Default True.
         If False, writes STEP file without pcurves. This decreases the size of the resulting STEP file.
     :param precision_mode: Controls the uncertainty value for STEP entities. Specify -1, 0, or 1. Default 0.
@@ -268,19 +281,32 @@ def exportStepMeta(
     Interface_Static.SetIVal_s("write.precision.mode", precision_mode)
     writer.Transfer(doc, STEPControl_StepModelType.STEPControl_AsIs)
 
-    status = writer.Write(path)
+    if isinstance(path, str):
+        status = writer.Write(path)
+    else:
+        status = writer.WriteStream(path)
 
     return status == IFSelect_ReturnStatus.IFSelect_RetDone
 
 
-def exportCAF(assy: AssemblyProtocol, path: str, binary: bool = False) -> bool:
+def exportCAF(
+    assy: AssemblyProtocol, path: Union[str, BytesIO], binary: bool = False
+) -> bool:
     """
     Export an assembly to an XCAF xml or xbf file (internal OCCT formats).
     """
 
-    folder, fname = os.path.split(path)
-    name, ext = os.path.splitext(fname)
-    ext = ext[1:] if ext[0] == "." else ext
+    if not isinstance(path, str) and binary:
+        # the binary driver seeks backwards in the stream, which fails on Python streams
+        with pathOrTemp(path, ".xbf") as fname:
+            return exportCAF(assy, fname, binary)
+
+    if isinstance(path, str):
+        folder, fname = os.path.split(path)
+        name, ext = os.path.splitext(fname)
+        ext = ext[1:] if ext[0] == "." else ext
+    else:
+        ext = "xml"
 
     _, doc = toCAF(assy, binary=binary)
     app = XCAFApp_Application.GetApplication_s()
@@ -308,10 +334,15 @@ def exportCAF(assy: AssemblyProtocol, path: str, binary: bool = False) -> bool:
         format_name, format_desc, TCollection_AsciiString(ext), ret, store,
     )
 
-    doc.SetRequestedFolder(TCollection_ExtendedString(folder))
-    doc.SetRequestedName(TCollection_ExtendedString(name))
+    if isinstance(path, str):
+        doc.SetRequestedFolder(TCollection_ExtendedString(folder))
+        doc.SetRequestedName(TCollection_ExtendedString(name))
 
-    status = app.SaveAs(doc, TCollection_ExtendedString(path))
+        status = app.SaveAs(doc, TCollection_ExtendedString(path))
+    else:
+        # only documents opened by the application can be saved to a stream
+        CDF_Application.Open(app, doc)
+        status = app.SaveAs(doc, path)
 
     app.Close(doc)
 
@@ -335,25 +366,32 @@ def _vtkRenderWindow(
     return renderWindow
 
 
-def exportVTKJS(assy: AssemblyProtocol, path: str):
+def exportVTKJS(assy: AssemblyProtocol, path: Union[str, BytesIO]):
     """
     Export an assembly to a zipped vtkjs. NB: .zip extensions is added to path.
     """
 
     renderWindow = _vtkRenderWindow(assy)
 
-    with TemporaryDirectory() as tmpdir:
+    with TemporaryDirectory() as tmpdir, TemporaryDirectory() as zipdir:
 
         exporter = vtkJSONSceneExporter()
         exporter.SetFileName(tmpdir)
         exporter.SetRenderWindow(renderWindow)
         exporter.Write()
-        make_archive(path, "zip", tmpdir)
+
+        if isinstance(path, str):
+            make_archive(path, "zip", tmpdir)
+        else:
+            with open(
+                make_archive(os.path.join(zipdir, "scene"), "zip", tmpdir), "rb"
+            ) as f:
+                copyfileobj(f, path)
 
 
 def exportVRML(
     assy: AssemblyProtocol,
-    path: str,
+    path: Union[str, BytesIO],
     tolerance: float = 1e-3,
     angularTolerance: float = 0.1,
 ):
@@ -362,24 +400,39 @@ def exportVRML(
     """
 
     exporter = vtkVRMLExporter()
-    exporter.SetFileName(path)
     exporter.SetRenderWindow(_vtkRenderWindow(assy, tolerance, angularTolerance))
-    exporter.Write()
+
+    # vtkVRMLExporter only writes to files
+    with pathOrTemp(path, ".wrl") as fname:
+        exporter.SetFileName(fname)
+        exporter.Write()
 
 
 def exportGLTF(
     assy: AssemblyProtocol,
-    path: str,
+    path: Union[str, BytesIO],
     binary: Optional[bool] = None,
     tolerance: float = 1e-3,
     angularTolerance: float = 0.1,
+    quantize: bool = False,
 ):
     """
-    Export an assembly to a gltf file.
+    Export an assembly to a gltf file. Streams are written as binary glTF (GLB).
+
+    :param quantize: write a compact GLB using KHR_mesh_quantization, with one
+        primitive per part and repeated parts stored once. See
+        :py:class:`~cadquery.occ_impl.exporters.gltf.GlbWriter`.
     """
 
+    if not isinstance(path, str):
+        # text glTF refers to a separate buffer file
+        if binary is False:
+            raise ValueError("Only binary glTF can be written to a stream")
+
+        binary = True
+
     # If the caller specified the binary option, respect it
-    if binary is None:
+    elif binary is None:
         # Handle the binary option for GLTF export based on file extension
         binary = True
         path_parts = path.split(".")
@@ -388,6 +441,14 @@ def exportGLTF(
         if len(path_parts) > 0 and path_parts[-1] == "gltf":
             binary = False
 
+    if quantize:
+        if not binary:
+            raise ValueError("Quantized export is only supported for binary glTF")
+
+        exportGLB(assy, path, tolerance, angularTolerance)
+
+        return True
+
     # map from CadQuery's right-handed +Z up coordinate system to glTF's right-handed +Y up coordinate system
     # https://registry.khronos.org/glTF/specs/2.0/glTF-2.0.html#coordinate-system-and-units
     orig_loc = assy.loc
@@ -395,10 +456,12 @@ def exportGLTF(
 
     _, doc = toCAF(assy, True, True, tolerance, angularTolerance)
 
-    writer = RWGltf_CafWriter(TCollection_AsciiString(path), binary)
-    result = writer.Perform(
-        doc, TColStd_IndexedDataMapOfStringString(), Message_ProgressRange()
-    )
+    # RWGltf_CafWriter only writes to files
+    with pathOrTemp(path, ".glb") as fname:
+        writer = RWGltf_CafWriter(TCollection_AsciiString(fname), binary)
+        result = writer.Perform(
+            doc, TColStd_IndexedDataMapOfStringString(), Message_ProgressRange()
+        )
 
     # restore coordinate system after exporting
     assy.loc = orig_loc
@@ -1,5 +1,7 @@
 """DXF export utilities."""
 
+from io import BytesIO, StringIO
+from os import PathLike
 from typing import (
     Any,
     Dict,
@@ -366,7 +368,7 @@ class DxfDocument:
 
 def exportDXF(
     w: Union[WorkplaneLike, Shape, Iterable[Shape]],
-    fname: str,
+    fname: Union[str, BytesIO],
     approx: Optional[ApproxOptions] = None,
     tolerance: float = 1e-3,
     *,
@@ -376,7 +378,7 @@ def exportDXF(
     Export Workplane content to DXF. Works with 2D sections.
 
     :param w: Workplane to be exported.
-    :param fname: Output filename.
+    :param fname: Output filename or writable binary stream.
     :param approx: Approximation strategy. None means no approximation is applied.
         "spline" results in all splines being approximated as cubic splines. "arc" results
         in all curves being approximated as arcs and straight segments.
@@ -393,4 +395,10 @@ def exportDXF(
             dxf.add_shape(s)
 
     zoom.extents(dxf.msp)
-    dxf.document.saveas(fname)
+
+    if isinstance(fname, (str, PathLike)):
+        dxf.document.saveas(fname)
+    else:
+        text = StringIO()
+        dxf.document.write(text)
+        fname.write(dxf.document.encode(text.getvalue()))
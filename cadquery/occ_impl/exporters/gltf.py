@@ -0,0 +1,367 @@
+"""
+    Compact binary glTF (GLB) writer using KHR_mesh_quantization
+"""
+
+import json
+import os
+
+from io import BytesIO
+from struct import pack
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from numpy import (
+    concatenate,
+    eye,
+    float32,
+    float64,
+    int8,
+    int16,
+    rint,
+    uint16,
+    uint32,
+    zeros,
+)
+from numpy.typing import NDArray
+
+from OCP.Quantity import Quantity_TOC_RGB
+
+from ..assembly import AssemblyProtocol, Color
+from ..geom import Location, _toArray
+from ..shapes import Shape
+
+GLB_MAGIC = 0x46546C67  # glTF
+CHUNK_JSON = 0x4E4F534A
+CHUNK_BIN = 0x004E4942
+
+# componentType and target constants of the glTF specification
+BYTE = 5120
+SHORT = 5122
+FLOAT = 5126
+UNSIGNED_SHORT = 5123
+UNSIGNED_INT = 5125
+ARRAY_BUFFER = 34962
+ELEMENT_ARRAY_BUFFER = 34963
+
+QMAX = 32767
+
+# map from CadQuery's +Z up coordinate system to glTF's +Y up coordinate system
+Y_UP = [-(0.5 ** 0.5), 0.0, 0.0, 0.5 ** 0.5]
+
+
+def _pad(data: bytes, fill: bytes = b"\0") -> bytes:
+
+    return data + fill * (-len(data) % 4)
+
+
+def quantizePositions(
+    vertices: NDArray[float64],
+) -> Tuple[NDArray[int16], NDArray[float64]]:
+    """
+    Quantize positions to int16 over the bounding box of the mesh. Returns the
+    quantized positions and the 4x4 matrix mapping them back to model coordinates.
+    A uniform scale is used, so that normals are not distorted by the matrix.
+
+    The rounding error is up to half the scale, i.e. it grows with the size of the
+    mesh: about 7.6e-6 of its largest extent per coordinate.
+    """
+
+    lo, hi = vertices.min(0), vertices.max(0)
+    center = (lo + hi) / 2
+    scale = max((hi - lo).max() / 2, 1e-9) / QMAX
+
+    D = eye(4)
+    D[:3, :3] *= scale
+    D[:3, 3] = center
+
+    return rint((vertices - center) / scale).astype(int16), D
+
+
+def quantizeNormals(normals: NDArray[float64]) -> NDArray[int8]:
+    """
+    Quantize unit normals to normalized int8.
+    """
+
+    return rint(normals * 127).astype(int8)
+
+
+def _padColumns(data: NDArray, n: int = 4) -> NDArray:
+
+    # vertex attributes have to be aligned to 4 bytes
+    rv = zeros((len(data), n), dtype=data.dtype)
+    rv[:, : data.shape[1]] = data
+
+    return rv
+
+
+class GlbWriter(object):
+    """
+    Writer of a quantized GLB file. Every part is written as a single primitive,
+    parts sharing the same TShape and color are written once.
+
+    Positions of parts too large to be quantized within the tolerance are written
+    as floats.
+    """
+
+    def __init__(
+        self,
+        assy: AssemblyProtocol,
+        tolerance: float = 1e-3,
+        angularTolerance: float = 0.1,
+    ):
+
+        self.assy = assy
+        self.tolerance = tolerance
+        self.angularTolerance = angularTolerance
+
+        self.chunks: List[bytes] = []
+        self.offset = 0
+        self.bufferViews: List[Dict[str, Any]] = []
+        self.accessors: List[Dict[str, Any]] = []
+        self.materials: List[Dict[str, Any]] = []
+
+    def _add(
+        self,
+        data: NDArray,
+        componentType: int,
+        type: str,
+        target: int,
+        count: int,
+        byteStride: Optional[int] = None,
+        **kwargs,
+    ) -> int:
+
+        buf = _pad(data.tobytes())
+
+        view: Dict[str, Any] = {
+            "buffer": 0,
+            "byteOffset": self.offset,
+            "byteLength": len(buf),
+            "target": target,
+        }
+        if byteStride:
+            view["byteStride"] = byteStride
+
+        self.bufferViews.append(view)
+        self.chunks.append(buf)
+        self.offset += len(buf)
+
+        self.accessors.append(
+            {
+                "bufferView": len(self.bufferViews) - 1,
+                "componentType": componentType,
+                "count": count,
+                "type": type,
+                **kwargs,
+            }
+        )
+
+        return len(self.accessors) - 1
+
+    def _material(
+        self, color: Optional[Color], cache: Dict[Tuple[float, ...], int]
+    ) -> Optional[int]:
+
+        if color is None:
+            return None
+
+        rgba = color.toTuple()
+
+        if rgba not in cache:
+            # glTF colors are linear
+            rgb = color.wrapped.GetRGB().Values(Quantity_TOC_RGB)
+
+            material: Dict[str, Any] = {
+                "pbrMetallicRoughness": {
+                    "baseColorFactor": [*rgb, rgba[3]],
+                    "metallicFactor": 0.0,
+                    "roughnessFactor": 0.5,
+                }
+            }
+            if rgba[3] < 1:
+                material["alphaMode"] = "BLEND"
+
+            cache[rgba] = len(self.materials)
+            self.materials.append(material)
+
+        return cache[rgba]
+
+    def _mesh(
+        self,
+        shape: Shape,
+        color: Optional[Color],
+        colors: Dict[Tuple[float, ...], int],
+    ) -> Optional[Tuple[Dict[str, Any], NDArray[float64]]]:
+
+        faces = shape._tessellateFaces(self.tolerance, self.angularTolerance, True)
+
+        if not faces:
+            return None
+
+        material = self._material(color, colors)
+
+        offsets = [0]
+        for v, _, _ in faces[:-1]:
+            offsets.append(offsets[-1] + len(v))
+
+        vertices = concatenate([v for v, _, _ in faces])
+        triangles = concatenate([t + o for (_, t, _), o in zip(faces, offsets)])
+        normals = concatenate([n for _, _, n in faces])
+
+        positions, D = quantizePositions(vertices)
+
+        if D[0, 0] / 2 <= self.tolerance:
+            position = self._add(
+                _padColumns(positions),
+                SHORT,
+                "VEC3",
+                ARRAY_BUFFER,
+                len(positions),
+                8,
+                min=positions.min(0).tolist(),
+                max=positions.max(0).tolist(),
+            )
+        else:
+            # the rounding error would exceed the tolerance
+            D = eye(4)
+            floats = vertices.astype(float32)
+
+            position = self._add(
+                floats,
+                FLOAT,
+                "VEC3",
+                ARRAY_BUFFER,
+                len(floats),
+                min=floats.min(0).tolist(),
+                max=floats.max(0).tolist(),
+            )
+        normal = self._add(
+            _padColumns(quantizeNormals(normals)),
+            BYTE,
+            "VEC3",
+            ARRAY_BUFFER,
+            len(normals),
+            4,
+            normalized=True,
+        )
+
+        small = len(vertices) <= 0xFFFF
+        indices = self._add(
+            triangles.astype(uint16 if small else uint32),
+            UNSIGNED_SHORT if small else UNSIGNED_INT,
+            "SCALAR",
+            ELEMENT_ARRAY_BUFFER,
+            triangles.size,
+        )
+
+        # (first index, index count) of every BRep face
+        ranges = []
+        start = 0
+        for _, t, _ in faces:
+            ranges.append([start, t.size])
+            start += t.size
+
+        primitive: Dict[str, Any] = {
+            "attributes": {"POSITION": position, "NORMAL": normal},
+            "indices": indices,
+            "extras": {"faceRanges": ranges},
+        }
+        if material is not None:
+            primitive["material"] = material
+
+        return {"primitives": [primitive]}, D
+
+    def toGlb(self) -> bytes:
+        """
+        Build the GLB file content.
+        """
+
+        meshes: List[Dict[str, Any]] = []
+        nodes: List[Dict[str, Any]] = [{"name": self.assy.name, "rotation": Y_UP}]
+
+        colors: Dict[Tuple[float, ...], int] = {}
+        cache: Dict[Any, Optional[Tuple[int, NDArray[float64]]]] = {}
+
+        for shape, name, loc, color in self.assy:
+
+            key = (
+                shape.located(Location()),
+                shape.wrapped.Orientation(),
+                color.toTuple() if color else None,
+            )
+
+            if key not in cache:
+                mesh = self._mesh(key[0], color, colors)
+
+                if mesh is None:
+                    cache[key] = None
+                else:
+                    cache[key] = (len(meshes), mesh[1])
+                    meshes.append({"name": name, **mesh[0]})
+
+            item = cache[key]
+            if item is None:
+                continue
+
+            ix, D = item
+
+            M = eye(4)
+            M[:3] = _toArray((loc * shape.location()).wrapped.Transformation())
+
+            nodes[0].setdefault("children", []).append(len(nodes))
+            nodes.append(
+                {
+                    "name": name,
+                    "mesh": ix,
+                    # glTF matrices are stored in column-major order
+                    "matrix": (M @ D).T.ravel().tolist(),
+                }
+            )
+
+        buffer = b"".join(self.chunks)
+
+        doc: Dict[str, Any] = {
+            "asset": {"version": "2.0", "generator": "cadquery"},
+            "scene": 0,
+            "scenes": [{"nodes": [0]}],
+            "nodes": nodes,
+        }
+
+        # empty arrays are not allowed by the glTF schema
+        if meshes:
+            doc["extensionsUsed"] = ["KHR_mesh_quantization"]
+            doc["extensionsRequired"] = ["KHR_mesh_quantization"]
+            doc["meshes"] = meshes
+            doc["accessors"] = self.accessors
+            doc["bufferViews"] = self.bufferViews
+            doc["buffers"] = [{"byteLength": len(buffer)}]
+        if self.materials:
+            doc["materials"] = self.materials
+
+        header = _pad(json.dumps(doc, separators=(",", ":")).encode(), b" ")
+        chunks = [pack("<2I", len(header), CHUNK_JSON), header]
+
+        if buffer:
+            chunks += [pack("<2I", len(buffer), CHUNK_BIN), buffer]
+
+        body = b"".join(chunks)
+
+        return pack("<3I", GLB_MAGIC, 2, 12 + len(body)) + body
+
+
+def exportGLB(
+    assy: AssemblyProtocol,
+    path: Union[str, BytesIO],
+    tolerance: float = 1e-3,
+    angularTolerance: float = 0.1,
+):
+    """
+    Export an assembly to a quantized binary glTF file.
+    """
+
+    data = GlbWriter(assy, tolerance, angularTolerance).toGlb()
+
+    if isinstance(path, (str, os.PathLike)):
+        with open(path, "wb") as f:
+            f.write(data)
+    else:
+        path.write(data)
@@ -4,6 +4,22 @@
     https://github.com/mrdoob/three.js/wiki/JSON-Model-format-3.0
 """
 
+import json
+import os
+
+from base64 import b64encode
+from io import BytesIO
+from typing import Any, Dict, List, Optional, Tuple, Union
+from typing_extensions import Literal
+
+from numpy import concatenate, float64, int32
+from numpy.typing import NDArray
+
+from ..shapes import Shape
+from .mesh import merge
+
+BufferLiterals = Literal["base64", "bin"]
+
 JSON_TEMPLATE = """\
 {
     "metadata" :
@@ -79,3 +95,140 @@ class JsonMesh(object):
             "nVertices": self.nVertices,
             "nFaces": self.nFaces,
         }
+
+
+def toBinaryMesh(
+    vertices: NDArray[float64],
+    triangles: NDArray[int32],
+    normals: Optional[NDArray[float64]] = None,
+    groups: Optional[List[Tuple[int, int]]] = None,
+    uri: Optional[str] = None,
+) -> Tuple[str, bytes]:
+    """
+    Convert arrays to a binary mesh JSON document. This is a CadQuery specific format,
+    see the documentation for a three.js loader.
+
+    Positions and normals are stored as little-endian float32 and the index as uint32
+    in a single binary buffer. Attributes reference the buffer using byteOffset and count.
+    If uri is None the buffer is embedded as a base64 data uri, otherwise uri is stored
+    and the buffer has to be written next to the JSON file.
+
+    :param groups: (first triangle, number of triangles) ranges, e.g. per BRep face.
+    :return: the JSON string and the binary buffer.
+    """
+
+    chunks: List[bytes] = []
+    offset = 0
+
+    def _accessor(data: Any, dtype: str, kind: str, itemSize: int) -> Dict[str, Any]:
+
+        nonlocal offset
+
+        buf = data.astype(dtype).tobytes()
+        rv = {
+            "itemSize": itemSize,
+            "type": kind,
+            "normalized": False,
+            "buffer": 0,
+            "byteOffset": offset,
+            "count": len(data),
+        }
+
+        chunks.append(buf)
+        offset += len(buf)
+
+        return rv
+
+    attributes = {"position": _accessor(vertices, "<f4", "Float32Array", 3)}
+
+    if normals is not None:
+        attributes["normal"] = _accessor(normals, "<f4", "Float32Array", 3)
+
+    index = _accessor(triangles.ravel(), "<u4", "Uint32Array", 1)
+
+    data: Dict[str, Any] = {"attributes": attributes, "index": index}
+
+    if groups:
+        data["groups"] = [
+            {"start": 3 * start, "count": 3 * count, "materialIndex": 0}
+            for start, count in groups
+        ]
+
+    buffer = b"".join(chunks)
+
+    return (
+        json.dumps(
+            {
+                "metadata": {
+                    "version": 1,
+                    "type": "BinaryMesh",
+                    "generator": "cadquery",
+                },
+                "data": data,
+                "buffers": [
+                    {
+                        "uri": uri
+                        or "data:application/octet-stream;base64,"
+                        + b64encode(buffer).decode(),
+                        "byteLength": len(buffer),
+                    }
+                ],
+            }
+        ),
+        buffer,
+    )
+
+
+def exportBinaryMesh(
+    shape: Shape,
+    fname: Union[str, BytesIO],
+    tolerance: float = 0.1,
+    angularTolerance: float = 0.1,
+    buffers: BufferLiterals = "base64",
+    normals: bool = False,
+    groups: bool = False,
+):
+    """
+    Export a shape to a binary mesh JSON file, see :func:`toBinaryMesh`.
+
+    :param fname: output filename or writable binary stream.
+    :param buffers: "base64" to embed the buffer in the JSON file or "bin" to write
+        it to a sidecar file with the same name and the .bin extension.
+    :param normals: include vertex normals computed from the surfaces.
+    :param groups: include a group (index range) per BRep face.
+    """
+
+    faces = shape._tessellateFaces(tolerance, angularTolerance, normals)
+    vertices, triangles = merge([(v, t) for v, t, _ in faces])
+
+    uri = None
+    if buffers == "bin":
+        if not isinstance(fname, (str, os.PathLike)):
+            raise ValueError("Sidecar buffers cannot be written to a stream")
+
+        binname = os.path.splitext(fname)[0] + ".bin"
+        uri = os.path.basename(binname)
+
+    ranges = []
+    start = 0
+    for _, t, _ in faces:
+        ranges.append((start, len(t)))
+        start += len(t)
+
+    doc, buffer = toBinaryMesh(
+        vertices,
+        triangles,
+        concatenate([n for _, _, n in faces]) if normals and faces else None,
+        ranges if groups else None,
+        uri,
+    )
+
+    if isinstance(fname, (str, os.PathLike)):
+        with open(fname, "w") as f:
+            f.write(doc)
+    else:
+        fname.write(doc.encode())
+
+    if uri:
+        with open(binname, "wb") as f:
+            f.write(buffer)
@@ -0,0 +1,208 @@
+from collections import Counter
+from concurrent.futures import Executor, ProcessPoolExecutor
+from io import BytesIO
+from itertools import repeat
+from multiprocessing import cpu_count
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from numpy import concatenate, empty, float64, int32
+from numpy.typing import NDArray
+
+from OCP.BinTools import BinTools, BinTools_FormatVersion
+from OCP.BRepMesh import BRepMesh_IncrementalMesh
+from OCP.TopAbs import TopAbs_Orientation
+from OCP.TopoDS import TopoDS_Shape
+
+from ..geom import Location, _toArray
+from ..shapes import Compound, Shape
+from ...utils import mpContext
+
+Tessellation = Tuple[Sequence[Iterable[float]], Sequence[Tuple[int, int, int]]]
+ArrayTessellation = Tuple[NDArray[float64], NDArray[int32]]
+
+TOL = 1e-9
+
+
+class Tessellations(NamedTuple):
+    """
+    Tessellation of a shape with repeated parts stored once.
+    """
+
+    parts: List[ArrayTessellation]  # meshes in global coordinates
+    bases: List[ArrayTessellation]  # meshes of the repeated parts
+    instances: List[Tuple[int, Location]]  # base index and location of every copy
+
+
+def _leaves(shape: Shape) -> Iterator[Shape]:
+
+    if isinstance(shape, Compound):
+        for s in shape:
+            yield from _leaves(s)
+    else:
+        yield shape
+
+
+def _rigid(loc: Location) -> bool:
+
+    T = loc.wrapped.Transformation()
+
+    return not T.IsNegative() and abs(T.ScaleFactor() - 1) < TOL
+
+
+def _valid(tess: ArrayTessellation) -> bool:
+
+    # shapes without faces do not tessellate
+    return len(tess[0]) > 0 and len(tess[1]) > 0
+
+
+def tessellateInstances(
+    shape: Shape, tolerance: float, angularTolerance: float = 0.1
+) -> Tessellations:
+    """
+    Tessellate all non-compound subshapes. Subshapes sharing the same TShape and
+    orientation that occur more than once and are placed with a rigid transformation
+    are tessellated once and reported as instances.
+    """
+
+    leaves = list(_leaves(shape))
+    keys = [(s.located(Location()), s.wrapped.Orientation()) for s in leaves]
+    counts = Counter(keys)
+
+    rv = Tessellations([], [], [])
+    bases: Dict[Tuple[Shape, TopAbs_Orientation], Optional[int]] = {}
+
+    for s, k in zip(leaves, keys):
+
+        loc = s.location()
+
+        if counts[k] > 1 and _rigid(loc):
+            if k not in bases:
+                tess = k[0]._tessellateArrays(tolerance, angularTolerance)
+                bases[k] = len(rv.bases) if _valid(tess) else None
+
+                if _valid(tess):
+                    rv.bases.append(tess)
+
+            ix = bases[k]
+            if ix is not None:
+                rv.instances.append((ix, loc))
+
+        else:
+            tess = s._tessellateArrays(tolerance, angularTolerance)
+
+            if _valid(tess):
+                rv.parts.append(tess)
+
+    return rv
+
+
+def _extract(
+    data: bytes, tolerance: float, angularTolerance: float
+) -> ArrayTessellation:
+
+    shape = TopoDS_Shape()
+    BinTools.Read_s(shape, BytesIO(data))
+
+    return Shape.cast(shape)._tessellateArrays(tolerance, angularTolerance)
+
+
+def tessellateParallel(
+    shape: Shape,
+    tolerance: float,
+    angularTolerance: float = 0.1,
+    processes: Optional[int] = None,
+    executor: Optional[Executor] = None,
+) -> ArrayTessellation:
+    """
+    Same as Shape._tessellateArrays, but the faces are meshed in parallel by OCCT and
+    their triangulations are extracted in worker processes. The faces are sent to the
+    workers in the binary BREP format, together with their triangulations.
+
+    :param processes: Number of worker processes. Default None, i.e. the number of CPUs.
+    :param executor: Executor used instead of a new pool, e.g. to reuse the workers.
+    """
+
+    BRepMesh_IncrementalMesh(shape.wrapped, tolerance, True, angularTolerance, True)
+
+    n = processes or cpu_count() or 1
+    faces = shape.Faces()
+
+    if n == 1 or len(faces) < 2:
+        return shape._tessellateArrays(tolerance, angularTolerance)
+
+    # contiguous chunks keep the order of the faces, few per worker balance the load
+    size = -(-len(faces) // (4 * n))
+    chunks = []
+
+    for i in range(0, len(faces), size):
+        data = BytesIO()
+        BinTools.Write_s(
+            Compound.makeCompound(faces[i : i + size]).wrapped,
+            data,
+            False,
+            True,
+            BinTools_FormatVersion.BinTools_FormatVersion_CURRENT,
+        )
+        chunks.append(data.getvalue())
+
+    def _map(ex: Executor) -> ArrayTessellation:
+
+        return merge(
+            list(ex.map(_extract, chunks, repeat(tolerance), repeat(angularTolerance)))
+        )
+
+    if executor is not None:
+        return _map(executor)
+
+    with ProcessPoolExecutor(n, mp_context=mpContext()) as pool:
+        return _map(pool)
+
+
+def merge(tessellations: Sequence[ArrayTessellation]) -> ArrayTessellation:
+    """
+    Merge multiple tessellations into one.
+    """
+
+    if not tessellations:
+        return empty((0, 3), dtype=float64), empty((0, 3), dtype=int32)
+
+    offsets = [0]
+    for v, _ in tessellations[:-1]:
+        offsets.append(offsets[-1] + len(v))
+
+    return (
+        concatenate([v for v, _ in tessellations]),
+        concatenate([t + o for (_, t), o in zip(tessellations, offsets)]),
+    )
+
+
+def flatten(tessellations: Tessellations) -> ArrayTessellation:
+    """
+    Merge parts and all instances into one tessellation in global coordinates.
+    """
+
+    copies = []
+
+    for i, loc in tessellations.instances:
+        v, t = tessellations.bases[i]
+        M = _toArray(loc.wrapped.Transformation())
+        copies.append((v @ M[:, :3].T + M[:, 3], t))
+
+    return merge(tessellations.parts + copies)
+
+
+def toLists(tessellation: ArrayTessellation) -> Tessellation:
+    """
+    Convert a tessellation to lists, which are faster to iterate over.
+    """
+
+    return tessellation[0].tolist(), tessellation[1].tolist()
@@ -0,0 +1,272 @@
+"""
+    Batch STEP export in a pool of worker processes
+"""
+
+from concurrent.futures import (
+    ALL_COMPLETED,
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    wait,
+)
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from multiprocessing import cpu_count
+from os.path import getsize
+from time import perf_counter
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from OCP.BinTools import BinTools, BinTools_FormatVersion
+from OCP.IFSelect import IFSelect_ReturnStatus
+from OCP.Interface import Interface_Static
+from OCP.STEPControl import (
+    STEPControl_AsIs,
+    STEPControl_Controller,
+    STEPControl_Writer,
+)
+from OCP.TopoDS import TopoDS_Shape
+
+from ...utils import mpContext
+from ..shapes import Shape
+
+# values of the write.step.unit parameter and their length in mm
+UNITS = {
+    "INCH": 25.4,
+    "MM": 1.0,
+    "FT": 304.8,
+    "MI": 1609344.0,
+    "M": 1000.0,
+    "KM": 1e6,
+    "MIL": 0.0254,
+    "UM": 1e-3,
+    "CM": 10.0,
+    "UIN": 2.54e-5,
+}
+
+# length unit of the files written by this worker process, in mm
+_unit = 1.0
+
+
+class StepResult(NamedTuple):
+    """
+    Outcome of a single file of :func:`exportStepBatch`.
+    """
+
+    fname: str
+    ok: bool
+    time: float  # wall time of the worker in seconds
+    size: int  # file size in bytes, 0 on failure
+    error: Optional[str]
+
+
+class StepBatchReport(NamedTuple):
+    """
+    Outcome of :func:`exportStepBatch`.
+    """
+
+    results: List[StepResult]  # in the order of the input
+    time: float  # wall time of the batch in seconds
+
+    @property
+    def failures(self) -> List[StepResult]:
+
+        return [r for r in self.results if not r.ok]
+
+    @property
+    def throughput(self) -> float:
+        """
+        Files written per second.
+        """
+
+        return (len(self.results) - len(self.failures)) / self.time if self.time else 0
+
+
+def _toBin(shape: Shape) -> bytes:
+
+    # triangulations are not needed for STEP
+    data = BytesIO()
+    BinTools.Write_s(
+        shape.wrapped,
+        data,
+        False,
+        False,
+        BinTools_FormatVersion.BinTools_FormatVersion_CURRENT,
+    )
+
+    return data.getvalue()
+
+
+def _configure(config: Dict[str, Any], unit: float):
+
+    global _unit
+
+    # Interface_Static is global, so every worker is configured once; the STEP
+    # parameters are defined by the controller
+    STEPControl_Controller.Init_s()
+    _unit = unit
+
+    for k, v in config.items():
+        if isinstance(v, str):
+            Interface_Static.SetCVal_s(k, v)
+        elif isinstance(v, float):
+            Interface_Static.SetRVal_s(k, v)
+        else:
+            Interface_Static.SetIVal_s(k, v)
+
+
+def _write(data: bytes, fname: str) -> StepResult:
+
+    t0 = perf_counter()
+
+    try:
+        shape = TopoDS_Shape()
+        BinTools.Read_s(shape, BytesIO(data))
+
+        writer = STEPControl_Writer()
+        # geometry is only scaled to the unit of the header if set on the model
+        writer.Model(True).SetWriteLengthUnit(_unit)
+
+        status = writer.Transfer(shape, STEPControl_AsIs)
+
+        if status == IFSelect_ReturnStatus.IFSelect_RetDone:
+            status = writer.Write(fname)
+
+        if status == IFSelect_ReturnStatus.IFSelect_RetDone:
+            return StepResult(fname, True, perf_counter() - t0, getsize(fname), None)
+
+        error = f"STEP writer failed with {status.name}"
+
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+
+    return StepResult(fname, False, perf_counter() - t0, 0, error)
+
+
+def exportStepBatch(
+    items: Iterable[Tuple[Shape, str]],
+    processes: Optional[int] = None,
+    unit: str = "MM",
+    precision_mode: int = 0,
+    precision: Optional[float] = None,
+    write_pcurves: bool = True,
+) -> StepBatchReport:
+    """
+    Export many shapes to separate STEP files in a pool of worker processes.
+
+    The STEP writer settings are global, so they are applied once per worker and the
+    calling process is not affected. Shapes are sent to the workers in the binary BREP
+    format, a limited number of them at a time. Failures are reported per file and do
+    not stop the batch. If a worker crashes, the pool is restarted and the items that
+    were in flight are retried one at a time, so that only the item that crashed the
+    worker is reported as failed.
+
+    :param items: (shape, fname) pairs.
+    :param processes: Number of worker processes. Default None, i.e. the number of CPUs.
+    :param unit: Length unit of the files, e.g. "MM", "M" or "INCH". Default "MM".
+    :param precision_mode: Controls the uncertainty value for STEP entities. Specify -1, 0
+        or 1. Default 0. Ignored if precision is given. See OCCT documentation.
+    :param precision: Uncertainty value for STEP entities in model units. Default None.
+    :param write_pcurves: Enable or disable writing parametric curves. Default True.
+    :return: StepBatchReport with a StepResult (fname, ok, time, size, error) for every
+        item, the total time, the failures and the throughput.
+    """
+
+    if unit.upper() not in UNITS:
+        raise ValueError(f"Unknown unit {unit}, use one of {', '.join(UNITS)}")
+
+    config: Dict[str, Any] = {
+        "write.step.unit": unit.upper(),
+        "write.surfacecurve.mode": 1 if write_pcurves else 0,
+        "write.precision.mode": precision_mode,
+    }
+
+    if precision is not None:
+        config["write.precision.mode"] = 2  # user defined
+        config["write.precision.val"] = float(precision)
+
+    n = processes or cpu_count() or 1
+
+    def _pool() -> ProcessPoolExecutor:
+
+        return ProcessPoolExecutor(
+            n,
+            mp_context=mpContext(),
+            initializer=_configure,
+            initargs=(config, UNITS[unit.upper()]),
+        )
+
+    rv: Dict[int, StepResult] = {}
+    pending: Dict[Future, Tuple[int, str, bytes]] = {}
+    suspects: List[Tuple[int, str, bytes]] = []
+
+    def _failed(fname: str, e: Exception) -> StepResult:
+
+        return StepResult(fname, False, 0, 0, f"{type(e).__name__}: {e}")
+
+    def _collect(futures: Iterable[Future]):
+
+        for f in futures:
+            i, fname, data = pending.pop(f)
+
+            try:
+                rv[i] = f.result()
+            except BrokenProcessPool:
+                # all items in flight fail, not only the one that crashed the worker
+                suspects.append((i, fname, data))
+            except Exception as e:
+                rv[i] = _failed(fname, e)
+
+    def _recover():
+
+        nonlocal executor
+
+        _collect(wait(pending).done)
+
+        executor.shutdown()
+        executor = _pool()
+
+        # retry alone to find the item that crashed the worker
+        for i, fname, data in sorted(suspects):
+            try:
+                rv[i] = executor.submit(_write, data, fname).result()
+            except BrokenProcessPool as e:
+                rv[i] = _failed(fname, e)
+
+                executor.shutdown()
+                executor = _pool()
+
+        suspects.clear()
+
+    def _submit(i: int, fname: str, data: bytes):
+
+        try:
+            f = executor.submit(_write, data, fname)
+        except BrokenProcessPool:
+            _recover()
+            f = executor.submit(_write, data, fname)
+
+        pending[f] = (i, fname, data)
+
+    def _wait(when: str):
+
+        _collect(wait(pending, return_when=when).done)
+
+        if suspects:
+            _recover()
+
+    t0 = perf_counter()
+    executor = _pool()
+
+    try:
+        for i, (shape, fname) in enumerate(items):
+            _submit(i, fname, _toBin(shape))
+
+            # limit the number of serialized shapes held in memory
+            if len(pending) >= 4 * n:
+                _wait(FIRST_COMPLETED)
+
+        _wait(ALL_COMPLETED)
+    finally:
+        executor.shutdown()
+
+    return StepBatchReport([rv[i] for i in range(len(rv))], perf_counter() - t0)
@@ -0,0 +1,62 @@
+"""
+    Binary STL writer for array tessellations
+"""
+
+import os
+
+from io import BytesIO
+from typing import Union
+
+from numpy import cross, dtype, einsum, empty, float32, sqrt, uint32, void
+from numpy.typing import NDArray
+
+from .mesh import ArrayTessellation
+
+HEADER = b"Binary STL exported by CadQuery".ljust(80, b"\0")
+
+# layout of one facet record: normal, three vertices and the attribute byte count
+FACET = dtype([("normal", "<f4", 3), ("vertices", "<f4", (3, 3)), ("attr", "<u2")])
+
+
+def facets(tessellation: ArrayTessellation) -> NDArray[void]:
+    """
+    Convert a tessellation to a structured array of binary STL facet records.
+    Normals are computed from the triangle orientation, degenerate triangles get
+    a zero normal.
+    """
+
+    vertices, triangles = tessellation
+
+    rv = empty(len(triangles), dtype=FACET)
+
+    # compute in single precision, as stored in the file
+    tris = rv["vertices"]
+    tris[:] = vertices.astype(float32)[triangles]
+
+    normals = cross(tris[:, 1] - tris[:, 0], tris[:, 2] - tris[:, 0])
+    lengths = sqrt(einsum("ij,ij->i", normals, normals))
+    lengths[lengths == 0] = 1
+
+    rv["normal"] = normals / lengths[:, None]
+    rv["attr"] = 0
+
+    return rv
+
+
+def writeStl(tessellation: ArrayTessellation, fname: Union[str, BytesIO]):
+    """
+    Write a tessellation as binary STL to a file or a writable binary stream.
+    """
+
+    data = facets(tessellation)
+    count = uint32(len(data)).tobytes()
+
+    if isinstance(fname, (str, os.PathLike)):
+        with open(fname, "wb") as f:
+            f.write(HEADER)
+            f.write(count)
+            data.tofile(f)
+    else:
+        fname.write(HEADER)
+        fname.write(count)
+        fname.write(data.data)
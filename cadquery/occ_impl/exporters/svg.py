@@ -1,14 +1,29 @@
+import atexit
 import io as StringIO
 
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from os import cpu_count
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from ...utils import mpContext
 from ..shapes import Shape, Compound, TOLERANCE
 from ..geom import BoundBox
 
 
 from OCP.gp import gp_Ax2, gp_Pnt, gp_Dir
+from OCP.BRep import BRep_Tool
 from OCP.BRepLib import BRepLib
-from OCP.HLRBRep import HLRBRep_Algo, HLRBRep_HLRToShape
+from OCP.HLRBRep import (
+    HLRBRep_Algo,
+    HLRBRep_HLRToShape,
+    HLRBRep_PolyAlgo,
+    HLRBRep_PolyHLRToShape,
+)
 from OCP.HLRAlgo import HLRAlgo_Projector
 from OCP.GCPnts import GCPnts_QuasiUniformDeflection
+from OCP.TopExp import TopExp
 
 DISCRETIZATION_TOLERANCE = 1e-3
 
@@ -106,7 +121,68 @@ def makeSVGedge(e):
     return cs.getvalue()
 
 
-def getPaths(visibleShapes, hiddenShapes):
+def makeSVGpolylines(s):
+    """
+    Creates SVG polylines from the straight edges of a polygonal HLR result.
+    Segments sharing end points are joined.
+    """
+
+    segments = []
+    ends = defaultdict(list)
+
+    for e in s.Edges():
+        a, b = (
+            (round(p.X(), 9), round(p.Y(), 9))
+            for p in (
+                BRep_Tool.Pnt_s(TopExp.FirstVertex_s(e.wrapped)),
+                BRep_Tool.Pnt_s(TopExp.LastVertex_s(e.wrapped)),
+            )
+        )
+
+        ends[a].append(len(segments))
+        ends[b].append(len(segments))
+        segments.append((a, b))
+
+    used = [False] * len(segments)
+
+    def extend(chain, end):
+        # follow unused segments starting at the given end of the chain
+        while True:
+            p = chain[end]
+            i = next((i for i in ends[p] if not used[i]), None)
+
+            if i is None:
+                break
+
+            used[i] = True
+            a, b = segments[i]
+            q = b if a == p else a
+
+            if end:
+                chain.append(q)
+            else:
+                chain.appendleft(q)
+
+    rv = []
+
+    for i, (a, b) in enumerate(segments):
+        if used[i]:
+            continue
+
+        used[i] = True
+        chain = deque((a, b))
+        extend(chain, -1)
+        extend(chain, 0)
+
+        it = iter(chain)
+        rv.append(
+            "M{},{} ".format(*next(it)) + "".join("L{},{} ".format(*p) for p in it)
+        )
+
+    return rv
+
+
+def getPaths(visibleShapes, hiddenShapes, fast=False):
     """
     Collects the visible and hidden edges from the CadQuery object.
     """
@@ -115,79 +191,72 @@ def getPaths(visibleShapes, hiddenShapes):
     visiblePaths = []
 
     for s in visibleShapes:
-        for e in s.Edges():
-            visiblePaths.append(makeSVGedge(e))
+        if fast:
+            visiblePaths.extend(makeSVGpolylines(s))
+        else:
+            for e in s.Edges():
+                visiblePaths.append(makeSVGedge(e))
 
     for s in hiddenShapes:
-        for e in s.Edges():
-            hiddenPaths.append(makeSVGedge(e))
+        if fast:
+            hiddenPaths.extend(makeSVGpolylines(s))
+        else:
+            for e in s.Edges():
+                hiddenPaths.append(makeSVGedge(e))
 
     return (hiddenPaths, visiblePaths)
 
 
-def getSVG(shape, opts=None):
-    """
-    Export a shape to SVG text.
+DEFAULT_DIR = (-1.75, 1.1, 5)
 
-    :param shape: A CadQuery shape object to convert to an SVG string.
-    :type Shape: Vertex, Edge, Wire, Face, Shell, Solid, or Compound.
-    :param opts: An options dictionary that influences the SVG that is output.
-    :type opts: Dictionary, keys are as follows:
-        width: Width of the resulting image (None to fit based on height).
-        height: Height of the resulting image (None to fit based on width).
-        marginLeft: Inset margin from the left side of the document.
-        marginTop: Inset margin from the top side of the document.
-        projectionDir: Direction the camera will view the shape from.
-        showAxes: Whether or not to show the axes indicator, which will only be
-                  visible when the projectionDir is also at the default.
-        strokeWidth: Width of the line that visible edges are drawn with.
-        strokeColor: Color of the line that visible edges are drawn with.
-        hiddenColor: Color of the line that hidden edges are drawn with.
-        showHidden: Whether or not to show hidden lines.
-        focus: If specified, creates a perspective SVG with the projector
-               at the distance specified.
+# Available options and their defaults
+DEFAULT_OPTS: Dict[str, Any] = {
+    "width": 800,
+    "height": 240,
+    "marginLeft": 200,
+    "marginTop": 20,
+    "projectionDir": DEFAULT_DIR,
+    "showAxes": True,
+    "strokeWidth": -1.0,  # -1 = calculated based on unitScale
+    "strokeColor": (0, 0, 0),  # RGB 0-255
+    "hiddenColor": (160, 160, 160),  # RGB 0-255
+    "showHidden": True,
+    "focus": None,
+    "fast": False,
+    "tolerance": 0.1,
+    "angularTolerance": 0.1,
+}
+
+HLR = Union[HLRBRep_Algo, HLRBRep_PolyAlgo]
+
+
+def _hlr(shape, fast: bool, tolerance: float, angularTolerance: float) -> HLR:
+    """
+    Build the HLR data structure of a shape, which can be reused for multiple
+    projection directions.
     """
 
-    # Available options and their defaults
-    d = {
-        "width": 800,
-        "height": 240,
-        "marginLeft": 200,
-        "marginTop": 20,
-        "projectionDir": (-1.75, 1.1, 5),
-        "showAxes": True,
-        "strokeWidth": -1.0,  # -1 = calculated based on unitScale
-        "strokeColor": (0, 0, 0),  # RGB 0-255
-        "hiddenColor": (160, 160, 160),  # RGB 0-255
-        "showHidden": True,
-        "focus": None,
-    }
+    rv: HLR
 
-    if opts:
-        d.update(opts)
+    if fast:
+        # the polygonal algorithm works on the triangulation, an existing one is reused
+        shape.mesh(tolerance, angularTolerance)
 
-    # need to guess the scale and the coordinate center
-    uom = guessUnitOfMeasure(shape)
+        rv = HLRBRep_PolyAlgo()
+        rv.Load(shape.wrapped)
+    else:
+        rv = HLRBRep_Algo()
+        rv.Add(shape.wrapped)
 
-    # Handle the case where the height or width are None
-    width = d["width"]
-    if width != None:
-        width = float(d["width"])
-    height = d["height"]
-    if d["height"] != None:
-        height = float(d["height"])
-    marginLeft = float(d["marginLeft"])
-    marginTop = float(d["marginTop"])
-    projectionDir = tuple(d["projectionDir"])
-    showAxes = bool(d["showAxes"])
-    strokeWidth = float(d["strokeWidth"])
-    strokeColor = tuple(d["strokeColor"])
-    hiddenColor = tuple(d["hiddenColor"])
-    showHidden = bool(d["showHidden"])
-    focus = float(d["focus"]) if d.get("focus") else None
+    return rv
 
-    hlr = HLRBRep_Algo()
-    hlr.Add(shape.wrapped)
+
+def _project(
+    hlr: HLR, projectionDir: Tuple[float, ...], focus: Optional[float]
+) -> Tuple[List[Shape], List[Shape]]:
+    """
+    Compute the visible and hidden edges in the projection plane.
+    """
 
     coordinate_system = gp_Ax2(gp_Pnt(), gp_Dir(*projectionDir))
 
@@ -196,11 +265,21 @@ def getSVG(shape, opts=None):
     else:
         projector = HLRAlgo_Projector(coordinate_system)
 
+    if isinstance(hlr, HLRBRep_Algo):
+        # outlines are cached per shape and depend on the projector
+        hlr.OutLinedShapeNullify()
+
     hlr.Projector(projector)
     hlr.Update()
-    hlr.Hide()
 
-    hlr_shapes = HLRBRep_HLRToShape(hlr)
+    hlr_shapes: Union[HLRBRep_HLRToShape, HLRBRep_PolyHLRToShape]
+
+    if isinstance(hlr, HLRBRep_PolyAlgo):
+        hlr_shapes = HLRBRep_PolyHLRToShape()
+        hlr_shapes.Update(hlr)
+    else:
+        hlr.Hide()
+        hlr_shapes = HLRBRep_HLRToShape(hlr)
 
     visible = []
 
@@ -227,15 +306,40 @@ def getSVG(shape, opts=None):
         hidden.append(hidden_contour_edges)
 
     # Fix the underlying geometry - otherwise we will get segfaults
-    for el in visible:
-        BRepLib.BuildCurves3d_s(el, TOLERANCE)
-    for el in hidden:
-        BRepLib.BuildCurves3d_s(el, TOLERANCE)
+    if isinstance(hlr, HLRBRep_Algo):
+        for el in visible:
+            BRepLib.BuildCurves3d_s(el, TOLERANCE)
+        for el in hidden:
+            BRepLib.BuildCurves3d_s(el, TOLERANCE)
 
     # convert to native CQ objects
-    visible = list(map(Shape, visible))
-    hidden = list(map(Shape, hidden))
-    (hiddenPaths, visiblePaths) = getPaths(visible, hidden)
+    return list(map(Shape, visible)), list(map(Shape, hidden))
+
+
+def _render(
+    visible: List[Shape], hidden: List[Shape], uom: str, d: Dict[str, Any]
+) -> str:
+    """
+    Render projected edges to SVG text.
+    """
+
+    # Handle the case where the height or width are None
+    width = d["width"]
+    if width != None:
+        width = float(d["width"])
+    height = d["height"]
+    if d["height"] != None:
+        height = float(d["height"])
+    marginLeft = float(d["marginLeft"])
+    marginTop = float(d["marginTop"])
+    projectionDir = tuple(d["projectionDir"])
+    showAxes = bool(d["showAxes"])
+    strokeWidth = float(d["strokeWidth"])
+    strokeColor = tuple(d["strokeColor"])
+    hiddenColor = tuple(d["hiddenColor"])
+    showHidden = bool(d["showHidden"])
+
+    (hiddenPaths, visiblePaths) = getPaths(visible, hidden, bool(d["fast"]))
 
     # get bounding box -- these are all in 2D space
     bb = Compound.makeCompound(hidden + visible).BoundingBox()
@@ -280,7 +384,7 @@ def getSVG(shape, opts=None):
         visibleContent += PATHTEMPLATE % p
 
     # If the caller wants the axes indicator and is using the default direction, add in the indicator
-    if showAxes and projectionDir == (-1.75, 1.1, 5):
+    if showAxes and projectionDir == DEFAULT_DIR:
         axesIndicator = AXES_TEMPLATE % (
             {"unitScale": str(unitScale), "textboxY": str(height - 30), "uom": str(uom)}
         )
@@ -308,6 +412,129 @@ def getSVG(shape, opts=None):
     return svg
 
 
+def _views(shape, dirs: List[Tuple[float, ...]], opts: Dict[str, Any]) -> List[str]:
+    """
+    Render multiple views of a shape sharing one HLR data structure.
+    """
+
+    # need to guess the scale and the coordinate center
+    uom = guessUnitOfMeasure(shape)
+    focus = float(opts["focus"]) if opts.get("focus") else None
+
+    hlr = _hlr(
+        shape,
+        bool(opts["fast"]),
+        float(opts["tolerance"]),
+        float(opts["angularTolerance"]),
+    )
+
+    rv = []
+
+    for projectionDir in dirs:
+        visible, hidden = _project(hlr, projectionDir, focus)
+        rv.append(
+            _render(visible, hidden, uom, {**opts, "projectionDir": projectionDir})
+        )
+
+    return rv
+
+
+def getSVG(shape, opts=None):
+    """
+    Export a shape to SVG text.
+
+    :param shape: A CadQuery shape object to convert to an SVG string.
+    :type Shape: Vertex, Edge, Wire, Face, Shell, Solid, or Compound.
+    :param opts: An options dictionary that influences the SVG that is output.
+    :type opts: Dictionary, keys are as follows:
+        width: Width of the resulting image (None to fit based on height).
+        height: Height of the resulting image (None to fit based on width).
+        marginLeft: Inset margin from the left side of the document.
+        marginTop: Inset margin from the top side of the document.
+        projectionDir: Direction the camera will view the shape from.
+        showAxes: Whether or not to show the axes indicator, which will only be
+                  visible when the projectionDir is also at the default.
+        strokeWidth: Width of the line that visible edges are drawn with.
+        strokeColor: Color of the line that visible edges are drawn with.
+        hiddenColor: Color of the line that hidden edges are drawn with.
+        showHidden: Whether or not to show hidden lines.
+        focus: If specified, creates a perspective SVG with the projector
+               at the distance specified.
+        fast: Whether to remove hidden lines on the triangulation of the shape
+              instead of the exact geometry. Faster, but edges are polylines.
+        tolerance: Linear deflection used to triangulate the shape in fast mode,
+                   an existing finer triangulation is reused.
+        angularTolerance: Angular deflection used to triangulate the shape in fast mode.
+    """
+
+    d = dict(DEFAULT_OPTS)
+
+    if opts:
+        d.update(opts)
+
+    return _views(shape, [tuple(d["projectionDir"])], d)[0]
+
+
+# worker pools of getSVGViews, by number of workers
+_pools: Dict[int, ProcessPoolExecutor] = {}
+
+
+@atexit.register
+def _shutdown():
+
+    for pool in _pools.values():
+        pool.shutdown(cancel_futures=True)
+
+    _pools.clear()
+
+
+def getSVGViews(
+    shape,
+    dirs: Iterable[Tuple[float, float, float]],
+    opts=None,
+    processes: Optional[int] = None,
+) -> List[str]:
+    """
+    Export multiple views of a shape to SVG text.
+
+    The HLR data structure is built once per worker process and shared by all the
+    views it renders. Worker pools are kept for subsequent calls.
+
+    :param shape: A CadQuery shape object to convert to SVG strings.
+    :param dirs: Directions the camera will view the shape from.
+    :param opts: An options dictionary as accepted by getSVG, projectionDir is ignored.
+    :param processes: Number of worker processes, by default one per view. Capped
+        at the number of CPUs. With 1 all views are rendered in the calling process.
+    :return: A list of SVG strings, one per direction.
+    """
+
+    d = dict(DEFAULT_OPTS)
+
+    if opts:
+        d.update(opts)
+
+    views = [tuple(el) for el in dirs]
+    n = min(len(views), processes or len(views), cpu_count() or 1)
+
+    if n <= 1:
+        return _views(shape, views, d)
+
+    if d["fast"]:
+        # triangulate once, the triangulation is sent to the workers with the shape
+        shape.mesh(float(d["tolerance"]), float(d["angularTolerance"]))
+
+    # contiguous chunks of views per worker
+    k = -(-len(views) // n)
+    chunks = [views[i : i + k] for i in range(0, len(views), k)]
+
+    if n not in _pools:
+        _pools[n] = ProcessPoolExecutor(n, mp_context=mpContext())
+
+    results = _pools[n].map(_views, repeat(shape), chunks, repeat(d))
+
+    return [svg for chunk in results for svg in chunk]
+
+
 def exportSVG(shape, fileName: str, opts=None):
     """
     Accept a cadquery shape, and export it to the provided file
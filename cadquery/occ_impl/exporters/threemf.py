@@ -1,10 +1,14 @@
 from datetime import datetime
 from os import PathLike
 import xml.etree.cElementTree as ET
-from typing import IO, List, Literal, Tuple, Union
-from zipfile import ZipFile, ZIP_DEFLATED, ZIP_STORED
+from typing import IO, Literal, Optional, Union
+from zipfile import ZipFile, ZIP_DEFLATED, ZIP_STORED, ZIP64_LIMIT
 
-from ..shapes import Compound, Shape, Vector
+from numpy.typing import NDArray
+
+from ..geom import Location, _toArray
+from ..shapes import Shape
+from .mesh import ArrayTessellation, Tessellations, tessellateInstances
 
 
 class CONTENT_TYPES(object):
@@ -21,6 +25,23 @@ class SCHEMAS(object):
 
 Unit = Literal["micron", "millimeter", "centimeter", "meter", "inch", "foot"]
 
+VERTEX = '<vertex x="%r" y="%r" z="%r" />'
+TRIANGLE = '<triangle v1="%d" v2="%d" v3="%d" />'
+
+# approximate size of a formatted vertex and triangle, used to enable zip64
+VERTEX_SIZE = 80
+TRIANGLE_SIZE = 50
+
+
+def _transform(loc: Location) -> str:
+    """
+    3MF transform attribute, i.e. the transposed rotation matrix followed by the translation.
+    """
+
+    M = _toArray(loc.wrapped.Transformation())
+
+    return " ".join(repr(el) for el in M[:, :3].T.ravel().tolist() + M[:, 3].tolist())
+
 
 class ThreeMFWriter(object):
     def __init__(
@@ -29,27 +50,33 @@ class ThreeMFWriter(object):
         tolerance: float,
         angularTolerance: float,
         unit: Unit = "millimeter",
+        tessellations: Optional[Tessellations] = None,
+        chunksize: int = 65536,
     ):
         """
         Initialize the writer.
         Used to write the given Shape to a 3MF file.
+
+        Repeated parts (same TShape, different Location) are written once and referenced
+        by components with a transform. If tessellations are provided, the shape is not
+        tessellated again. Vertices and triangles are formatted and written chunksize rows
+        at a time.
         """
         self.unit = unit
+        self.chunksize = chunksize
 
-        if isinstance(shape, Compound):
-            shapes = list(shape)
-        else:
-            shapes = [shape]
+        if tessellations is None:
+            tessellations = tessellateInstances(shape, tolerance, angularTolerance)
 
-        tessellations = [s.tessellate(tolerance, angularTolerance) for s in shapes]
-        # Remove shapes that did not tesselate
-        self.tessellations = [t for t in tessellations if all(t)]
+        self.tessellations = tessellations
 
     def write3mf(
         self, outfile: Union[PathLike, str, IO[bytes]],
     ):
         """
         Write to the given file.
+
+        The model is streamed into the archive, so the XML document is never held in memory.
         """
 
         try:
@@ -59,75 +86,74 @@ class ThreeMFWriter(object):
         except ImportError:
             compression = ZIP_STORED
 
+        size = sum(
+            len(v) * VERTEX_SIZE + len(t) * TRIANGLE_SIZE
+            for v, t in self.tessellations.parts + self.tessellations.bases
+        )
+
         with ZipFile(outfile, "w", compression) as zf:
             zf.writestr("_rels/.rels", self._write_relationships())
             zf.writestr("[Content_Types].xml", self._write_content_types())
-            zf.writestr("3D/3dmodel.model", self._write_3d())
-
-    def _write_3d(self) -> str:
+            with zf.open("3D/3dmodel.model", "w", force_zip64=size > ZIP64_LIMIT) as f:
+                self._write_3d(f)
+
+    def _write_3d(self, f: IO[bytes]):
+
+        parts, bases, instances = self.tessellations
+        no_meshes = len(parts) + len(bases)
+
+        f.write(
+            (
+                "<?xml version='1.0' encoding='utf-8'?>\n"
+                f'<model xml:lang="en-US" xmlns="{SCHEMAS.CORE}" unit="{self.unit}">'
+                '<metadata name="Application">CadQuery 3MF Exporter</metadata>'
+                f'<metadata name="CreationDate">{datetime.now().isoformat()}</metadata>'
+                "<resources>"
+            ).encode()
+        )
 
-        no_meshes = len(self.tessellations)
+        # Add all meshes to resources, repeated parts are added once
+        for i, tessellation in enumerate(parts + bases):
+            self._write_mesh(f, str(i), tessellation)
 
-        model = ET.Element(
-            "model", {"xml:lang": "en-US", "xmlns": SCHEMAS.CORE,}, unit=self.unit,
+        # Create a component of all meshes and instances and add it to the build
+        components = "".join(
+            f'<component objectid="{i}" />' for i in range(len(parts))
+        ) + "".join(
+            f'<component objectid="{len(parts) + i}" transform="{_transform(loc)}" />'
+            for i, loc in instances
         )
 
-        # Add meta data
-        ET.SubElement(
-            model, "metadata", name="Application"
-        ).text = "CadQuery 3MF Exporter"
-        ET.SubElement(
-            model, "metadata", name="CreationDate"
-        ).text = datetime.now().isoformat()
-
-        resources = ET.SubElement(model, "resources")
-
-        # Add all meshes to resources
-        for i, tessellation in enumerate(self.tessellations):
-            self._add_mesh(resources, str(i), tessellation)
-
-        # Create a component of all meshes
-        comp_object = ET.SubElement(
-            resources,
-            "object",
-            id=str(no_meshes),
-            name=f"CadQuery Component",
-            type="model",
+        f.write(
+            (
+                f'<object id="{no_meshes}" name="CadQuery Component" type="model">'
+                f"<components>{components}</components></object>"
+                "</resources>"
+                f'<build><item objectid="{no_meshes}" /></build>'
+                "</model>"
+            ).encode()
         )
-        components = ET.SubElement(comp_object, "components")
-
-        # Add all meshes to the component
-        for i in range(no_meshes):
-            ET.SubElement(
-                components, "component", objectid=str(i),
-            )
-
-        # Add the component to the build
-        build = ET.SubElement(model, "build")
-        ET.SubElement(build, "item", objectid=str(no_meshes))
 
-        return ET.tostring(model, xml_declaration=True, encoding="utf-8")
-
-    def _add_mesh(
-        self,
-        to: ET.Element,
-        id: str,
-        tessellation: Tuple[List[Vector], List[Tuple[int, int, int]]],
+    def _write_mesh(
+        self, f: IO[bytes], id: str, tessellation: ArrayTessellation,
     ):
-        object = ET.SubElement(
-            to, "object", id=id, name=f"CadQuery Shape {id}", type="model"
+
+        f.write(
+            f'<object id="{id}" name="CadQuery Shape {id}" type="model"><mesh><vertices>'.encode()
         )
-        mesh = ET.SubElement(object, "mesh")
+        self._write_rows(f, VERTEX, tessellation[0])
+        f.write(b"</vertices><triangles>")
+        self._write_rows(f, TRIANGLE, tessellation[1])
+        f.write(b"</triangles></mesh></object>")
 
-        # add vertices
-        vertices = ET.SubElement(mesh, "vertices")
-        for v in tessellation[0]:
-            ET.SubElement(vertices, "vertex", x=str(v.x), y=str(v.y), z=str(v.z))
+    def _write_rows(self, f: IO[bytes], template: str, rows: NDArray):
+        """
+        Format a block of rows with a single string formatting operation.
+        """
 
-        # add triangles
-        volume = ET.SubElement(mesh, "triangles")
-        for t in tessellation[1]:
-            ET.SubElement(volume, "triangle", v1=str(t[0]), v2=str(t[1]), v3=str(t[2]))
+        for i in range(0, len(rows), self.chunksize):
+            chunk = rows[i : i + self.chunksize]
+            f.write(((template * len(chunk)) % tuple(chunk.ravel().tolist())).encode())
 
     def _write_content_types(self) -> str:
 
@@ -1,15 +1,28 @@
+from io import BytesIO
+from typing import Union
+
 from vtkmodules.vtkIOXML import vtkXMLPolyDataWriter
 from ..shapes import Shape
 
 
 def exportVTP(
-    shape: Shape, fname: str, tolerance: float = 0.1, angularTolerance: float = 0.1
+    shape: Shape,
+    fname: Union[str, BytesIO],
+    tolerance: float = 0.1,
+    angularTolerance: float = 0.1,
 ):
 
     writer = vtkXMLPolyDataWriter()
-    writer.SetFileName(fname)
     writer.SetInputData(shape.toVtkPolyData(tolerance, angularTolerance))
-    writer.Write()
+
+    if isinstance(fname, str):
+        writer.SetFileName(fname)
+        writer.Write()
+    else:
+        # appended data is base64 encoded, so the output is ascii
+        writer.SetWriteToOutputString(True)
+        writer.Write()
+        fname.write(writer.GetOutputString().encode())
 
 
 def toString(
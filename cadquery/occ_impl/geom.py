@@ -1,8 +1,32 @@
 from math import pi, radians, degrees
 
-from typing import overload, Sequence, Union, Tuple, Type, Optional, Iterator
+from typing import (
+    overload,
+    Sequence,
+    Union,
+    Tuple,
+    Type,
+    Optional,
+    Iterator,
+    Iterable,
+    List,
+)
 
 from io import BytesIO
+from numbers import Integral
+from struct import Struct
+
+from numpy import (
+    array,
+    asarray,
+    broadcast_to,
+    concatenate,
+    eye,
+    float64,
+    ndarray,
+)
+from numpy.linalg import inv
+from numpy.typing import NDArray, ArrayLike
 
 from OCP.gp import (
     gp_Vec,
@@ -31,6 +55,11 @@ from ..utils import multimethod
 
 TOL = 1e-2
 
+# fixed layouts used for pickling
+_VECTOR = Struct("<3d")
+_MATRIX = Struct("<12d")
+_PLANE = Struct("<12d")
+
 VectorLike = Union["Vector", Tuple[Real, Real], Tuple[Real, Real, Real]]
 
 
@@ -259,14 +288,18 @@ class Vector(object):
 
         return Vector(gp_Vec(pnt_t.XYZ()))
 
-    def __getstate__(self) -> tuple[float, float, float]:
+    def __getstate__(self) -> bytes:
 
-        return (self.x, self.y, self.z)
+        return _VECTOR.pack(self.x, self.y, self.z)
 
-    def __setstate__(self, state: tuple[float, float, float]):
+    def __setstate__(self, state: Union[bytes, Tuple[float, float, float]]):
 
         self._wrapped = gp_Vec()
 
+        # tuples were used by older versions
+        if isinstance(state, bytes):
+            state = _VECTOR.unpack(state)
+
         self.x, self.y, self.z = state
 
 
@@ -413,18 +446,70 @@ class Matrix:
         matrix_str = ",\n        ".join(str(matrix_transposed[i::4]) for i in range(4))
         return f"Matrix([{matrix_str}])"
 
-    def __getstate__(self) -> list[list[float]]:
+    def __getstate__(self) -> bytes:
 
-        trsf = self.wrapped
-        return [[trsf.Value(i, j) for j in range(1, 5)] for i in range(1, 4)]
+        return _MATRIX.pack(*_values(self.wrapped))
 
-    def __setstate__(self, state: list[list[float]]):
+    def __setstate__(self, state: Union[bytes, List[List[float]]]):
 
         trsf = self.wrapped = gp_GTrsf()
 
+        # nested lists were used by older versions
+        if isinstance(state, bytes):
+            values = _MATRIX.unpack(state)
+        else:
+            values = tuple(v for row in state for v in row)
+
         for i in range(3):
             for j in range(4):
-                trsf.SetValue(i + 1, j + 1, state[i][j])
+                trsf.SetValue(i + 1, j + 1, values[4 * i + j])
+
+
+def _values(T: Union[gp_Trsf, gp_GTrsf]) -> List[float]:
+    """
+    Get the coefficients of the 3x4 matrix of a transformation in row major order.
+    """
+
+    return [T.Value(i, j) for i in (1, 2, 3) for j in (1, 2, 3, 4)]
+
+
+def _toArray(T: Union[gp_Trsf, gp_GTrsf]) -> NDArray[float64]:
+    """
+    Convert a transformation into a (3, 4) array.
+    """
+
+    return array(_values(T)).reshape(3, 4)
+
+
+def _transformPoints(M: NDArray[float64], pts: NDArray[float64]) -> NDArray[float64]:
+    """
+    Apply a (3, 4) transformation to an (N, 2) or (N, 3) array of points.
+    """
+
+    pts = asarray(pts, dtype=float64)
+
+    if pts.shape[-1] == 2:
+        rv = pts @ M[:, :2].T
+    else:
+        rv = pts @ M[:, :3].T
+
+    return rv + M[:, 3]
+
+
+def _toPoints(pts: Iterable[Union[Vector, Sequence[float]]]) -> NDArray[float64]:
+    """
+    Convert Vectors and 2 or 3 tuples into an (N, 3) array.
+    """
+
+    return array(
+        [
+            p.toTuple()
+            if isinstance(p, Vector)
+            else (p[0], p[1], p[2] if len(p) > 2 else 0.0)
+            for p in pts
+        ],
+        dtype=float64,
+    ).reshape(-1, 3)
 
 
 class Plane(object):
@@ -664,7 +749,7 @@ class Plane(object):
         """Project the provided coordinates onto this plane
 
         :param obj: an object or vector to convert
-        :type vector: a vector or shape
+        :type vector: a vector, shape or an (N, 3) array of points
         :return: an object of the same type, but converted to local coordinates
 
 
@@ -679,6 +764,8 @@ class Plane(object):
 
         if isinstance(obj, Vector):
             return obj.transform(self.fG)
+        elif isinstance(obj, ndarray):
+            return _transformPoints(self._matrices()[0], obj)
         elif isinstance(obj, Shape):
             return obj.transformShape(self.fG)
         else:
@@ -688,14 +775,25 @@ class Plane(object):
                 )
             )
 
+    @overload
+    def toWorldCoords(self, tuplePoint: NDArray[float64]) -> NDArray[float64]:
+        ...
+
+    @overload
     def toWorldCoords(self, tuplePoint) -> Vector:
+        ...
+
+    def toWorldCoords(self, tuplePoint):
         """Convert a point in local coordinates to global coordinates
 
         :param tuplePoint: point in local coordinates to convert.
         :type tuplePoint: a 2 or three tuple of float. The third value is taken to be zero if not supplied.
-        :return: a Vector in global coordinates
+            An (N, 2) or (N, 3) array of points is converted at once.
+        :return: a Vector (or an (N, 3) array) in global coordinates
         """
-        if isinstance(tuplePoint, Vector):
+        if isinstance(tuplePoint, ndarray):
+            return _transformPoints(self._matrices()[1], tuplePoint)
+        elif isinstance(tuplePoint, Vector):
             v = tuplePoint
         elif len(tuplePoint) == 2:
             v = Vector(tuplePoint[0], tuplePoint[1], 0)
@@ -805,6 +903,19 @@ class Plane(object):
         self.rG = inverse
         self.fG = forward
 
+        # arrays for transforming many points at once are computed on demand
+        self._arrays = None
+
+    def _matrices(self) -> Tuple[NDArray[float64], NDArray[float64]]:
+        """
+        Forward and inverse transformations as (3, 4) arrays.
+        """
+
+        if self._arrays is None:
+            self._arrays = (_toArray(self.fG.wrapped), _toArray(self.rG.wrapped))
+
+        return self._arrays
+
     @property
     def location(self) -> "Location":
 
@@ -814,13 +925,25 @@ class Plane(object):
 
         return gp_Pln(gp_Ax3(self.origin.toPnt(), self.zDir.toDir(), self.xDir.toDir()))
 
-    def __getstate__(self) -> Tuple[Vector, Vector, Vector, Vector]:
+    def __getstate__(self) -> bytes:
+
+        return _PLANE.pack(
+            *self.xDir.toTuple(),
+            *self.yDir.toTuple(),
+            *self.zDir.toTuple(),
+            *self._origin.toTuple(),
+        )
 
-        return (self.xDir, self.yDir, self.zDir, self._origin)
+    def __setstate__(self, data: Union[bytes, Tuple[Vector, Vector, Vector, Vector]]):
 
-    def __setstate__(self, data: Tuple[Vector, Vector, Vector, Vector]):
+        # tuples of Vectors were used by older versions
+        if isinstance(data, bytes):
+            vals = _PLANE.unpack(data)
+            vecs = [Vector(*vals[i : i + 3]) for i in range(0, 12, 3)]
+        else:
+            vecs = list(data)
 
-        self.xDir, self.yDir, self.zDir, self.origin = data
+        self.xDir, self.yDir, self.zDir, self.origin = vecs
 
 
 class BoundBox(object):
@@ -1090,6 +1213,9 @@ class Location(object):
 
     def __mul__(self, other: "Location") -> "Location":
 
+        if not isinstance(other, Location):
+            return NotImplemented
+
         return Location(self.wrapped * other.wrapped)
 
     def __pow__(self, exponent: int) -> "Location":
@@ -1108,24 +1234,178 @@ class Location(object):
 
         return rv_trans, (degrees(rx), degrees(ry), degrees(rz))
 
-    def __getstate__(self) -> BytesIO:
+    def __getstate__(self) -> bytes:
 
-        rv = BytesIO()
+        # identity is stored as an empty state to retain the identity flag
+        if self.wrapped.IsIdentity():
+            return b""
 
-        ls = BinTools_LocationSet()
-        ls.Add(self.wrapped)
-        ls.Write(rv)
+        return _MATRIX.pack(*_values(self.wrapped.Transformation()))
 
-        rv.seek(0)
+    def __setstate__(self, data: Union[bytes, BytesIO]):
 
-        return rv
+        if isinstance(data, bytes):
+            if data:
+                T = gp_Trsf()
+                T.SetValues(*_MATRIX.unpack(data))
+
+                self.wrapped = TopLoc_Location(T)
+            else:
+                self.wrapped = TopLoc_Location()
 
-    def __setstate__(self, data: BytesIO):
+            return
 
+        # BinTools streams were used by older versions
         ls = BinTools_LocationSet()
         ls.Read(data)
 
+        # composite locations are stored after their elementary parts
         if ls.NbLocations() > 0:
-            self.wrapped = ls.Location(1)
+            self.wrapped = ls.Location(ls.NbLocations())
         else:
             self.wrapped = TopLoc_Location()  # identity location
+
+
+class LocationArray(object):
+    """Array of locations stored as an (N, 3, 4) array of affine transformations.
+
+    Composition and inversion are vectorized, which makes it suitable for
+    generating and placing large numbers of instances. LocationArray can be
+    multiplied with other LocationArrays (elementwise, with broadcasting of
+    single element arrays) and with Locations.
+    """
+
+    data: NDArray[float64]
+
+    def __init__(self, locs: Union[ArrayLike, Iterable[Location]] = ()) -> None:
+        """Construct from an (N, 3, 4) array or from an iterable of Locations."""
+
+        if isinstance(locs, LocationArray):
+            data = locs.data
+        elif hasattr(locs, "__array__"):
+            data = asarray(locs, dtype=float64)
+        else:
+            els: List = list(locs)  # type: ignore
+
+            if els and isinstance(els[0], Location):
+                data = array([_toArray(l.wrapped.Transformation()) for l in els])
+            else:
+                data = asarray(els, dtype=float64)
+
+        self.data = data.reshape(-1, 3, 4)
+
+    @classmethod
+    def fromPoints(
+        cls, pts: ArrayLike, plane: Optional[Plane] = None
+    ) -> "LocationArray":
+        """Locations with translations pts and optionally the orientation of plane,
+        cf. Location(t) and Location(plane, t)."""
+
+        t = asarray(pts, dtype=float64).reshape(-1, 3)
+        rot = (
+            eye(3)
+            if plane is None
+            else array(
+                [plane.xDir.toTuple(), plane.yDir.toTuple(), plane.zDir.toTuple()]
+            ).T
+        )
+
+        rv = cls.__new__(cls)
+        rv.data = concatenate(
+            (broadcast_to(rot, (len(t), 3, 3)), t[:, :, None]), axis=2
+        )
+
+        return rv
+
+    def __len__(self) -> int:
+
+        return len(self.data)
+
+    def __getitem__(self, ix) -> Union[Location, "LocationArray"]:
+
+        # also numpy integers, e.g. from argsort or nonzero
+        if isinstance(ix, Integral):
+            return _toLocation(self.data[ix])
+
+        return LocationArray(self.data[ix])
+
+    def __iter__(self) -> Iterator[Location]:
+
+        for el in self._toTopLocs():
+            rv = Location.__new__(Location)
+            rv.wrapped = el
+
+            yield rv
+
+    def __repr__(self) -> str:
+
+        return f"LocationArray({len(self)})"
+
+    @property
+    def inverse(self) -> "LocationArray":
+
+        rot = inv(self.data[:, :, :3])
+
+        return LocationArray(concatenate((rot, -rot @ self.data[:, :, 3:]), axis=2))
+
+    def __mul__(self, other: Union["LocationArray", Location]) -> "LocationArray":
+
+        if isinstance(other, Location):
+            other = LocationArray((other,))
+        elif not isinstance(other, LocationArray):
+            return NotImplemented
+
+        return LocationArray(_compose(self.data, other.data))
+
+    def __rmul__(self, other: Location) -> "LocationArray":
+
+        if not isinstance(other, Location):
+            return NotImplemented
+
+        return LocationArray(_compose(LocationArray((other,)).data, self.data))
+
+    def toLocations(self) -> List[Location]:
+        """Convert to a list of Locations."""
+
+        return list(self)
+
+    def _toTopLocs(self) -> List[TopLoc_Location]:
+
+        rv = []
+
+        for el in self.data.reshape(-1, 12).tolist():
+            T = gp_Trsf()
+            T.SetValues(*el)
+
+            rv.append(TopLoc_Location(T))
+
+        return rv
+
+    def __getstate__(self) -> NDArray[float64]:
+
+        return self.data
+
+    def __setstate__(self, data: NDArray[float64]):
+
+        self.data = data
+
+
+def _toLocation(data: NDArray[float64]) -> Location:
+    """
+    Convert a 3x4 matrix into a Location.
+    """
+
+    T = gp_Trsf()
+    T.SetValues(*data.ravel().tolist())
+
+    return Location(T)
+
+
+def _compose(a: NDArray[float64], b: NDArray[float64]) -> NDArray[float64]:
+    """
+    Compose two (N, 3, 4) arrays of transformations, single elements are broadcasted.
+    """
+
+    rot = a[:, :, :3]
+
+    return concatenate((rot @ b[:, :, :3], rot @ b[:, :, 3:] + a[:, :, 3:]), axis=2)
@@ -19,11 +19,47 @@ from typing_extensions import Self
 
 from io import BytesIO
 
+from numpy import (
+    arange,
+    argsort,
+    array,
+    asarray,
+    bincount,
+    clip,
+    empty,
+    concatenate,
+    cross,
+    cumsum,
+    einsum,
+    floor,
+    full,
+    int8,
+    int32,
+    int64,
+    float64,
+    maximum,
+    ndarray,
+    repeat,
+    searchsorted,
+    stack,
+    where,
+    zeros,
+)
+from numpy.typing import NDArray, ArrayLike
+
 
 from vtkmodules.vtkCommonDataModel import vtkPolyData
 from vtkmodules.vtkFiltersCore import vtkTriangleFilter, vtkPolyDataNormals
 
-from .geom import Vector, VectorLike, BoundBox, Plane, Location, Matrix
+from .geom import (
+    Vector,
+    VectorLike,
+    BoundBox,
+    Plane,
+    Location,
+    LocationArray,
+    Matrix,
+)
 from .shape_protocols import geom_LUT_FACE, geom_LUT_EDGE, Shapes, Geoms
 
 from ..selectors import (
@@ -31,7 +67,7 @@ from ..selectors import (
     StringSyntaxSelector,
 )
 
-from ..utils import multimethod
+from ..utils import multimethod, pathOrTemp
 
 # change default OCCT logging level
 from OCP.Message import Message, Message_Gravity
@@ -170,7 +206,7 @@ from OCP.Geom2d import Geom2d_Line
 
 from OCP.Geom2dAPI import Geom2dAPI_Interpolate
 
-from OCP.BRepLib import BRepLib, BRepLib_FindSurface
+from OCP.BRepLib import BRepLib, BRepLib_FindSurface, BRepLib_ToolTriangulatedShape
 
 from OCP.BRepOffsetAPI import (
     BRepOffsetAPI_ThruSections,
@@ -234,7 +270,12 @@ from OCP.NCollection import NCollection_Utf8String
 
 from OCP.BRepFeat import BRepFeat_MakeDPrism
 
-from OCP.BRepClass3d import BRepClass3d_SolidClassifier, BRepClass3d
+from OCP.BRepClass3d import (
+    BRepClass3d_SolidClassifier,
+    BRepClass3d_SClassifier,
+    BRepClass3d_SolidExplorer,
+    BRepClass3d,
+)
 
 from OCP.TCollection import TCollection_AsciiString
 
@@ -288,6 +329,8 @@ from OCP.GeomFill import (
 
 from OCP.BRepProj import BRepProj_Projection
 from OCP.BRepExtrema import BRepExtrema_DistShapeShape
+from OCP.Bnd import Bnd_Box
+from OCP.BRepBndLib import BRepBndLib
 
 from OCP.IVtkOCC import IVtkOCC_Shape, IVtkOCC_ShapeMesher
 from OCP.IVtkVTK import IVtkVTK_ShapeData
@@ -325,6 +368,11 @@ from math import pi, sqrt, inf, radians, cos
 
 import warnings
 
+from functools import lru_cache
+from threading import local
+from weakref import finalize
+from concurrent.futures import ThreadPoolExecutor
+
 from ..utils import deprecate
 
 Real = Union[float, int]
@@ -478,7 +526,7 @@ class Shape(object):
 
     def exportStl(
         self,
-        fileName: str,
+        fileName: Union[str, BytesIO],
         tolerance: float = 1e-3,
         angularTolerance: float = 0.1,
         ascii: bool = False,
@@ -488,7 +536,7 @@ class Shape(object):
         """
         Exports a shape to a specified STL file.
 
-        :param fileName: The path and file name to write the STL output to.
+        :param fileName: The path and file name or a writable binary stream to write the STL output to.
         :param tolerance: A linear deflection setting which limits the distance between a curve and its tessellation.
             Setting this value too low will result in large meshes that can consume computing resources.
             Setting the value too high can result in meshes with a level of detail that is too low.
@@ -507,15 +555,19 @@ class Shape(object):
         writer = StlAPI_Writer()
         writer.ASCIIMode = ascii
 
-        return writer.Write(self.wrapped, fileName)
+        # StlAPI_Writer only writes to files
+        with pathOrTemp(fileName, ".stl") as path:
+            return writer.Write(self.wrapped, path)
 
-    def exportStep(self, fileName: str, **kwargs) -> IFSelect_ReturnStatus:
+    def exportStep(
+        self, fileName: Union[str, BytesIO], **kwargs
+    ) -> IFSelect_ReturnStatus:
         """
         Export this shape to a STEP file.
 
         kwargs is used to provide optional keyword arguments to configure the exporter.
 
-        :param fileName: Path and filename for writing.
+        :param fileName: Path and filename or a writable binary stream for writing.
         :param write_pcurves: Enable or disable writing parametric curves to the STEP file. Default True.
 
             If False, writes STEP file without pcurves. This decreases the size of the resulting STEP file.
@@ -536,7 +588,10 @@ class Shape(object):
         Interface_Static.SetIVal_s("write.precision.mode", precision_mode)
         writer.Transfer(self.wrapped, STEPControl_AsIs)
 
-        return writer.Write(fileName)
+        if isinstance(fileName, str):
+            return writer.Write(fileName)
+
+        return writer.WriteStream(fileName)
 
     def exportBrep(self, f: Union[str, BytesIO]) -> bool:
         """
@@ -1217,6 +1272,20 @@ class Shape(object):
 
         return _compound_or_shape(rv)
 
+    @moved.register
+    def moved(self: T, locs: LocationArray) -> T:
+        """
+        Apply multiple locations given as a LocationArray. All the copies share
+        the underlying geometry of self.
+        """
+
+        if len(locs) == 1:
+            return self.moved(locs[0])
+
+        s = _normalize(self).wrapped
+
+        return Compound(Compound._makeCompound(s.Moved(l) for l in locs._toTopLocs()))
+
     @moved.register
     def moved(
         self: T,
@@ -1310,6 +1379,15 @@ class Shape(object):
 
         return self._bool_op((self,), toCut, cut_op)
 
+    def _overlapping(self, shapes: Iterable["Shape"]) -> List["Shape"]:
+        """
+        Select shapes with bounding boxes overlapping the bounding box of this Shape.
+        """
+
+        bb = _bbox(self)
+
+        return [s for s in shapes if not bb.IsOut(_bbox(s))]
+
     def fuse(
         self, *toFuse: "Shape", glue: bool = False, tol: Optional[float] = None
     ) -> "Shape":
@@ -1518,6 +1596,76 @@ class Shape(object):
 
         return vertices, triangles
 
+    def _tessellateArrays(
+        self, tolerance: float, angularTolerance: float = 0.1
+    ) -> Tuple[NDArray[float64], NDArray[int32]]:
+        """
+        Same as tessellate, but returns (N,3) arrays of vertices and triangles.
+        """
+
+        faces = self._tessellateFaces(tolerance, angularTolerance)
+
+        if not faces:
+            return empty((0, 3), dtype=float64), empty((0, 3), dtype=int32)
+
+        offsets = cumsum([0] + [len(v) for v, _, _ in faces[:-1]]).tolist()
+
+        return (
+            concatenate([v for v, _, _ in faces]),
+            concatenate([t + o for (_, t, _), o in zip(faces, offsets)]),
+        )
+
+    def _tessellateFaces(
+        self, tolerance: float, angularTolerance: float = 0.1, normals: bool = False
+    ) -> List[Tuple[NDArray[float64], NDArray[int32], Optional[NDArray[float64]]]]:
+        """
+        Tessellate and return (vertices, triangles, normals) arrays per face. Triangles
+        index the vertices of the same face, normals are computed from the surface if
+        requested. Faces without triangulation are skipped.
+        """
+
+        self.mesh(tolerance, angularTolerance)
+
+        rv: List[
+            Tuple[NDArray[float64], NDArray[int32], Optional[NDArray[float64]]]
+        ] = []
+
+        for f in self.Faces():
+
+            loc = TopLoc_Location()
+            poly = BRep_Tool.Triangulation_s(f.wrapped, loc)
+            if poly is None:
+                continue
+            Trsf = loc.Transformation()
+            reverse = f.wrapped.Orientation() == TopAbs_Orientation.TopAbs_REVERSED
+
+            nodes = array(
+                [poly.Node(i).Coord() for i in range(1, poly.NbNodes() + 1)],
+                dtype=float64,
+            )
+            M = array(
+                [[Trsf.Value(i, j) for j in range(1, 5)] for i in range(1, 4)],
+                dtype=float64,
+            )
+
+            tris = array([t.Get() for t in poly.Triangles()], dtype=int32) - 1
+            if reverse:
+                tris = tris[:, (0, 2, 1)]
+
+            norms = None
+            if normals:
+                BRepLib_ToolTriangulatedShape.ComputeNormals_s(f.wrapped, poly)
+                norms = array(
+                    [poly.Normal(i).Coord() for i in range(1, poly.NbNodes() + 1)],
+                    dtype=float64,
+                ) @ (M[:, :3].T / Trsf.ScaleFactor())
+                if reverse:
+                    norms = -norms
+
+            rv.append((nodes @ M[:, :3].T + M[:, 3], tris, norms))
+
+        return rv
+
     def toSplines(
         self: T, degree: int = 3, tolerance: float = 1e-3, nurbs: bool = False
     ) -> T:
@@ -1732,7 +1880,7 @@ class Shape(object):
 
         BinTools.Read_s(wrapped, data[0])
 
-        self.wrapped = wrapped
+        self.wrapped = downcast(wrapped)
         self.forConstruction = data[1]
 
     def replace(self, old: "Shape", *new: "Shape") -> Self:
@@ -2480,7 +2628,7 @@ class Edge(Shape, Mixin1D):
     @classmethod
     def makeSpline(
         cls,
-        listOfVector: List[Vector],
+        listOfVector: Union[List[Vector], NDArray[float64]],
         tangents: Optional[Sequence[Vector]] = None,
         periodic: bool = False,
         parameters: Optional[Sequence[float]] = None,
@@ -2490,7 +2638,7 @@ class Edge(Shape, Mixin1D):
         """
         Interpolate a spline through the provided points.
 
-        :param listOfVector: a list of Vectors that represent the points
+        :param listOfVector: a list of Vectors or an (N, 3) array that represent the points
         :param tangents: tuple of Vectors specifying start and finish tangent
         :param periodic: creation of periodic curves
         :param parameters: the value of the parameter at each interpolation point. (The interpolated
@@ -2506,9 +2654,7 @@ class Edge(Shape, Mixin1D):
           short. (In either case interpolation may fail.)
         :return: an Edge
         """
-        pnts = TColgp_HArray1OfPnt(1, len(listOfVector))
-        for ix, v in enumerate(listOfVector):
-            pnts.SetValue(ix + 1, v.toPnt())
+        pnts = _pts_to_harray(listOfVector)
 
         if parameters is None:
             spline_builder = GeomAPI_Interpolate(pnts, periodic, tol)
@@ -2519,9 +2665,7 @@ class Edge(Shape, Mixin1D):
                     "(plus one if periodic), or none specified. Parameter count: "
                     f"{len(parameters)}, point count: {len(listOfVector)}"
                 )
-            parameters_array = TColStd_HArray1OfReal(1, len(parameters))
-            for p_index, p_value in enumerate(parameters):
-                parameters_array.SetValue(p_index + 1, p_value)
+            parameters_array = _floats_to_harray(parameters)
 
             spline_builder = GeomAPI_Interpolate(pnts, parameters_array, periodic, tol)
 
@@ -2559,7 +2703,7 @@ class Edge(Shape, Mixin1D):
     @classmethod
     def makeSplineApprox(
         cls,
-        listOfVector: List[Vector],
+        listOfVector: Union[List[Vector], NDArray[float64]],
         tol: float = 1e-3,
         smoothing: Optional[Tuple[float, float, float]] = None,
         minDeg: int = 1,
@@ -2568,16 +2712,14 @@ class Edge(Shape, Mixin1D):
         """
         Approximate a spline through the provided points.
 
-        :param listOfVector: a list of Vectors that represent the points
+        :param listOfVector: a list of Vectors or an (N, 3) array that represent the points
         :param tol: tolerance of the algorithm (consult OCC documentation).
         :param smoothing: optional tuple of 3 weights use for variational smoothing (default: None)
         :param minDeg: minimum spline degree. Enforced only when smothing is None (default: 1)
         :param maxDeg: maximum spline degree (default: 6)
         :return: an Edge
         """
-        pnts = TColgp_HArray1OfPnt(1, len(listOfVector))
-        for ix, v in enumerate(listOfVector):
-            pnts.SetValue(ix + 1, v.toPnt())
+        pnts = _pts_to_harray(listOfVector)
 
         if smoothing:
             spline_builder = GeomAPI_PointsToBSpline(
@@ -3420,7 +3562,7 @@ class Face(Shape):
     @classmethod
     def makeSplineApprox(
         cls,
-        points: List[List[Vector]],
+        points: Union[List[List[Vector]], NDArray[float64]],
         tol: float = 1e-2,
         smoothing: Optional[Tuple[float, float, float]] = None,
         minDeg: int = 1,
@@ -3429,17 +3571,13 @@ class Face(Shape):
         """
         Approximate a spline surface through the provided points.
 
-        :param points: a 2D list of Vectors that represent the points
+        :param points: a 2D list of Vectors or an (N, M, 3) array that represent the points
         :param tol: tolerance of the algorithm (consult OCC documentation).
         :param smoothing: optional tuple of 3 weights use for variational smoothing (default: None)
         :param minDeg: minimum spline degree. Enforced only when smothing is None (default: 1)
         :param maxDeg: maximum spline degree (default: 6)
         """
-        points_ = TColgp_HArray2OfPnt(1, len(points), 1, len(points[0]))
-
-        for i, vi in enumerate(points):
-            for j, v in enumerate(vi):
-                points_.SetValue(i + 1, j + 1, v.toPnt())
+        points_ = _pts_to_harray2(points)
 
         if smoothing:
             spline_builder = GeomAPI_PointsToBSplineSurface(
@@ -3841,6 +3979,63 @@ class Mixin3D(object):
 
         return solid_classifier.State() == ta.TopAbs_IN or solid_classifier.IsOnAFace()
 
+    def classify(
+        self: Any,
+        points: ArrayLike,
+        tolerance: float = 1.0e-6,
+        threads: Optional[int] = None,
+        chunksize: int = 10000,
+        mesh: Optional[float] = None,
+    ) -> NDArray[int8]:
+        """
+        Classify many points with respect to a solid or compound object.
+
+        The solid explorer is constructed once (per thread) and reused for all points.
+
+        :param points: (N,3) array of points.
+        :param tolerance: Tolerance for on-boundary determination.
+        :param threads: Number of threads used for processing the chunks of the
+            exact classifier.
+        :param chunksize: Number of points per chunk of the exact classifier.
+        :param mesh: If specified, use ray parity on the triangulation with the given
+            tolerance instead of the exact classifier. Triangles are bucketed by
+            their projection along the ray, so that only nearby ones are tested.
+            ON is never reported in this mode.
+        :return: int8 array of TopAbs_State values (IN=0, OUT=1, ON=2).
+        """
+
+        pts = asarray(points, dtype=float64).reshape(-1, 3)
+
+        if mesh is not None:
+            # vectorized over all points, chunked internally
+            return _ray_parity(pts, *self._tessellateArrays(mesh))
+
+        chunks = [pts[i : i + chunksize] for i in range(0, len(pts), chunksize)]
+        tls = local()
+
+        def _classify(chunk: NDArray[float64]) -> NDArray[int8]:
+
+            explorer = getattr(tls, "explorer", None)
+            if explorer is None:
+                explorer = tls.explorer = BRepClass3d_SolidExplorer(self.wrapped)
+
+            classifier = BRepClass3d_SClassifier()
+            rv = empty(len(chunk), dtype=int8)
+
+            for i, (x, y, z) in enumerate(chunk):
+                classifier.Perform(explorer, gp_Pnt(x, y, z), tolerance)
+                rv[i] = classifier.State().value
+
+            return rv
+
+        if not chunks:
+            return empty(0, dtype=int8)
+        elif threads:
+            with ThreadPoolExecutor(threads) as ex:
+                return concatenate(list(ex.map(_classify, chunks)))
+        else:
+            return concatenate([_classify(c) for c in chunks])
+
     @multimethod
     def dprism(
         self: TS,
@@ -4613,12 +4808,22 @@ class Compound(Shape, Mixin3D):
             comp_builder.Remove(self.wrapped, s.wrapped)
 
     @classmethod
-    def makeCompound(cls, listOfShapes: Iterable[Shape]) -> "Compound":
+    def makeCompound(
+        cls, listOfShapes: Iterable[Shape], locs: Optional[LocationArray] = None
+    ) -> "Compound":
         """
-        Create a compound out of a list of shapes
+        Create a compound out of a list of shapes. If locs is specified, every shape
+        is instanced at every location.
         """
 
-        return cls(cls._makeCompound((s.wrapped for s in listOfShapes)))
+        if locs is None:
+            return cls(cls._makeCompound((s.wrapped for s in listOfShapes)))
+
+        tlocs = locs._toTopLocs()
+
+        return cls(
+            cls._makeCompound(s.wrapped.Moved(l) for s in listOfShapes for l in tlocs)
+        )
 
     @classmethod
     def makeText(
@@ -4637,56 +4842,13 @@ class Compound(Shape, Mixin3D):
         Create a 3D text
         """
 
-        font_kind = {
-            "regular": Font_FA_Regular,
-            "bold": Font_FA_Bold,
-            "italic": Font_FA_Italic,
-        }[kind]
-
-        mgr = Font_FontMgr.GetInstance_s()
-
-        if fontPath and mgr.CheckFont(TCollection_AsciiString(fontPath).ToCString()):
-            font_t = Font_SystemFont(TCollection_AsciiString(fontPath))
-            font_t.SetFontPath(font_kind, TCollection_AsciiString(fontPath))
-            mgr.RegisterFont(font_t, True)
-
-        else:
-            font_t = mgr.FindFont(TCollection_AsciiString(font), font_kind)
-
-        builder = Font_BRepTextBuilder()
-        font_i = StdPrs_BRepFont(
-            NCollection_Utf8String(font_t.FontName().ToCString()),
-            font_kind,
-            float(size),
-        )
-        if halign == "left":
-            theHAlign = Graphic3d_HTA_LEFT
-        elif halign == "center":
-            theHAlign = Graphic3d_HTA_CENTER
-        else:  # halign == "right"
-            theHAlign = Graphic3d_HTA_RIGHT
-
-        if valign == "bottom":
-            theVAlign = Graphic3d_VTA_BOTTOM
-        elif valign == "center":
-            theVAlign = Graphic3d_VTA_CENTER
-        else:  # valign == "top":
-            theVAlign = Graphic3d_VTA_TOP
-
-        text_flat = Shape(
-            builder.Perform(
-                font_i,
-                NCollection_Utf8String(text),
-                theHAlign=theHAlign,
-                theVAlign=theVAlign,
-            )
-        )
+        text_flat = Shape(_text(text, size, font, fontPath, kind, halign, valign))
 
         if height != 0:
-            vecNormal = text_flat.Faces()[0].normalAt() * height
-
-            text_3d = BRepPrimAPI_MakePrism(text_flat.wrapped, vecNormal.wrapped)
-            rv = cls(text_3d.Shape()).transformShape(position.rG)
+            text_3d = _extrude_text(
+                text, text_flat.wrapped, size, height, font, fontPath, kind
+            )
+            rv = cls(text_3d).transformShape(position.rG)
         else:
             rv = text_flat.transformShape(position.rG)
 
@@ -5099,41 +5261,209 @@ def _compound_or_shape(s: Union[TopoDS_Shape, List[TopoDS_Shape]]) -> Shape:
     return rv
 
 
-def _pts_to_harray(pts: Sequence[VectorLike]) -> TColgp_HArray1OfPnt:
+@lru_cache(maxsize=32)
+def _font(font: str, path: Optional[str], kind: str, size: float) -> StdPrs_BRepFont:
+    """
+    Load a font. Fonts are cached together with their rendered glyph outlines.
+    """
+
+    font_kind = {
+        "regular": Font_FA_Regular,
+        "bold": Font_FA_Bold,
+        "italic": Font_FA_Italic,
+    }[kind]
+
+    mgr = Font_FontMgr.GetInstance_s()
+
+    if path and mgr.CheckFont(TCollection_AsciiString(path).ToCString()):
+        font_t = Font_SystemFont(TCollection_AsciiString(path))
+        font_t.SetFontPath(font_kind, TCollection_AsciiString(path))
+        mgr.RegisterFont(font_t, True)
+
+    else:
+        font_t = mgr.FindFont(TCollection_AsciiString(font), font_kind)
+
+    return StdPrs_BRepFont(
+        NCollection_Utf8String(font_t.FontName().ToCString()), font_kind, float(size),
+    )
+
+
+def _text(
+    txt: str,
+    size: float,
+    font: str,
+    path: Optional[str],
+    kind: str,
+    halign: str,
+    valign: str,
+) -> TopoDS_Shape:
+    """
+    Lay out a flat text using located instances of the cached glyph outlines.
+    """
+
+    if halign == "left":
+        theHAlign = Graphic3d_HTA_LEFT
+    elif halign == "center":
+        theHAlign = Graphic3d_HTA_CENTER
+    else:
+        theHAlign = Graphic3d_HTA_RIGHT
+
+    if valign == "bottom":
+        theVAlign = Graphic3d_VTA_BOTTOM
+    elif valign == "center":
+        theVAlign = Graphic3d_VTA_CENTER
+    else:
+        theVAlign = Graphic3d_VTA_TOP
+
+    return Font_BRepTextBuilder().Perform(
+        _font(font, path, kind, float(size)),
+        NCollection_Utf8String(txt),
+        theHAlign=theHAlign,
+        theVAlign=theVAlign,
+    )
+
+
+@lru_cache(maxsize=1024)
+def _glyph(
+    char: str, size: float, height: float, font: str, path: Optional[str], kind: str
+) -> Optional[Tuple[TopoDS_Shape, TopoDS_Shape]]:
+    """
+    Get the outline of a single glyph together with its extrusion.
+    """
+
+    outline = _font(font, path, kind, size).RenderGlyph(char)
+
+    if outline.IsNull():
+        return None
+
+    vec = Shape.cast(outline).Faces()[0].normalAt() * height
+
+    return outline, BRepPrimAPI_MakePrism(outline, vec.wrapped).Shape()
+
+
+def _extrude_text(
+    txt: str,
+    flat: TopoDS_Shape,
+    size: float,
+    height: float,
+    font: str,
+    path: Optional[str],
+    kind: str,
+) -> TopoDS_Shape:
     """
-    Convert a sequence of Vector to a TColgp harray (OCCT specific).
+    Extrude a flat text by placing the cached extrusions of its glyphs.
+    """
+
+    glyphs = [
+        g
+        for g in (_glyph(char, size, height, font, path, kind) for char in set(txt))
+        if g
+    ]
+
+    rv = []
+    it = TopoDS_Iterator(flat)
+
+    while it.More():
+        el = it.Value()
+
+        for outline, prism in glyphs:
+            if el.IsPartner(outline) and el.Orientation() == outline.Orientation():
+                rv.append(prism.Moved(el.Location()))
+                break
+        else:
+            # not a cached glyph - extrude it directly
+            vec = Shape.cast(el).Faces()[0].normalAt() * height
+            rv.append(BRepPrimAPI_MakePrism(el, vec.wrapped).Shape())
+
+        it.Next()
+
+    return Compound._makeCompound(rv)
+
+
+def _as_xyz(pts: NDArray) -> List:
+    """
+    Convert an (..., 3) or (..., 2) array to nested lists of x,y,z coordinates.
+    """
+
+    arr = asarray(pts, dtype=float64)
+
+    if arr.shape[-1] == 2:
+        arr = concatenate((arr, zeros(arr.shape[:-1] + (1,))), axis=-1)
+
+    return arr.tolist()
+
+
+def _pts_to_harray(
+    pts: Union[Sequence[VectorLike], NDArray[float64]]
+) -> TColgp_HArray1OfPnt:
+    """
+    Convert a sequence of Vector or an (N, 3) array to a TColgp harray (OCCT specific).
     """
 
     rv = TColgp_HArray1OfPnt(1, len(pts))
+    set_value = rv.SetValue
 
-    for i, p in enumerate(pts):
-        rv.SetValue(i + 1, Vector(p).toPnt())
+    # arrays are converted in bulk without intermediate Vectors
+    if isinstance(pts, ndarray):
+        for i, p in enumerate(_as_xyz(pts), 1):
+            set_value(i, gp_Pnt(*p))
+    else:
+        for i, p in enumerate(pts, 1):
+            set_value(i, (p if isinstance(p, Vector) else Vector(p)).toPnt())
 
     return rv
 
 
-def _pts_to_harray2D(pts: Sequence[Tuple[Real, Real]]) -> TColgp_HArray1OfPnt2d:
+def _pts_to_harray2D(
+    pts: Union[Sequence[Tuple[Real, Real]], NDArray[float64]]
+) -> TColgp_HArray1OfPnt2d:
     """
-    Convert a sequence of 2d points to a TColgp harray (OCCT specific).
+    Convert a sequence of 2d points or an (N, 2) array to a TColgp harray (OCCT specific).
     """
 
     rv = TColgp_HArray1OfPnt2d(1, len(pts))
+    set_value = rv.SetValue
+
+    for i, (x, y) in enumerate(pts.tolist() if isinstance(pts, ndarray) else pts, 1):
+        set_value(i, gp_Pnt2d(x, y))
+
+    return rv
+
+
+def _pts_to_harray2(
+    pts: Union[Sequence[Sequence[VectorLike]], NDArray[float64]]
+) -> TColgp_HArray2OfPnt:
+    """
+    Convert a 2D grid of Vectors or an (N, M, 3) array to a TColgp harray (OCCT specific).
+    """
+
+    rv = TColgp_HArray2OfPnt(1, len(pts), 1, len(pts[0]))
+    set_value = rv.SetValue
 
-    for i, p in enumerate(pts):
-        rv.SetValue(i + 1, gp_Pnt2d(*p))
+    if isinstance(pts, ndarray):
+        for i, row in enumerate(_as_xyz(pts), 1):
+            for j, p in enumerate(row, 1):
+                set_value(i, j, gp_Pnt(*p))
+    else:
+        for i, vi in enumerate(pts, 1):
+            for j, p in enumerate(vi, 1):
+                set_value(i, j, (p if isinstance(p, Vector) else Vector(p)).toPnt())
 
     return rv
 
 
-def _floats_to_harray(vals: Sequence[float]) -> TColStd_HArray1OfReal:
+def _floats_to_harray(
+    vals: Union[Sequence[float], NDArray[float64]]
+) -> TColStd_HArray1OfReal:
     """
-    Convert a sequence of floats to a TColstd harray (OCCT specific).
+    Convert a sequence of floats or a 1D array to a TColstd harray (OCCT specific).
     """
 
     rv = TColStd_HArray1OfReal(1, len(vals))
+    set_value = rv.SetValue
 
-    for i, val in enumerate(vals):
-        rv.SetValue(i + 1, val)
+    for i, val in enumerate(vals.tolist() if isinstance(vals, ndarray) else vals, 1):
+        set_value(i, val)
 
     return rv
 
@@ -5628,7 +5958,7 @@ def spline(*pts: VectorLike, tol: float = 1e-6, periodic: bool = False) -> Shape
 
 @spline.register
 def spline(
-    pts: Sequence[VectorLike],
+    pts: Union[Sequence[VectorLike], ndarray],
     tgts: Optional[Sequence[VectorLike]] = None,
     params: Optional[Sequence[float]] = None,
     tol: float = 1e-6,
@@ -5803,45 +6133,7 @@ def text(
     Create a flat text.
     """
 
-    builder = Font_BRepTextBuilder()
-
-    font_kind = {
-        "regular": Font_FA_Regular,
-        "bold": Font_FA_Bold,
-        "italic": Font_FA_Italic,
-    }[kind]
-
-    mgr = Font_FontMgr.GetInstance_s()
-
-    if path and mgr.CheckFont(TCollection_AsciiString(path).ToCString()):
-        font_t = Font_SystemFont(TCollection_AsciiString(path))
-        font_t.SetFontPath(font_kind, TCollection_AsciiString(path))
-        mgr.RegisterFont(font_t, True)
-
-    else:
-        font_t = mgr.FindFont(TCollection_AsciiString(font), font_kind)
-
-    font_i = StdPrs_BRepFont(
-        NCollection_Utf8String(font_t.FontName().ToCString()), font_kind, float(size),
-    )
-
-    if halign == "left":
-        theHAlign = Graphic3d_HTA_LEFT
-    elif halign == "center":
-        theHAlign = Graphic3d_HTA_CENTER
-    else:
-        theHAlign = Graphic3d_HTA_RIGHT
-
-    if valign == "bottom":
-        theVAlign = Graphic3d_VTA_BOTTOM
-    elif valign == "center":
-        theVAlign = Graphic3d_VTA_CENTER
-    else:
-        theVAlign = Graphic3d_VTA_TOP
-
-    rv = builder.Perform(
-        font_i, NCollection_Utf8String(txt), theHAlign=theHAlign, theVAlign=theVAlign
-    )
+    rv = _text(txt, size, font, path, kind, halign, valign)
 
     return clean(compound(_compound_or_shape(rv).faces()).fuse())
 
@@ -6592,3 +6884,260 @@ def closest(s1: Shape, s2: Shape) -> Tuple[Vector, Vector]:
     assert ext.Perform()
 
     return Vector(ext.PointOnShape1(1)), Vector(ext.PointOnShape2(1))
+
+
+def _ray_parity(
+    pts: NDArray[float64],
+    vertices: NDArray[float64],
+    triangles: NDArray[int32],
+    maxbytes: int = 64 * 2 ** 20,
+) -> NDArray[int8]:
+    """
+    Classify points as IN/OUT using the parity of ray-triangle intersections.
+
+    Triangles are bucketed in a uniform grid by their bounding boxes projected
+    along the ray, so that every point is only tested against the triangles of
+    its cell. Points are processed in chunks, so that the temporaries stay below
+    maxbytes.
+    """
+
+    rv = full(len(pts), ta.TopAbs_OUT.value, dtype=int8)
+
+    if len(pts) == 0 or len(triangles) == 0:
+        return rv
+
+    # skewed direction to avoid hitting mesh edges and vertices exactly
+    d = array((0.8506508, 0.4472136, 0.2763932))
+
+    # orthonormal basis of the plane the triangles are projected to
+    a = cross(d, (0.0, 0.0, 1.0))
+    a /= sqrt(a @ a)
+    P = stack((a, cross(d, a)), axis=1)
+
+    v0 = vertices[triangles[:, 0]]
+    e1 = vertices[triangles[:, 1]] - v0
+    e2 = vertices[triangles[:, 2]] - v0
+
+    # Moeller-Trumbore terms depending only on the triangles
+    pvec = cross(d, e2)
+    det = einsum("ij,ij->i", e1, pvec)
+    valid = abs(det) > 1e-12
+    inv = 1 / (det + ~valid)
+
+    # grid of about one cell per triangle
+    proj = (vertices @ P)[triangles]
+    lo, hi = proj.min(1), proj.max(1)
+    origin = lo.min(0)
+    n = int(sqrt(len(triangles))) + 1
+    size = maximum((hi.max(0) - origin) / n, 1e-12)
+
+    def _cells(x: NDArray[float64]) -> NDArray[int64]:
+        return clip(floor((x - origin) / size), 0, n - 1).astype(int64)
+
+    # (cell, triangle) pairs of the cells covered by every triangle, sorted by cell
+    i0, i1 = _cells(lo), _cells(hi)
+    nx = i1[:, 0] - i0[:, 0] + 1
+    counts = nx * (i1[:, 1] - i0[:, 1] + 1)
+
+    tri = repeat(arange(len(triangles)), counts)
+    k = arange(len(tri)) - repeat(cumsum(counts) - counts, counts)
+    cells = (i0[tri, 0] + k % nx[tri]) * n + i0[tri, 1] + k // nx[tri]
+
+    order = argsort(cells, kind="stable")
+    bucket = tri[order]
+    start = searchsorted(cells[order], arange(n * n + 1))
+
+    # candidate triangles of every point, points outside of the grid have none
+    q = pts @ P
+    cell = _cells(q) @ (n, 1)
+    inside = ((q >= origin) & (q <= origin + n * size)).all(1)
+    cnt = where(inside, start[cell + 1] - start[cell], 0)
+
+    # peak of the temporaries per point-triangle pair
+    budget = max(1, maxbytes // 256)
+    total = cumsum(cnt)
+
+    i = 0
+    while i < len(pts):
+        j = max(
+            i + 1, int(searchsorted(total, total[i] - cnt[i] + budget, side="right"))
+        )
+
+        c = cnt[i:j]
+        pi = repeat(arange(j - i), c)
+        k = arange(len(pi)) - repeat(cumsum(c) - c, c)
+        ti = bucket[repeat(start[cell[i:j]], c) + k]
+
+        tvec = pts[i:j][pi] - v0[ti]
+        u = einsum("ij,ij->i", tvec, pvec[ti]) * inv[ti]
+        qvec = cross(tvec, e1[ti])
+        v = (qvec @ d) * inv[ti]
+        t = einsum("ij,ij->i", qvec, e2[ti]) * inv[ti]
+
+        hits = valid[ti] & (u >= 0) & (v >= 0) & (u + v <= 1) & (t > 0)
+        odd = bincount(pi, weights=hits, minlength=j - i) % 2 == 1
+
+        rv[i:j][odd] = ta.TopAbs_IN.value
+        i = j
+
+    return rv
+
+
+def _bbox(s: Shape) -> Bnd_Box:
+    """
+    Enclosing (non-optimal) bounding box, suitable for pruning distance queries.
+    """
+
+    rv = Bnd_Box()
+    BRepBndLib.Add_s(s.wrapped, rv, False)
+
+    return rv
+
+
+class PreparedShape(object):
+    """
+    Shape prepared for repeated distance, closest point and clearance queries.
+
+    The extrema structures of the prepared shape are built once (per thread) and
+    reused for every query. Bounding boxes are used to skip exact computations
+    where possible. The threads of batch queries are released by close, at the
+    end of a with block or when the object is garbage collected.
+    """
+
+    shape: Shape
+    threads: Optional[int]
+
+    _bb: Bnd_Box
+    _local: local
+    _executor: Optional[ThreadPoolExecutor]
+
+    def __init__(self, s: Shape, threads: Optional[int] = None):
+        """
+        :param s: Shape to be prepared.
+        :param threads: Number of threads used by batch queries. If None, batch
+            queries are run serially and OCCT internal parallelism is used instead.
+        """
+
+        self.shape = s
+        self.threads = threads
+
+        self._bb = _bbox(s)
+        self._local = local()
+        self._executor = None
+
+    def _extrema(self) -> BRepExtrema_DistShapeShape:
+
+        rv = getattr(self._local, "ext", None)
+
+        if rv is None:
+            rv = BRepExtrema_DistShapeShape()
+            rv.SetMultiThread(self.threads is None)
+            rv.LoadS1(self.shape.wrapped)
+
+            self._local.ext = rv
+
+        return rv
+
+    def _perform(self, other: Shape) -> BRepExtrema_DistShapeShape:
+
+        ext = self._extrema()
+        ext.LoadS2(other.wrapped)
+
+        if not ext.Perform():
+            raise ValueError("Distance calculation failed")
+
+        return ext
+
+    def _map(self, f, others: Iterable[Shape]) -> List[Any]:
+
+        if self.threads:
+            # the pool is kept, so that the extrema prepared by its threads are reused
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.threads)
+                finalize(self, self._executor.shutdown, False)
+
+            return list(self._executor.map(f, others))
+
+        return [f(o) for o in others]
+
+    def close(self):
+        """
+        Shut down the threads of batch queries. They are started again if needed.
+        """
+
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self) -> "PreparedShape":
+
+        return self
+
+    def __exit__(self, *args):
+
+        self.close()
+
+    def distance(self, other: Shape) -> float:
+        """
+        Minimal distance to other shape.
+        """
+
+        return self._perform(other).Value()
+
+    def closest(self, other: Shape) -> Tuple[Vector, Vector]:
+        """
+        Closest points between the prepared shape and other shape.
+        """
+
+        ext = self._perform(other)
+
+        return Vector(ext.PointOnShape1(1)), Vector(ext.PointOnShape2(1))
+
+    def clearance(self, other: Shape, d: float) -> bool:
+        """
+        Check if the distance to other shape is smaller than d. The exact
+        distance is only calculated if the bounding boxes are closer than d.
+        """
+
+        if self._bb.Distance(_bbox(other)) >= d:
+            return False
+
+        return self.distance(other) < d
+
+    def distances(self, *others: Shape) -> List[float]:
+        """
+        Minimal distances to multiple shapes.
+        """
+
+        return self._map(self.distance, others)
+
+    def clearances(self, d: float, *others: Shape) -> List[bool]:
+        """
+        Check if the distances to multiple shapes are smaller than d.
+        """
+
+        return self._map(lambda o: self.clearance(o, d), others)
+
+    def nearest(self, *others: Shape) -> Tuple[int, float]:
+        """
+        Index of and distance to the nearest shape. Shapes are visited in
+        the order of their bounding box distance and the search stops as soon
+        as no remaining shape can be closer than the current nearest one.
+        """
+
+        if not others:
+            raise ValueError("At least one shape is required")
+
+        bbs = sorted((self._bb.Distance(_bbox(o)), i) for i, o in enumerate(others))
+
+        ix, rv = -1, inf
+
+        for bb_dist, i in bbs:
+            if bb_dist >= rv:
+                break
+
+            d = self.distance(others[i])
+            if d < rv:
+                ix, rv = i, d
+
+        return ix, rv
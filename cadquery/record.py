@@ -0,0 +1,622 @@
+"""
+Recording of Workplane operations as a graph, which can be optimized and replayed
+with new parameter values.
+"""
+
+from copy import copy
+from functools import partial
+from operator import add, sub, mul, truediv, neg, pow
+from types import MethodType
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    cast,
+)
+
+from .cq import Workplane
+from .occ_impl.shapes import Shape
+
+T = TypeVar("T", bound=Workplane)
+
+# operations that can be merged into one boolean when chained
+MERGEABLE = ("union", "cut")
+
+# public methods that are not recorded
+SKIP = ("newObject", "record", "graph")
+
+
+class Expr(object):
+    """
+    Expression of parameters, evaluated when a graph is replayed.
+    """
+
+    f: Callable[..., Any]
+    args: Tuple[Any, ...]
+
+    def __init__(self, f: Callable[..., Any], *args: Any):
+
+        self.f = f
+        self.args = args
+
+    def params(self) -> Dict[str, Any]:
+        """
+        Parameters used by this expression with their default values.
+        """
+
+        rv: Dict[str, Any] = {}
+
+        for arg in self.args:
+            rv.update(_params(arg))
+
+        return rv
+
+    def eval(self, values: Dict[str, Any]) -> Any:
+        """
+        Evaluate using the provided parameter values.
+        """
+
+        return self.f(*(_resolve(arg, values) for arg in self.args))
+
+    def __add__(self, other: Any) -> "Expr":
+        return Expr(add, self, other)
+
+    def __radd__(self, other: Any) -> "Expr":
+        return Expr(add, other, self)
+
+    def __sub__(self, other: Any) -> "Expr":
+        return Expr(sub, self, other)
+
+    def __rsub__(self, other: Any) -> "Expr":
+        return Expr(sub, other, self)
+
+    def __mul__(self, other: Any) -> "Expr":
+        return Expr(mul, self, other)
+
+    def __rmul__(self, other: Any) -> "Expr":
+        return Expr(mul, other, self)
+
+    def __truediv__(self, other: Any) -> "Expr":
+        return Expr(truediv, self, other)
+
+    def __rtruediv__(self, other: Any) -> "Expr":
+        return Expr(truediv, other, self)
+
+    def __pow__(self, other: Any) -> "Expr":
+        return Expr(pow, self, other)
+
+    def __neg__(self) -> "Expr":
+        return Expr(neg, self)
+
+
+class Param(Expr):
+    """
+    Named parameter of a recorded graph.
+
+    The default value is used while recording. Params can be combined using
+    arithmetic operators and nested in lists, tuples and dicts.
+    """
+
+    name: str
+    value: Any
+
+    def __init__(self, name: str, value: Any):
+
+        super().__init__(lambda x: x)
+
+        self.name = name
+        self.value = value
+
+    def params(self) -> Dict[str, Any]:
+
+        return {self.name: self.value}
+
+    def eval(self, values: Dict[str, Any]) -> Any:
+
+        return values.get(self.name, self.value)
+
+    def __repr__(self) -> str:
+
+        return f"Param({self.name!r}, {self.value!r})"
+
+
+class _Ref(object):
+    """
+    Reference to the value of another node.
+    """
+
+    def __init__(self, node: int):
+
+        self.node = node
+
+
+class _Many(object):
+    """
+    Tools of merged boolean operations.
+    """
+
+    def __init__(self, items: List[Any]):
+
+        self.items = items
+
+
+class _Node(object):
+    """
+    Single operation of a graph.
+    """
+
+    op: Optional[str]
+    args: Tuple[Any, ...]
+    kwargs: Dict[str, Any]
+    inputs: Tuple[int, ...]
+    params: FrozenSet[str]
+    value: Any
+
+    def __init__(
+        self,
+        op: Optional[str],
+        args: Tuple[Any, ...] = (),
+        kwargs: Optional[Dict[str, Any]] = None,
+        inputs: Tuple[int, ...] = (),
+        params: Iterable[str] = (),
+        value: Any = None,
+    ):
+
+        self.op = op
+        self.args = args
+        self.kwargs = kwargs if kwargs is not None else {}
+        self.inputs = inputs
+        self.params = frozenset(params)
+        self.value = value
+
+    def refs(self) -> List[int]:
+        """
+        Nodes referenced by the arguments.
+        """
+
+        return [r.node for r in _iter(self.args + tuple(self.kwargs.values()))]
+
+
+def _iter(obj: Any) -> Iterable[_Ref]:
+
+    if isinstance(obj, _Ref):
+        yield obj
+    elif isinstance(obj, _Many):
+        yield from _iter(obj.items)
+    elif isinstance(obj, (list, tuple)):
+        for el in obj:
+            yield from _iter(el)
+    elif isinstance(obj, dict):
+        for el in obj.values():
+            yield from _iter(el)
+
+
+def _params(obj: Any) -> Dict[str, Any]:
+
+    rv: Dict[str, Any] = {}
+
+    if isinstance(obj, Expr):
+        rv.update(obj.params())
+    elif isinstance(obj, (list, tuple)):
+        for el in obj:
+            rv.update(_params(el))
+    elif isinstance(obj, dict):
+        for el in obj.values():
+            rv.update(_params(el))
+
+    return rv
+
+
+def _resolve(
+    obj: Any, values: Dict[str, Any], refs: Callable[[int], Any] = lambda i: None
+) -> Any:
+    """
+    Substitute parameter values and node references.
+    """
+
+    if isinstance(obj, Expr):
+        return obj.eval(values)
+    elif isinstance(obj, _Ref):
+        return refs(obj.node)
+    elif isinstance(obj, _Many):
+        return _Many([_resolve(el, values, refs) for el in obj.items])
+    elif isinstance(obj, tuple):
+        return tuple(_resolve(el, values, refs) for el in obj)
+    elif isinstance(obj, list):
+        return [_resolve(el, values, refs) for el in obj]
+    elif isinstance(obj, dict):
+        return {k: _resolve(v, values, refs) for k, v in obj.items()}
+
+    return obj
+
+
+def _state(obj: Workplane) -> Dict[str, Any]:
+    """
+    Modeling state of the context after an operation.
+    """
+
+    ctx = obj.ctx
+
+    return dict(
+        pendingWires=list(ctx.pendingWires),
+        pendingEdges=list(ctx.pendingEdges),
+        firstPoint=ctx.firstPoint,
+        tolerance=ctx.tolerance,
+        tags=dict(ctx.tags),
+    )
+
+
+def _restore(obj: Workplane, state: Dict[str, Any], cls: Type[Workplane]) -> Workplane:
+    """
+    Copy of obj with its own context, so that it can be modified independently.
+    """
+
+    rv = copy(obj)
+    rv.__class__ = cls
+
+    rv.ctx = copy(obj.ctx)
+    rv.ctx.graph = None
+
+    for k, v in state.items():
+        setattr(rv.ctx, k, copy(v))
+
+    rv.objects = list(obj.objects)
+    rv.__dict__.pop("_node", None)
+
+    return rv
+
+
+def _plain(cls: Type[Workplane]) -> Type[Workplane]:
+
+    return getattr(cls, "_recorded", cls)
+
+
+_classes: Dict[type, type] = {}
+
+
+def _recording(cls: Type[Workplane]) -> Type[Workplane]:
+    """
+    Subclass of cls recording the calls of its public methods.
+    """
+
+    cls = _plain(cls)
+
+    if cls not in _classes:
+
+        def __getattribute__(self, name):
+
+            rv = object.__getattribute__(self, name)
+
+            if name.startswith("_") or name in SKIP or not isinstance(rv, MethodType):
+                return rv
+
+            graph = object.__getattribute__(self, "ctx").graph
+
+            # nested calls are part of the recorded operation
+            if graph is None or graph._depth > 0:
+                return rv
+
+            return partial(graph._call, self, name, rv)
+
+        _classes[cls] = type(
+            cls.__name__,
+            (cls,),
+            dict(__getattribute__=__getattribute__, _recorded=cls),
+        )
+
+    return _classes[cls]
+
+
+class Graph(object):
+    """
+    Graph of recorded Workplane operations.
+
+    Nodes are stored in the recording order, so inputs always precede the nodes
+    using them. Replay results are cached per node together with the values of
+    the parameters the node depends on, so that only the nodes downstream of
+    a changed parameter are recomputed.
+    """
+
+    nodes: List[_Node]
+    output: int
+
+    _depth: int
+    _cache: Dict[int, Tuple[Dict[str, Any], Any, Optional[Dict[str, Any]]]]
+
+    def __init__(self, nodes: Optional[List[_Node]] = None, output: int = 0):
+
+        self.nodes = nodes if nodes is not None else []
+        self.output = output
+
+        self._depth = 0
+        self._cache = {}
+
+    def __len__(self) -> int:
+
+        return len(self.nodes)
+
+    @classmethod
+    def record(cls, obj: T) -> T:
+        """
+        Start recording the operations applied to obj and to the objects derived from it.
+        """
+
+        rv = cast(T, _restore(obj, _state(obj), _recording(type(obj))))
+        graph = cls()
+
+        graph._nodeOf(obj)
+
+        rv.ctx.graph = graph
+        setattr(rv, "_node", (graph, 0))
+
+        return rv
+
+    @classmethod
+    def of(cls, obj: Workplane) -> "Graph":
+        """
+        Graph of operations leading to obj. Unused branches are dropped.
+        """
+
+        graph = obj.ctx.graph
+        node = getattr(obj, "_node", None)
+
+        if graph is None or node is None or node[0] is not graph:
+            raise ValueError("Object was not recorded")
+
+        return graph._subgraph(node[1])
+
+    def params(self) -> Dict[str, Any]:
+        """
+        Parameters of the graph with their default values.
+        """
+
+        rv: Dict[str, Any] = {}
+
+        for node in self.nodes:
+            rv.update(_params((node.args, node.kwargs)))
+
+        return rv
+
+    def _nodeOf(self, obj: Any) -> int:
+        """
+        Node of a Workplane, objects not recorded in this graph are added as constants.
+        """
+
+        node = getattr(obj, "_node", None)
+
+        if node is not None and node[0] is self:
+            return node[1]
+
+        state = _state(obj)
+        value = _restore(obj, state, _plain(type(obj)))
+
+        self.nodes.append(_Node(None, value=value))
+        self._cache[len(self.nodes) - 1] = ({}, value, state)
+
+        return len(self.nodes) - 1
+
+    def _encode(self, obj: Any) -> Any:
+
+        if isinstance(obj, Workplane):
+            return _Ref(self._nodeOf(obj))
+        elif isinstance(obj, tuple):
+            return tuple(self._encode(el) for el in obj)
+        elif isinstance(obj, list):
+            return [self._encode(el) for el in obj]
+        elif isinstance(obj, dict):
+            return {k: self._encode(v) for k, v in obj.items()}
+
+        return obj
+
+    def _call(self, obj: Workplane, name: str, method: Callable, *args, **kwargs):
+        """
+        Call a method and record it if a Workplane is returned.
+        """
+
+        # inputs are determined before the call, the method might return obj
+        node = self._nodeOf(obj)
+        args_ = self._encode(args)
+        kwargs_ = self._encode(kwargs)
+
+        self._depth += 1
+
+        try:
+            rv = method(*_resolve(args, {}), **_resolve(kwargs, {}))
+        finally:
+            self._depth -= 1
+
+        if isinstance(rv, Workplane):
+            inputs = (node, *_Node(None, args_, kwargs_).refs())
+
+            # values used while recording
+            key = _params((args, kwargs))
+            for i in inputs:
+                key.update(self._cache[i][0])
+
+            state = _state(rv)
+
+            self.nodes.append(_Node(name, args_, kwargs_, inputs, key))
+            self._cache[len(self.nodes) - 1] = (
+                key,
+                _restore(rv, state, _plain(type(rv))),
+                state,
+            )
+
+            if type(rv) is not _recording(type(rv)):
+                rv.__class__ = _recording(type(rv))
+
+            rv.ctx.graph = self
+            setattr(rv, "_node", (self, len(self.nodes) - 1))
+
+        return rv
+
+    def _subgraph(self, output: int) -> "Graph":
+
+        # collect the ancestors of output
+        used = {output}
+
+        for i in range(output, -1, -1):
+            if i in used:
+                used.update(self.nodes[i].inputs)
+
+        index = {old: new for new, old in enumerate(sorted(used))}
+        nodes = [self._renumber(self.nodes[i], index) for i in sorted(used)]
+
+        rv = Graph(nodes, index[output])
+
+        # cached values of the nodes are shared
+        for old, new in index.items():
+            if old in self._cache:
+                rv._cache[new] = self._cache[old]
+
+        return rv
+
+    @staticmethod
+    def _renumber(node: _Node, index: Dict[int, int]) -> _Node:
+        def f(obj):
+
+            if isinstance(obj, _Ref):
+                return _Ref(index[obj.node])
+            elif isinstance(obj, _Many):
+                return _Many(f(obj.items))
+            elif isinstance(obj, tuple):
+                return tuple(f(el) for el in obj)
+            elif isinstance(obj, list):
+                return [f(el) for el in obj]
+            elif isinstance(obj, dict):
+                return {k: f(v) for k, v in obj.items()}
+
+            return obj
+
+        return _Node(
+            node.op,
+            f(node.args),
+            f(node.kwargs),
+            tuple(index[i] for i in node.inputs),
+            node.params,
+            node.value,
+        )
+
+    def optimize(self) -> "Graph":
+        """
+        Return an optimized graph. Unused branches are dropped and chains of unions
+        or cuts with equal options are merged into single boolean operations.
+        Nodes independent of the parameters are evaluated only once.
+        """
+
+        graph = self._subgraph(self.output)
+        nodes = graph.nodes
+
+        consumers: Dict[int, List[int]] = {}
+        for i, node in enumerate(nodes):
+            for j in node.inputs:
+                consumers.setdefault(j, []).append(i)
+
+        for i, node in enumerate(nodes):
+            prev = nodes[node.inputs[0]] if node.inputs else None
+
+            if (
+                prev is not None
+                and node.op in MERGEABLE
+                and prev.op == node.op
+                and node.inputs[0] != graph.output
+                and consumers.get(node.inputs[0]) == [i]
+                and len(prev.args) == len(node.args) == 1
+                and prev.kwargs == node.kwargs
+            ):
+                tools = (
+                    prev.args[0].items
+                    if isinstance(prev.args[0], _Many)
+                    else [prev.args[0]]
+                )
+
+                nodes[i] = _Node(
+                    node.op,
+                    (_Many(tools + [node.args[0]]),),
+                    node.kwargs,
+                    (prev.inputs[0],) + prev.inputs[1:] + node.inputs[1:],
+                    prev.params | node.params,
+                )
+
+        # drop the merged nodes, cached values remain valid
+        return graph._subgraph(graph.output)
+
+    def _value(self, i: int) -> Any:
+        """
+        Value of a node, Workplanes are copied so that they can be modified.
+        """
+
+        _, value, state = self._cache[i]
+
+        if isinstance(value, Workplane) and state is not None:
+            return _restore(value, state, _plain(type(value)))
+
+        return value
+
+    def _eval(self, node: _Node, values: Dict[str, Any]) -> Any:
+
+        if node.op is None:
+            return node.value
+
+        obj = self._value(node.inputs[0])
+        args = _resolve(node.args, values, self._value)
+        kwargs = _resolve(node.kwargs, values, self._value)
+
+        if args and isinstance(args[0], _Many):
+            args = (_merge(obj, node.op, args[0].items),) + args[1:]
+
+        return getattr(obj, node.op)(*args, **kwargs)
+
+    def replay(self, **params: Any) -> Workplane:
+        """
+        Replay the graph with new parameter values and return the output.
+        """
+
+        defaults = self.params()
+        unknown = set(params) - set(defaults)
+
+        if unknown:
+            raise ValueError(f"Unknown parameters: {', '.join(sorted(unknown))}")
+
+        values = {**defaults, **params}
+
+        for i, node in enumerate(self.nodes):
+            key = {k: values[k] for k in node.params}
+            cached = self._cache.get(i)
+
+            if cached is None or cached[0] != key:
+                rv = self._eval(node, values)
+                state = _state(rv) if isinstance(rv, Workplane) else None
+
+                self._cache[i] = (key, rv, state)
+
+        return self._value(self.output)
+
+
+def _merge(obj: Workplane, op: str, tools: List[Any]) -> Workplane:
+    """
+    Collect the tools of merged boolean operations. Tools are kept as separate
+    shapes, since they might overlap.
+    """
+
+    shapes: List[Shape] = []
+
+    for tool in tools:
+        if isinstance(tool, Workplane):
+            if op == "union":
+                shapes.extend(tool.solids().vals())  # type: ignore
+            else:
+                shapes.extend(el for el in tool.vals() if isinstance(el, Shape))
+
+            obj._mergeTags(tool)
+        else:
+            shapes.append(tool)
+
+    return Workplane().add(shapes)
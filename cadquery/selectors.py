@@ -20,12 +20,184 @@ from pyparsing import (
     infixNotation,
     opAssoc,
 )
-from functools import reduce
-from typing import Iterable, List, Sequence, TypeVar, cast
+from functools import reduce, lru_cache
+from time import perf_counter
+from contextvars import ContextVar
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional as Opt,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+    cast,
+)
+
+from numpy import (
+    array,
+    sqrt,
+    where,
+    arcsin,
+    arccos,
+    searchsorted,
+    argsort,
+    float64,
+    bool_,
+)
+from numpy.typing import NDArray
 
 Shape = TypeVar("Shape", bound=ShapeProtocol)
 
 
+def _vectorized(obj: object, scalar: str, vectorized: str) -> bool:
+    """
+    Check if the vectorized implementation of a method can be used, i.e. the
+    scalar version was not overridden in a subclass of the class that provides
+    the vectorized version.
+    """
+
+    mro = type(obj).__mro__
+
+    def owner(name: str) -> int:
+        return next(i for i, c in enumerate(mro) if name in c.__dict__)
+
+    return owner(vectorized) <= owner(scalar)
+
+
+def _vectors(vecs: Iterable[Vector]) -> NDArray[float64]:
+    """
+    Convert vectors to a (N,3) array.
+    """
+
+    rv = array([v.toTuple() for v in vecs], dtype=float64)
+
+    return rv.reshape(-1, 3)
+
+
+def _dot(vecs: NDArray[float64], v: Vector) -> NDArray[float64]:
+    """
+    Dot product of (N,3) array with a vector; same operation order as gp_XYZ.
+    """
+
+    return vecs[:, 0] * v.x + vecs[:, 1] * v.y + vecs[:, 2] * v.z
+
+
+def _cross_norm(v: Vector, vecs: NDArray[float64]) -> NDArray[float64]:
+    """
+    Length of the cross products of a vector with a (N,3) array; same operation
+    order as gp_XYZ.
+    """
+
+    x = v.y * vecs[:, 2] - v.z * vecs[:, 1]
+    y = v.z * vecs[:, 0] - v.x * vecs[:, 2]
+    z = v.x * vecs[:, 1] - v.y * vecs[:, 0]
+
+    return sqrt(x * x + y * y + z * z)
+
+
+def _angles(v: Vector, vecs: NDArray[float64]) -> NDArray[float64]:
+    """
+    Angles between a vector and a (N,3) array; same algorithm as gp_Dir.Angle.
+    """
+
+    d = v.normalized()
+    x, y, z = vecs.T
+    n = vecs / sqrt(x * x + y * y + z * z)[:, None]
+
+    cos = _dot(n, d)
+    sin = _cross_norm(d, n)
+
+    return where(
+        (cos > -0.70710678118655) & (cos < 0.70710678118655),
+        arccos(cos.clip(-1, 1)),
+        where(cos < 0, math.pi - arcsin(sin.clip(0, 1)), arcsin(sin.clip(0, 1))),
+    )
+
+
+# per-call cache of object properties shared by all selectors of an expression
+_property_cache: ContextVar[Opt[Dict[Tuple[str, int], Tuple[Any, Any]]]] = ContextVar(
+    "_property_cache", default=None
+)
+
+
+def _cached(obj: Any, name: str, f: Callable[[Any], Any]) -> Any:
+    """
+    Compute a property of obj, reusing the value computed by another selector
+    of the same expression if possible.
+    """
+
+    cache = _property_cache.get()
+
+    if cache is None:
+        return f(obj)
+
+    key = (name, id(obj))
+    entry = cache.get(key)
+
+    if entry is None or entry[0] is not obj:
+        entry = cache[key] = (obj, f(obj))
+
+    return entry[1]
+
+
+class _Context(object):
+    """
+    Evaluation context of a selector expression: holds the shared property
+    cache and optionally records the executed plan.
+    """
+
+    trace: Opt[List[Tuple[int, str, str]]]
+    depth: int
+
+    def __init__(self, trace: bool = False):
+
+        self.trace = [] if trace else None
+        self.depth = 0
+
+    def run(self, node: "Selector", objectList: Sequence[Shape]) -> List[Shape]:
+
+        token = _property_cache.set({}) if _property_cache.get() is None else None
+
+        try:
+            return self.eval(node, objectList)
+        finally:
+            if token:
+                _property_cache.reset(token)
+
+    def eval(self, node: "Selector", objectList: Sequence[Shape]) -> List[Shape]:
+
+        if self.trace is None:
+            return node._filter(objectList, self)
+
+        entry = len(self.trace)
+        self.trace.append((self.depth, node._label(), ""))
+
+        self.depth += 1
+        t0 = perf_counter()
+        try:
+            rv = node._filter(objectList, self)
+        finally:
+            self.depth -= 1
+
+        dt = perf_counter() - t0
+        self.trace[entry] = (
+            self.trace[entry][0],
+            self.trace[entry][1],
+            f"in={len(objectList)} out={len(rv)} {1e3*dt:.3f} ms",
+        )
+
+        return rv
+
+    def skip(self, node: "Selector"):
+
+        if self.trace is not None:
+            self.trace.append((self.depth, node._label(), "skipped"))
+
+
 class Selector(object):
     """
     Filters a list of objects.
@@ -45,6 +217,48 @@ class Selector(object):
         """
         return list(objectList)
 
+    def _filter(self, objectList: Sequence[Shape], ctx: _Context) -> List[Shape]:
+        """
+        Filter within an evaluation context. Compound selectors override this
+        to evaluate their operands.
+        """
+        return self.filter(objectList)
+
+    def _cost(self) -> float:
+        """
+        Relative cost estimate used for planning compound selectors.
+        """
+        return 10.0
+
+    def _pointwise(self) -> bool:
+        """
+        True if every object is selected independently of the other objects,
+        i.e. filtering a subset gives the same result as filtering the full list
+        and intersecting with the subset.
+        """
+        return False
+
+    def _label(self) -> str:
+
+        return type(self).__name__
+
+    def explain(self, objectList: Sequence[Shape]) -> str:
+        """
+        Filter the provided list and return a description of the executed plan
+        with input and output sizes and timing of every node.
+
+        :param objectList: list to filter
+        :return: plan description
+        """
+
+        ctx = _Context(trace=True)
+        ctx.run(self, objectList)
+
+        return "\n".join(
+            f"{'  '*depth}{label} {info}"
+            for depth, label, info in cast(list, ctx.trace)
+        )
+
     def __and__(self, other):
         return AndSelector(self, other)
 
@@ -79,6 +293,9 @@ class NearestToPointSelector(Selector):
     def __init__(self, pnt):
         self.pnt = pnt
 
+    def _cost(self) -> float:
+        return 4.0
+
     def filter(self, objectList: Sequence[Shape]):
         def dist(tShape):
             return tShape.Center().sub(Vector(*self.pnt)).Length
@@ -106,6 +323,12 @@ class BoxSelector(Selector):
         self.p1 = Vector(*point1)
         self.test_boundingbox = boundingbox
 
+    def _cost(self) -> float:
+        return 4.0 if self.test_boundingbox else 3.0
+
+    def _pointwise(self) -> bool:
+        return True
+
     def filter(self, objectList: Sequence[Shape]):
 
         result = []
@@ -129,7 +352,7 @@ class BoxSelector(Selector):
                 ):
                     result.append(o)
             else:
-                if isInsideBox(o.Center()):
+                if isInsideBox(_cached(o, "Center", lambda o: o.Center())):
                     result.append(o)
 
         return result
@@ -144,33 +367,62 @@ class BaseDirSelector(Selector):
         self.direction = vector
         self.tolerance = tolerance
 
+    def _cost(self) -> float:
+        return 2.0
+
+    def _pointwise(self) -> bool:
+        return True
+
+    @staticmethod
+    def _testVector(o: Shape) -> Opt[Vector]:
+        """
+        Normal of a planar face or tangent of a linear edge; None otherwise.
+        """
+
+        # no really good way to avoid a switch here, edges and faces are simply different!
+        if o.ShapeType() == "Face" and o.geomType() == "PLANE":
+            # a face is only parallel to a direction if it is a plane, and
+            # its normal is parallel to the dir
+            return cast(FaceProtocol, o).normalAt(None)
+        elif o.ShapeType() == "Edge" and o.geomType() == "LINE":
+            # an edge is parallel to a direction if its underlying geometry is plane or line
+            return cast(Shape1DProtocol, o).tangentAt()
+
+        return None
+
     def test(self, vec: Vector) -> bool:
         "Test a specified vector. Subclasses override to provide other implementations"
         return True
 
+    def testArray(self, vecs: NDArray[float64]) -> NDArray[bool_]:
+        """
+        Test a (N,3) array of vectors. Subclasses override to provide a vectorized
+        version of test.
+        """
+        return array([self.test(Vector(*v)) for v in vecs], dtype=bool)
+
     def filter(self, objectList: Sequence[Shape]) -> List[Shape]:
         """
         There are lots of kinds of filters, but for planes they are always
         based on the normal of the plane, and for edges on the tangent vector
         along the edge
         """
-        r = []
+        objs = []
+        test_vectors = []
         for o in objectList:
-            # no really good way to avoid a switch here, edges and faces are simply different!
-            if o.ShapeType() == "Face" and o.geomType() == "PLANE":
-                # a face is only parallel to a direction if it is a plane, and
-                # its normal is parallel to the dir
-                test_vector = cast(FaceProtocol, o).normalAt(None)
-            elif o.ShapeType() == "Edge" and o.geomType() == "LINE":
-                # an edge is parallel to a direction if its underlying geometry is plane or line
-                test_vector = cast(Shape1DProtocol, o).tangentAt()
-            else:
+            test_vector = _cached(o, "testVector", self._testVector)
+            if test_vector is None:
                 continue
 
-            if self.test(test_vector):
-                r.append(o)
+            objs.append(o)
+            test_vectors.append(test_vector)
 
-        return r
+        if _vectorized(self, "test", "testArray"):
+            mask = self.testArray(_vectors(test_vectors))
+        else:
+            mask = array([self.test(v) for v in test_vectors], dtype=bool)
+
+        return [o for o, m in zip(objs, mask) if m]
 
 
 class ParallelDirSelector(BaseDirSelector):
@@ -195,6 +447,9 @@ class ParallelDirSelector(BaseDirSelector):
     def test(self, vec: Vector) -> bool:
         return self.direction.cross(vec).Length < self.tolerance
 
+    def testArray(self, vecs: NDArray[float64]) -> NDArray[bool_]:
+        return _cross_norm(self.direction, vecs) < self.tolerance
+
 
 class DirectionSelector(BaseDirSelector):
     """
@@ -218,6 +473,9 @@ class DirectionSelector(BaseDirSelector):
     def test(self, vec: Vector) -> bool:
         return self.direction.getAngle(vec) < self.tolerance
 
+    def testArray(self, vecs: NDArray[float64]) -> NDArray[bool_]:
+        return _angles(self.direction, vecs) < self.tolerance
+
 
 class PerpendicularDirSelector(BaseDirSelector):
     """
@@ -242,6 +500,9 @@ class PerpendicularDirSelector(BaseDirSelector):
     def test(self, vec: Vector) -> bool:
         return abs(self.direction.getAngle(vec) - math.pi / 2) < self.tolerance
 
+    def testArray(self, vecs: NDArray[float64]) -> NDArray[bool_]:
+        return abs(_angles(self.direction, vecs) - math.pi / 2) < self.tolerance
+
 
 class TypeSelector(Selector):
     """
@@ -264,10 +525,16 @@ class TypeSelector(Selector):
     def __init__(self, typeString: str):
         self.typeString = typeString.upper()
 
+    def _cost(self) -> float:
+        return 1.0
+
+    def _pointwise(self) -> bool:
+        return True
+
     def filter(self, objectList: Sequence[Shape]) -> List[Shape]:
         r = []
         for o in objectList:
-            if o.geomType() == self.typeString:
+            if _cached(o, "geomType", lambda o: o.geomType()) == self.typeString:
                 r.append(o)
         return r
 
@@ -282,6 +549,9 @@ class _NthSelector(Selector, ABC):
         self.directionMax = directionMax
         self.tolerance = tolerance
 
+    def _cost(self) -> float:
+        return 4.0
+
     def filter(self, objectlist: Sequence[Shape]) -> List[Shape]:
         """
         Return the nth object in the objectlist sorted by self.key and
@@ -313,11 +583,14 @@ class _NthSelector(Selector, ABC):
         """
         raise NotImplementedError
 
-    def cluster(self, objectlist: Sequence[Shape]) -> List[List[Shape]]:
+    def keys(self, objectlist: Sequence[Shape]) -> Tuple[NDArray[float64], List[Shape]]:
         """
-        Clusters the elements of objectlist if they are within tolerance.
+        Return the keys of all objects as an array, together with the objects
+        for which a key could be computed. Subclasses can override to provide a
+        vectorized version of key.
         """
-        key_and_obj = []
+        keys = []
+        objs = []
         for obj in objectlist:
             # Need to handle value errors, such as what occurs when you try to
             # access the radius of a straight line
@@ -326,17 +599,42 @@ class _NthSelector(Selector, ABC):
             except ValueError:
                 # forget about this element and continue
                 continue
-            key_and_obj.append((key, obj))
-
-        key_and_obj.sort(key=lambda x: x[0])
-        clustered = [[]]  # type: List[List[Shape]]
-        start = key_and_obj[0][0]
-        for key, obj in key_and_obj:
-            if abs(key - start) <= self.tolerance:
-                clustered[-1].append(obj)
-            else:
-                clustered.append([obj])
-                start = key
+            keys.append(key)
+            objs.append(obj)
+
+        return array(keys, dtype=float64), objs
+
+    def cluster(self, objectlist: Sequence[Shape]) -> List[List[Shape]]:
+        """
+        Clusters the elements of objectlist if they are within tolerance.
+        """
+        if _vectorized(self, "key", "keys"):
+            keys, objs = self.keys(objectlist)
+        else:
+            keys, objs = _NthSelector.keys(self, objectlist)
+
+        if len(objs) == 0:
+            raise IndexError("No objects to cluster")
+
+        ix = argsort(keys, kind="stable")
+        keys = keys[ix]
+
+        # a cluster starts with the smallest key and spans the tolerance
+        clustered = []  # type: List[List[Shape]]
+        i, n = 0, len(keys)
+        while i < n:
+            start = keys[i]
+            j = int(searchsorted(keys, start + self.tolerance, side="right"))
+
+            # correct for rounding of start + tolerance
+            while j < n and keys[j] - start <= self.tolerance:
+                j += 1
+            while j > i + 1 and keys[j - 1] - start > self.tolerance:
+                j -= 1
+
+            clustered.append([objs[k] for k in ix[i:j]])
+            i = j
+
         return clustered
 
 
@@ -377,7 +675,13 @@ class CenterNthSelector(_NthSelector):
         self.direction = vector
 
     def key(self, obj: Shape) -> float:
-        return obj.Center().dot(self.direction)
+        return _cached(obj, "Center", lambda o: o.Center()).dot(self.direction)
+
+    def keys(self, objectlist: Sequence[Shape]) -> Tuple[NDArray[float64], List[Shape]]:
+        objs = list(objectlist)
+        centers = _vectors(_cached(o, "Center", lambda o: o.Center()) for o in objs)
+
+        return _dot(centers, self.direction), objs
 
 
 class DirectionMinMaxSelector(CenterNthSelector):
@@ -430,6 +734,12 @@ class DirectionNthSelector(ParallelDirSelector, CenterNthSelector):
         ParallelDirSelector.__init__(self, vector, tolerance)
         _NthSelector.__init__(self, n, directionMax, tolerance)
 
+    def _cost(self) -> float:
+        return 5.0
+
+    def _pointwise(self) -> bool:
+        return False
+
     def filter(self, objectlist: Sequence[Shape]) -> List[Shape]:
         objectlist = ParallelDirSelector.filter(self, objectlist)
         objectlist = _NthSelector.filter(self, objectlist)
@@ -444,6 +754,9 @@ class LengthNthSelector(_NthSelector):
         All Edge and Wire objects
     """
 
+    def _cost(self) -> float:
+        return 5.0
+
     def key(self, obj: Shape) -> float:
         if obj.ShapeType() in ("Edge", "Wire"):
             return cast(Shape1DProtocol, obj).Length()
@@ -503,6 +816,9 @@ class AreaNthSelector(_NthSelector):
        )
     """
 
+    def _cost(self) -> float:
+        return 8.0
+
     def key(self, obj: Shape) -> float:
         if obj.ShapeType() in ("Face", "Shell", "Solid"):
             return obj.Area()
@@ -532,10 +848,19 @@ class BinarySelector(Selector):
         self.right = right
 
     def filter(self, objectList: Sequence[Shape]):
+        return _Context().run(self, objectList)
+
+    def _filter(self, objectList: Sequence[Shape], ctx: _Context) -> List[Shape]:
         return self.filterResults(
-            self.left.filter(objectList), self.right.filter(objectList)
+            ctx.eval(self.left, objectList), ctx.eval(self.right, objectList)
         )
 
+    def _cost(self) -> float:
+        return self.left._cost() + self.right._cost()
+
+    def _pointwise(self) -> bool:
+        return self.left._pointwise() and self.right._pointwise()
+
     def filterResults(self, r_left, r_right):
         raise NotImplementedError
 
@@ -543,8 +868,32 @@ class BinarySelector(Selector):
 class AndSelector(BinarySelector):
     """
     Intersection selector. Returns objects that is selected by both selectors.
+
+    The operand that is not pointwise or cheaper is evaluated first. A pointwise
+    operand is evaluated only on the result of the other one, and evaluation
+    stops if the first result is empty.
     """
 
+    def _filter(self, objectList: Sequence[Shape], ctx: _Context) -> List[Shape]:
+
+        first, second = self.left, self.right
+
+        if first._pointwise() == second._pointwise():
+            if second._cost() < first._cost():
+                first, second = second, first
+        elif first._pointwise():
+            first, second = second, first
+
+        r_first = ctx.eval(first, objectList)
+
+        if not r_first:
+            ctx.skip(second)
+            return []
+
+        r_second = ctx.eval(second, r_first if second._pointwise() else objectList)
+
+        return self.filterResults(r_first, r_second)
+
     def filterResults(self, r_left, r_right):
         # return intersection of lists
         return list(set(r_left) & set(r_right))
@@ -566,6 +915,20 @@ class SubtractSelector(BinarySelector):
     selectors results.
     """
 
+    def _filter(self, objectList: Sequence[Shape], ctx: _Context) -> List[Shape]:
+
+        r_left = ctx.eval(self.left, objectList)
+
+        if not r_left:
+            ctx.skip(self.right)
+            return []
+
+        r_right = ctx.eval(
+            self.right, r_left if self.right._pointwise() else objectList
+        )
+
+        return self.filterResults(r_left, r_right)
+
     def filterResults(self, r_left, r_right):
         return list(set(r_left) - set(r_right))
 
@@ -580,8 +943,16 @@ class InverseSelector(Selector):
         self.selector = selector
 
     def filter(self, objectList: Sequence[Shape]):
-        # note that Selector() selects everything
-        return SubtractSelector(Selector(), self.selector).filter(objectList)
+        return _Context().run(self, objectList)
+
+    def _filter(self, objectList: Sequence[Shape], ctx: _Context) -> List[Shape]:
+        return list(set(objectList) - set(ctx.eval(self.selector, objectList)))
+
+    def _cost(self) -> float:
+        return self.selector._cost()
+
+    def _pointwise(self) -> bool:
+        return self.selector._pointwise()
 
 
 def _makeGrammar():
@@ -750,6 +1121,26 @@ class _SimpleStringSyntaxSelector(Selector):
         """
         return self.mySelector.filter(objectList)
 
+    def _filter(self, objectList: Sequence[Shape], ctx: _Context) -> List[Shape]:
+        return self.mySelector._filter(objectList, ctx)
+
+    def _cost(self) -> float:
+        return self.mySelector._cost()
+
+    def _pointwise(self) -> bool:
+        return self.mySelector._pointwise()
+
+    def _label(self) -> str:
+
+        tokens = self.parseResults.asList()
+        text = "".join(t for t in tokens if isinstance(t, str))
+        index = "".join(i for t in tokens if isinstance(t, list) for i in t)
+
+        if index:
+            text += f"[{index}]"
+
+        return f"{self.mySelector._label()}({text})"
+
 
 def _makeExpressionGrammar(atom):
     """
@@ -805,6 +1196,54 @@ def _makeExpressionGrammar(atom):
 
 _expression_grammar = _makeExpressionGrammar(_grammar)
 
+# size of the cache of parsed selector strings
+SELECTOR_CACHE_SIZE = 512
+
+# cumulative parsing statistics
+_parse_stats: Dict[str, Union[int, float]] = {"parses": 0, "time": 0.0}
+
+
+@lru_cache(maxsize=SELECTOR_CACHE_SIZE)
+def _parseSelector(selectorString: str) -> Selector:
+    """
+    Parse a selector string into a selector tree. Selector trees are stateless,
+    so the result is cached and shared between StringSyntaxSelector instances.
+    """
+
+    t0 = perf_counter()
+    parse_result = _expression_grammar.parseString(selectorString, parseAll=True)
+
+    _parse_stats["parses"] += 1
+    _parse_stats["time"] += perf_counter() - t0
+
+    return parse_result.asList()[0]
+
+
+def selectorCacheInfo() -> Dict[str, Union[int, float]]:
+    """
+    Statistics of the selector string cache: hits, misses, maxsize, currsize,
+    number of parses and total parsing time in seconds.
+    """
+
+    info = _parseSelector.cache_info()
+
+    return dict(
+        hits=info.hits,
+        misses=info.misses,
+        maxsize=info.maxsize or 0,
+        currsize=info.currsize,
+        **_parse_stats,
+    )
+
+
+def clearSelectorCache():
+    """
+    Clear the selector string cache and reset the statistics.
+    """
+
+    _parseSelector.cache_clear()
+    _parse_stats.update(parses=0, time=0.0)
+
 
 class StringSyntaxSelector(Selector):
     r"""
@@ -862,11 +1301,19 @@ class StringSyntaxSelector(Selector):
         Feed the input string through the parser and construct an relevant complex selector object
         """
         self.selectorString = selectorString
-        parse_result = _expression_grammar.parseString(selectorString, parseAll=True)
-        self.mySelector = parse_result.asList()[0]
+        self.mySelector = _parseSelector(selectorString)
 
     def filter(self, objectList: Sequence[Shape]):
         """
         Filter give object list through th already constructed complex selector object
         """
         return self.mySelector.filter(objectList)
+
+    def _filter(self, objectList: Sequence[Shape], ctx: _Context) -> List[Shape]:
+        return ctx.eval(self.mySelector, objectList)
+
+    def _cost(self) -> float:
+        return self.mySelector._cost()
+
+    def _pointwise(self) -> bool:
+        return self.mySelector._pointwise()
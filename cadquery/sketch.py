@@ -36,7 +36,7 @@ from .occ_impl.shapes import (
     compound,
     VectorLike,
 )
-from .occ_impl.geom import Location, Vector
+from .occ_impl.geom import Location, LocationArray, Vector
 from .occ_impl.exporters import export
 from .occ_impl.importers.dxf import _importDXF
 from .occ_impl.sketch_solver import (
@@ -1092,6 +1092,10 @@ class Sketch(object):
     def moved(self: T, locs: Sequence[Location]) -> T:
         ...
 
+    @overload
+    def moved(self: T, locs: LocationArray) -> T:
+        ...
+
     @overload
     def moved(
         self: T,
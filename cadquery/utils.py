@@ -1,6 +1,12 @@
+from contextlib import contextmanager
 from functools import wraps
 from inspect import signature, isbuiltin
-from typing import TypeVar, Callable, cast
+from multiprocessing import get_all_start_methods, get_context
+from multiprocessing.context import BaseContext
+from os import PathLike, close, fspath, remove
+from shutil import copyfileobj
+from tempfile import mkstemp
+from typing import TypeVar, Callable, cast, IO, Iterator, Union
 from warnings import warn
 
 from multimethod import multimethod, DispatchError
@@ -83,3 +89,38 @@ def get_arity(f: TCallable) -> int:
         rv = f.__code__.co_argcount - n_defaults
 
     return rv
+
+
+def mpContext() -> BaseContext:
+    """
+    Multiprocessing context for worker pools. Forking a process that already
+    started OCCT threads is not safe, so fresh processes are used.
+    """
+
+    if "forkserver" in get_all_start_methods():
+        return get_context("forkserver")
+
+    return get_context("spawn")
+
+
+@contextmanager
+def pathOrTemp(f: Union[str, IO[bytes]], suffix: str = "") -> Iterator[str]:
+    """
+    Provide a path for writers that only accept file names. For streams a temporary
+    file is used and its content is copied to the stream afterwards.
+    """
+
+    if isinstance(f, (str, PathLike)):
+        yield fspath(f)
+        return
+
+    h, path = mkstemp(suffix)
+    close(h)
+
+    try:
+        yield path
+
+        with open(path, "rb") as tmp:
+            copyfileobj(tmp, f)
+    finally:
+        remove(path)
@@ -16,7 +16,7 @@ from cadquery.occ_impl.exporters.assembly import (
     exportVTKJS,
     exportVRML,
 )
-from cadquery.occ_impl.assembly import toJSON, toCAF, toFusedCAF
+from cadquery.occ_impl.assembly import toJSON, toCAF, toFusedCAF, countParts
 from cadquery.occ_impl.shapes import Face, box, cone, plane
 
 from OCP.gp import gp_XYZ
@@ -1334,6 +1334,176 @@ def test_export_errors(nested_assy):
         nested_assy.export("nested.step", mode="1234")
 
 
+@pytest.mark.parametrize(
+    "exportType, extension",
+    [
+        ("STEP", "step"),
+        ("XML", "xml"),
+        ("XBF", "xbf"),
+        ("VRML", "vrml"),
+        ("GLB", "glb"),
+        ("STL", "stl"),
+        ("VTKJS", "vtkjs.zip"),
+    ],
+)
+def test_export_stream(exportType, extension, tmpdir, nested_assy):
+
+    from io import BytesIO
+
+    f = BytesIO()
+    nested_assy.export(f, exportType)
+
+    with tmpdir:
+        nested_assy.export("nested." + extension.split(".")[0], exportType)
+
+        with open("nested." + extension, "rb") as ref:
+            data = ref.read()
+
+    # STEP files contain timestamps and ids counted per session, VTKJS archives
+    # contain timestamps
+    if exportType == "VTKJS":
+        assert len(f.getvalue()) == len(data)
+    elif exportType != "STEP":
+        assert f.getvalue() == data
+
+    if exportType in ("STEP", "XML", "XBF"):
+        fname = tmpdir / ("stream." + extension)
+
+        with open(fname, "wb") as out:
+            out.write(f.getvalue())
+
+        assy = cq.Assembly.load(str(fname))
+        assert [ch.name for ch in assy.children] == [
+            ch.name for ch in nested_assy.children
+        ]
+
+
+def test_export_stream_errors(nested_assy):
+
+    from io import BytesIO
+
+    with pytest.raises(ValueError):
+        nested_assy.export(BytesIO())
+
+    with pytest.raises(ValueError):
+        nested_assy.export(BytesIO(), "GLTF")
+
+
+def test_export_glb_quantized(tmpdir):
+
+    import json
+
+    from io import BytesIO
+    from struct import unpack
+    from numpy import array, eye, frombuffer, int16, sort
+    from cadquery.occ_impl.exporters.gltf import Y_UP
+
+    box = cq.Workplane().box(10, 10, 10).edges().fillet(1).val()
+
+    assy = cq.Assembly(name="top")
+    for i in range(5):
+        assy.add(
+            box, name=f"box{i}", loc=cq.Location((20 * i, 0, 0)), color=cq.Color("red")
+        )
+    assy.add(cq.Workplane().sphere(5), name="sphere", loc=cq.Location((0, 30, 0)))
+
+    ref = BytesIO()
+    assy.export(ref, "GLB", tolerance=0.01)
+
+    f = BytesIO()
+    assy.export(f, "GLB", tolerance=0.01, quantize=True)
+    data = f.getvalue()
+
+    assert len(data) < len(ref.getvalue())
+
+    magic, version, length = unpack("<3I", data[:12])
+    assert (magic, version, length) == (0x46546C67, 2, len(data))
+
+    n, _ = unpack("<2I", data[12:20])
+    doc = json.loads(data[20 : 20 + n])
+    buffer = data[28 + n :]
+
+    assert doc["extensionsRequired"] == ["KHR_mesh_quantization"]
+
+    # repeated boxes are stored once
+    assert len(doc["meshes"]) == 2
+    assert len(doc["nodes"]) == 7
+    assert len(doc["materials"]) == 1
+
+    node = next(n for n in doc["nodes"] if n["name"] == "top/box3")
+    (primitive,) = doc["meshes"][node["mesh"]]["primitives"]
+
+    position = doc["accessors"][primitive["attributes"]["POSITION"]]
+    view = doc["bufferViews"][position["bufferView"]]
+    assert position["componentType"] == 5122
+
+    q = frombuffer(buffer, int16, view["byteLength"] // 2, view["byteOffset"]).reshape(
+        -1, 4
+    )[:, :3]
+    M = array(node["matrix"]).reshape(4, 4).T
+    vertices = q @ M[:3, :3].T + M[:3, 3]
+
+    expected, _ = box.moved(cq.Location((60, 0, 0)))._tessellateArrays(0.01)
+    assert sort(vertices, 0) == pytest.approx(sort(expected, 0), abs=1e-3)
+
+    # one index range per face
+    ranges = primitive["extras"]["faceRanges"]
+    assert len(ranges) == len(box.Faces())
+    assert sum(c for _, c in ranges) == doc["accessors"][primitive["indices"]]["count"]
+
+    # file output
+    with tmpdir:
+        assy.export("quantized.glb", tolerance=0.01, quantize=True)
+
+        with open("quantized.glb", "rb") as out:
+            assert out.read() == data
+
+        with pytest.raises(ValueError):
+            assy.export("quantized.gltf", quantize=True)
+
+    def parse(assy, **kwargs):
+
+        f = BytesIO()
+        assy.export(f, "GLB", quantize=True, **kwargs)
+        data = f.getvalue()
+
+        n, _ = unpack("<2I", data[12:20])
+
+        return json.loads(data[20 : 20 + n]), data[20 + n :]
+
+    # the quantization step of a large part exceeds the tolerance
+    big = cq.Workplane().box(1000, 1000, 1000).val()
+    doc, rest = parse(cq.Assembly(big, name="big"), tolerance=1e-3)
+
+    (primitive,) = doc["meshes"][0]["primitives"]
+    position = doc["accessors"][primitive["attributes"]["POSITION"]]
+    view = doc["bufferViews"][position["bufferView"]]
+    assert position["componentType"] == 5126
+
+    vertices = frombuffer(rest[8:], "<f4", 3 * position["count"], view["byteOffset"])
+    M = array(doc["nodes"][1]["matrix"]).reshape(4, 4).T
+    expected, _ = big._tessellateArrays(1e-3)
+
+    assert M[:3, :3] == pytest.approx(eye(3))
+    assert sort(vertices.reshape(-1, 3), 0) == pytest.approx(
+        sort(expected, 0), abs=1e-3
+    )
+
+    # ... but not with a coarser tolerance
+    doc, _ = parse(cq.Assembly(big, name="big"), tolerance=0.1)
+    (primitive,) = doc["meshes"][0]["primitives"]
+    assert (
+        doc["accessors"][primitive["attributes"]["POSITION"]]["componentType"] == 5122
+    )
+
+    # nothing to mesh
+    doc, rest = parse(cq.Assembly(cq.Workplane().rect(1, 1), name="empty"))
+
+    assert doc["nodes"] == [{"name": "empty", "rotation": pytest.approx(Y_UP)}]
+    assert not {"meshes", "accessors", "bufferViews", "buffers"} & doc.keys()
+    assert rest == b""
+
+
 def test_save_stl_formats(nested_assy_sphere):
 
     # Binary export
@@ -2185,6 +2355,44 @@ def test_step_export_filesize(tmpdir):
     assert filesize[1] < 1.2 * filesize[0]
 
 
+def test_step_export_dedupe(tmpdir):
+    """
+    Same geometry added as different objects is written once per color.
+    """
+
+    N = 6
+    colors = (cq.Color("red"), cq.Color("green"))
+
+    assy = cq.Assembly()
+    for j in range(N):
+        assy.add(
+            cq.Workplane().box(1, 1, 1),
+            name=f"part{j}",
+            loc=cq.Location(x=2 * j),
+            color=colors[j % 2],
+        )
+    assy.add(cq.Workplane().sphere(1), name="sphere", loc=cq.Location(y=3))
+
+    assert countParts(toCAF(assy, True, dedupe=True)[1]) == (3, N + 1)
+    assert countParts(toCAF(assy, True)[1]) == (N + 1, N + 1)
+    assert countParts(toCAF(assy, dedupe=True)[1]) == (2, N + 1)
+
+    stepfile = Path(tmpdir) / "assy_dedupe.step"
+    assy.export(str(stepfile))
+    size = stepfile.stat().st_size
+
+    assy.export(str(stepfile), dedupe=False)
+    assert size < stepfile.stat().st_size / 2
+
+    # colors and locations survive the round trip
+    assy.export(str(stepfile))
+    imported = cq.Assembly.load(str(stepfile))
+
+    for j in range(N):
+        assert imported[f"part{j}"].color.toTuple() == approx(colors[j % 2].toTuple())
+        assert imported[f"part{j}"].loc.toTuple()[0] == approx((2 * j, 0, 0))
+
+
 def test_assembly_remove_no_name_match():
     """
     Tests to make sure that removing a part/subassembly with a name that does not exist fails.
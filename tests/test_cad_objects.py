@@ -2,6 +2,7 @@
 import math
 import pytest
 import unittest
+import numpy as np
 from tests import BaseTest
 from OCP.gp import gp_Vec, gp_Pnt, gp_Ax2, gp_Circ, gp_Elips, gp, gp_XYZ, gp_Trsf
 from OCP.BRepBuilderAPI import BRepBuilderAPI_MakeEdge
@@ -614,6 +615,37 @@ class TestCadObjects(BaseTest):
         for i, target_point in enumerate(target_vertices):
             self.assertTupleAlmostEquals(target_point, mirror_box_vertices[i], 7)
 
+    def testPlaneArrays(self):
+
+        from numpy import array
+
+        p = Plane(origin=(1, 2, 3), xDir=(1, 1, 0), normal=(0, 0, 1))
+        pts = [(1, 2, 3), (-4, 5, 0.5), (0, 0, 0)]
+
+        world = p.toWorldCoords(array(pts))
+        local = p.toLocalCoords(array(pts))
+
+        self.assertEqual(world.shape, (3, 3))
+
+        for w, l, pt in zip(world, local, pts):
+            self.assertTupleAlmostEquals(tuple(w), p.toWorldCoords(pt).toTuple(), 9)
+            self.assertTupleAlmostEquals(
+                tuple(l), p.toLocalCoords(Vector(pt)).toTuple(), 9
+            )
+
+        # 2D points
+        world2d = p.toWorldCoords(array(pts)[:, :2])
+
+        for w, pt in zip(world2d, pts):
+            self.assertTupleAlmostEquals(tuple(w), p.toWorldCoords(pt[:2]).toTuple(), 9)
+
+        # round trip after modification of the plane
+        p.origin = (0, 0, 1)
+
+        self.assertTrue(
+            (abs(p.toLocalCoords(p.toWorldCoords(array(pts))) - pts) < 1e-9).all()
+        )
+
     def testLocation(self):
 
         # empty
@@ -694,6 +726,65 @@ class TestCadObjects(BaseTest):
         self.assertTupleAlmostEquals(trans, (0, 0, 2), 6)
         self.assertTupleAlmostEquals(rot, (0, 15, 0), 6)
 
+    def testLocationArray(self):
+
+        locs = [Location(i, 2 * i, -i, 10, 20 * i, i) for i in range(5)]
+        loc = Location(1, 2, 3, 30, 40, 50)
+
+        arr = LocationArray(locs)
+
+        self.assertEqual(len(arr), 5)
+        self.assertEqual(arr.data.shape, (5, 3, 4))
+        self.assertEqual(len(arr[1:3]), 2)
+
+        def check(actual, expected):
+            self.assertEqual(len(actual), len(expected))
+
+            for l1, l2 in zip(actual, expected):
+                t1, r1 = l1.toTuple()
+                t2, r2 = l2.toTuple()
+
+                self.assertTupleAlmostEquals(t1, t2, 6)
+                self.assertTupleAlmostEquals(r1, r2, 6)
+
+        check([arr[1]], [locs[1]])
+        check(list(arr), locs)
+
+        # numpy integers and index arrays
+        self.assertIsInstance(arr[np.int64(2)], Location)
+        check([arr[np.argsort([3, 1, 2, 0, 4])[0]]], [locs[3]])
+        check(arr[np.nonzero([0, 1, 0, 1, 0])[0]], [locs[1], locs[3]])
+
+        # composition and inversion
+        check(arr * loc, [l * loc for l in locs])
+        check(loc * arr, [loc * l for l in locs])
+        check(arr * arr, [l * l for l in locs])
+        check(arr.inverse, [l.inverse for l in locs])
+
+        # construction from points
+        pl = Plane((1, 2, 3), (1, 1, 0), (0, 0, 1))
+        pts = [(1, 2, 3), (4, 5, 6)]
+
+        check(LocationArray.fromPoints(pts), [Location(p) for p in pts])
+        check(LocationArray.fromPoints(pts, pl), [Location(pl, p) for p in pts])
+
+        # instancing
+        box = Solid.makeBox(1, 1, 1)
+
+        c1 = box.moved(LocationArray.fromPoints(pts))
+        c2 = Compound.makeCompound([box, box.moved(z=2)], LocationArray(locs))
+
+        self.assertEqual(len(c1.Solids()), 2)
+        self.assertTrue(c1.Solids()[0].wrapped.IsPartner(box.wrapped))
+        self.assertTupleAlmostEquals(
+            c1.Solids()[1].Center().toTuple(), (4.5, 5.5, 6.5), 6
+        )
+        self.assertEqual(len(c2.Solids()), 10)
+        self.assertAlmostEqual(c2.Volume(), 10)
+
+        # single location
+        self.assertIsInstance(box.moved(LocationArray([loc])), Solid)
+
     def testEdgeWrapperRadius(self):
 
         # get a radius from a simple circle
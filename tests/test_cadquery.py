@@ -5,6 +5,9 @@
 # system modules
 import math, os.path, time, tempfile
 from pathlib import Path
+from pickle import loads, dumps
+from concurrent.futures import ProcessPoolExecutor
+from unittest.mock import patch
 from random import random
 from random import randrange
 from itertools import product
@@ -15,6 +18,8 @@ from pytest import approx, raises
 
 from cadquery import *
 from cadquery import occ_impl
+from cadquery import cq
+from cadquery.cq import CQContext
 from cadquery.occ_impl.shapes import *
 from tests import (
     BaseTest,
@@ -25,6 +30,20 @@ from tests import (
     makeCube,
 )
 
+
+def _sphere(loc):
+    """
+    Module level callback for the parallel each and eachpoint tests.
+    """
+
+    return Solid.makeSphere(0.5, angleDegrees1=-90).locate(loc)
+
+
+def _box(v):
+
+    return Solid.makeBox(1, 1, 1, pnt=v.Center())
+
+
 # test data directory
 testdataDir = Path(__file__).parent.joinpath("testdata")
 testFont = str(testdataDir / "OpenSans-Regular.ttf")
@@ -1390,6 +1409,24 @@ class TestCadQuery(BaseTest):
             self.assertTrue(all(pnt in s1.objects for pnt in s0.objects))
             self.assertEqual(s0.size(), s1.size())
 
+    def testPushPointsArray(self):
+
+        from numpy import array
+
+        w = Workplane("XZ", origin=(1, 2, 3))
+        pts = [(0, 1), (2, 3), (4, 5)]
+
+        s0 = w.pushPoints(pts)
+        s1 = w.pushPoints(array(pts))
+        s2 = w.pushPoints([Location(), *pts[1:]])
+
+        for p0, p1 in zip(s0.vals(), s1.vals()):
+            self.assertTupleAlmostEquals(p0.toTuple(), p1.toTuple(), 9)
+
+        self.assertTupleAlmostEquals(s0.vals()[0].toTuple(), (1, 2, 4), 9)
+        self.assertIsInstance(s2.vals()[0], Location)
+        self.assertTupleAlmostEquals(s2.vals()[2].toTuple(), (5, 2, 8), 9)
+
     def testPolarArray(self):
         radius = 10
 
@@ -3956,6 +3993,26 @@ class TestCadQuery(BaseTest):
         self.assertLessEqual(rt_bb.xmax, 0)
         self.assertLessEqual(rt_bb.ymax, 0)
 
+    def testTextCache(self):
+
+        flat = Compound.makeText("1011", 1, 0, fontPath=testFont)
+        r1 = Compound.makeText("1011", 1, 0.2, fontPath=testFont)
+        r2 = Compound.makeText("1011", 1, 0.2, fontPath=testFont, position=Plane.XZ())
+
+        self.assertTrue(r1.isValid())
+        self.assertEqual(len(r1.Solids()), 4)
+        self.assertAlmostEqual(r1.Volume(), 0.2 * flat.Area())
+
+        # identical glyphs are located instances of one cached extrusion
+        s1, s2 = r1.Solids()[0], r2.Solids()[0]
+
+        self.assertTrue(s1.wrapped.IsPartner(r1.Solids()[-1].wrapped))
+        self.assertTrue(s1.wrapped.IsPartner(s2.wrapped))
+        self.assertAlmostEqual(s1.Volume(), s2.Volume())
+        self.assertTupleAlmostEquals(
+            s2.Center().toTuple(), Plane.XZ().toWorldCoords(s1.Center()).toTuple(), 6
+        )
+
     def testParametricCurve(self):
 
         from math import sin, cos, pi
@@ -4050,6 +4107,53 @@ class TestCadQuery(BaseTest):
         self.assertTrue(solid.isInside((40, 40, 40)))
         self.assertFalse(solid.isInside((55, 55, 55)))
 
+    def testClassify(self):
+
+        IN, OUT, ON = 0, 1, 2
+
+        # solid with an internal void
+        void = Workplane("XY").box(10, 10, 10)
+        solid = Workplane("XY").box(100, 100, 100).cut(void).val()
+
+        pts = [(0, 0, 0), (40, 40, 40), (55, 55, 55), (50, 0, 0), (5, 0, 0)]
+
+        res = solid.classify(pts)
+
+        self.assertEqual(res.dtype.name, "int8")
+        self.assertEqual(list(res), [OUT, IN, OUT, ON, ON])
+
+        # consistent with isInside
+        grid = [
+            (x, y, z) for x in range(-60, 61, 15) for y in (-30, 7) for z in (1, 45)
+        ]
+        res = solid.classify(grid, chunksize=7)
+        self.assertEqual(
+            [r != OUT for r in res], [solid.isInside(p) for p in grid],
+        )
+
+        # threaded execution
+        res_threads = solid.classify(grid, threads=2, chunksize=7)
+        self.assertEqual(list(res_threads), list(res))
+
+        # ray parity on the triangulation
+        res_mesh = solid.classify(grid, mesh=0.1)
+        self.assertEqual(list(res_mesh), list(res))
+        self.assertEqual(list(solid.classify(pts[:3], mesh=0.1)), [OUT, IN, OUT])
+
+        # chunks of a single point give the same result
+        from numpy import asarray
+        from cadquery.occ_impl.shapes import _ray_parity
+
+        vertices, triangles = solid._tessellateArrays(0.1)
+        self.assertEqual(
+            list(_ray_parity(asarray(grid, dtype=float), vertices, triangles, 1)),
+            list(res),
+        )
+
+        # empty input
+        self.assertEqual(len(solid.classify([])), 0)
+        self.assertEqual(len(solid.classify([], mesh=0.1)), 0)
+
     def testWorkplaneCenterOptions(self):
         """
         Test options for specifying origin of workplane
@@ -4179,6 +4283,139 @@ class TestCadQuery(BaseTest):
         with raises(ValueError):
             w.findSolid()
 
+    def testFindSolidIndex(self):
+
+        r = Workplane().box(1, 1, 1)
+        for i in range(50):
+            r = r.faces(">Z").workplane().circle(0.1).extrude(0.1)
+
+        base = r
+        r = r.faces(">Z").workplane().rect(0.1, 0.1)
+
+        # the base is indexed in the context and found without walking the chain
+        expected = base.val().Solids()[0]
+
+        with patch("cadquery.cq._selectSolids", wraps=cq._selectSolids) as select:
+            self.assertTrue(r.findSolid().Solids()[0].isSame(expected))
+            self.assertTrue(r.findSolid(searchStack=False).Solids()[0].isSame(expected))
+            self.assertEqual(select.call_count, 2)
+
+        # stacks modified in place are taken into account
+        r.add(Workplane().sphere(1).val())
+        self.assertAlmostEqual(r.findSolid().Volume(), 4 / 3 * math.pi, 2)
+        self.assertEqual(len(r.end().findSolid().Solids()), 1)
+
+        # same results as without the index
+        r.ctx._bases.clear()
+        self.assertAlmostEqual(r.findSolid().Volume(), 4 / 3 * math.pi, 2)
+        self.assertEqual(len(r.end().findSolid().Solids()), 1)
+
+        # stacks modified through the objects list
+        w = Workplane().box(1, 1, 1).faces(">Z").workplane()
+        self.assertAlmostEqual(w.findSolid().Volume(), 1)
+
+        w.objects.append(Workplane().sphere(4).val())
+        self.assertAlmostEqual(w.findSolid().Volume(), 4 / 3 * math.pi * 64, 2)
+
+        w.objects.pop()
+        self.assertAlmostEqual(w.findSolid().Volume(), 1)
+
+        w.end().objects.clear()
+        self.assertAlmostEqual(w.findSolid().Volume(), 1)
+        w.end(2).objects[:] = []
+        self.assertIsNone(w._findType((Solid,)))
+
+        # the stack is wrapped once and shared with copies
+        w = Workplane().box(1, 1, 1).faces(">Z").workplane()
+        self.assertIs(w.objects, w.objects)
+
+        c = w.copyWorkplane(w)
+        self.assertIs(c.objects, w.objects)
+        self.assertAlmostEqual(c.findSolid().Volume(), 1)
+
+        c.objects.append(Workplane().sphere(4).val())
+        self.assertAlmostEqual(c.findSolid().Volume(), 4 / 3 * math.pi * 64, 2)
+
+        # and after unpickling
+        w = loads(dumps(Workplane().box(1, 1, 1).faces(">Z").workplane()))
+        self.assertAlmostEqual(w.findSolid().Volume(), 1)
+        w.objects.append(Workplane().sphere(4).val())
+        self.assertAlmostEqual(w.findSolid().Volume(), 4 / 3 * math.pi * 64, 2)
+
+    def testHistory(self):
+        def model(history, **kwargs):
+
+            w = Workplane()
+            w.ctx = CQContext(history, **kwargs)
+
+            r = w.box(10, 10, 10).tag("base")
+            for i in range(12):
+                r = r.faces(">Z").workplane().rect(1, 1).extrude(1)
+
+            return r.faces("<Z").workplane().hole(1)
+
+        ref = model("full")
+        ref_info = ref.historyInfo()
+
+        self.assertEqual(ref_info["trimmed"], 0)
+
+        for history in ("checkpoint", "tags"):
+            with tempfile.TemporaryDirectory() as d:
+                r = model(history, checkpoint=5, snapshotDir=d)
+                info = r.historyInfo()
+
+                self.assertEqual(info["nodes"], ref_info["nodes"])
+                self.assertGreater(info["trimmed"], 0)
+                self.assertLess(info["shapes"], ref_info["shapes"])
+                self.assertEqual(info["memory"], 0)
+                self.assertGreater(info["disk"], 0)
+                self.assertLessEqual(len(os.listdir(d)), info["trimmed"])
+
+                # results and navigation are not affected
+                self.assertAlmostEqual(r.val().Volume(), ref.val().Volume())
+                self.assertAlmostEqual(
+                    r.findSolid().Volume(), ref.findSolid().Volume(), 6
+                )
+                self.assertAlmostEqual(
+                    r.end(8).findSolid().Volume(), ref.end(8).findSolid().Volume(), 6
+                )
+                self.assertEqual(
+                    r.end(20).faces().size(), ref.end(20).faces().size(),
+                )
+                self.assertAlmostEqual(r._getTagged("base").val().Volume(), 1000)
+
+                # pickling does not depend on the snapshot files
+                r = loads(dumps(r))
+                self.assertAlmostEqual(
+                    r.end(8).findSolid().Volume(), ref.end(8).findSolid().Volume(), 6
+                )
+
+        # tagged objects are always retained
+        r = model("tags")
+        self.assertIsNone(r._getTagged("base")._snapshot)
+
+        # without a snapshot directory nothing is written ...
+        info = r.historyInfo()
+        self.assertGreater(info["trimmed"], 0)
+        self.assertEqual(info["memory"] + info["disk"], 0)
+
+        # ... and released shapes cannot be restored
+        with self.assertRaises(ValueError):
+            r.end(8).findSolid()
+
+        self.assertAlmostEqual(r.findSolid().Volume(), ref.findSolid().Volume(), 6)
+
+        # shapes that are still alive are restored
+        w = Workplane()
+        w.ctx = CQContext("tags")
+        box = w.box(1, 1, 1)
+        solid = box.val()
+        r = box.faces(">Z").workplane().hole(0.1)
+
+        self.assertIsNotNone(box._snapshot)
+        self.assertIs(box.val(), solid)
+        self.assertIsNone(box._snapshot)
+
     def testSlot2D(self):
 
         decimal_places = 9
@@ -5018,6 +5255,39 @@ class TestCadQuery(BaseTest):
         with raises(ValueError):
             w1.cutEach(lambda loc: c.located(loc))
 
+    def testCutEachPattern(self):
+
+        w = Workplane().box(10, 10, 1).faces(">Z").workplane()
+
+        # all instances share the same TShape and are cut in one operation
+        with patch.object(
+            Compound, "cut", autospec=True, side_effect=Compound.cut
+        ) as cut:
+            r = w.rarray(2, 2, 4, 4).hole(0.5)
+
+            tools = cut.call_args[0][1:]
+
+            cut.assert_called_once()
+            self.assertEqual(len(tools), 16)
+            self.assertTrue(all(t.wrapped.IsPartner(tools[0].wrapped) for t in tools))
+
+        self.assertEqual(r.faces().size(), 6 + 16)
+
+        # instances not reaching the solid are skipped
+        with patch.object(
+            Compound, "cut", autospec=True, side_effect=Compound.cut
+        ) as cut:
+            r = w.rarray(4, 4, 4, 4).hole(0.5)
+
+            self.assertEqual(len(cut.call_args[0]), 1 + 4)
+
+        self.assertEqual(r.faces().size(), 6 + 4)
+
+        # and the solid is not modified if none does
+        r = w.pushPoints([(20, 20)]).cskHole(0.5, 1, 90)
+
+        self.assertTrue(r.val().Solids()[0].isSame(w.findSolid().Solids()[0]))
+
     def testCutBlind(self):
         # cutBlind is already tested in several of the complicated tests, so this method is short.
         # test ValueError on no solid found
@@ -5439,6 +5709,44 @@ class TestCadQuery(BaseTest):
         with self.assertRaises(ValueError) as cm:
             box.faces().eachpoint(42)  # Integers not allowed
 
+    def testEachParallel(self):
+
+        pts = Workplane().rarray(2, 2, 3, 3)
+
+        ref = pts.eachpoint(_sphere, combine=True)
+        r = pts.eachpoint(_sphere, combine=True, parallel=2, chunksize=2)
+
+        self.assertEqual(len(r.objects), 1)
+        self.assertAlmostEqual(r.val().Volume(), ref.val().Volume(), 6)
+        self.assertEqual(len(r.val().Solids()), 9)
+
+        # workers are reused
+        pool = cq._pools[2]
+        r = pts.eachpoint(_sphere, True, parallel=2)
+
+        self.assertIs(cq._pools[2], pool)
+        self.assertEqual(len(r.vals()), 9)
+
+        # workers are not forked from this process
+        self.assertNotEqual(pool._mp_context.get_start_method(), "fork")
+
+        for parallel in (-1, 2.5, "2"):
+            with self.assertRaises(ValueError):
+                pts.eachpoint(_sphere, True, parallel=parallel)
+
+        with ProcessPoolExecutor(2) as ex:
+            ref = Workplane().box(10, 10, 1).faces(">Z").vertices().each(_box, True)
+            r = (
+                Workplane()
+                .box(10, 10, 1)
+                .faces(">Z")
+                .vertices()
+                .each(_box, True, parallel=ex)
+            )
+
+        self.assertAlmostEqual(r.val().Volume(), ref.val().Volume(), 6)
+        self.assertTrue(r.val().isValid())
+
     def testSketch(self):
 
         r1 = (
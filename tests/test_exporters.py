@@ -856,6 +856,454 @@ def test_tessellate(box123):
     assert len(triangles) == 12
 
 
+def test_export_many(tmpdir):
+
+    w = Workplane().box(1, 2, 3).faces(">Z").workplane().hole(0.5)
+    exts = ("stl", "amf", "tjs", "3mf", "step", "vtp", "glb")
+
+    # reference files written one by one
+    for ext in ("stl", "amf", "tjs"):
+        exporters.export(w.val().copy(), str(tmpdir / f"ref.{ext}"), tolerance=0.01)
+
+    res = exporters.export_many(
+        w,
+        [str(tmpdir / f"many.{ext}") for ext in exts]
+        + [(str(tmpdir / "coarse.out"), "STL", {"tolerance": 1})],
+        tolerance=0.01,
+    )
+
+    assert [r.exportType for r in res] == [e.upper() for e in exts] + ["STL"]
+
+    for r in res:
+        assert r.time >= 0
+        assert r.size == os.path.getsize(r.fname) > 0
+
+    # shared tessellation results in the same output
+    for ext in ("stl", "amf", "tjs"):
+        with open(tmpdir / f"ref.{ext}", "rb") as f1, open(
+            tmpdir / f"many.{ext}", "rb"
+        ) as f2:
+            assert f1.read() == f2.read()
+
+    # per target tolerance
+    assert res[-1].size < res[0].size
+
+    # assemblies
+    assy = Assembly().add(w, name="a").add(w, name="b", loc=Location((2, 0, 0)))
+    res = exporters.export_many(
+        assy, [str(tmpdir / "assy.step"), str(tmpdir / "assy.3mf")], threads=1
+    )
+
+    assert all(r.size > 0 for r in res)
+
+    with pytest.raises(ValueError):
+        exporters.export_many(w, ["out.xyz"])
+
+
+def test_3mf_streaming():
+
+    from zipfile import ZipFile
+    from xml.etree import ElementTree as ET
+    from cadquery.occ_impl.exporters.threemf import ThreeMFWriter
+
+    s = Workplane().sphere(1).val()
+    c = compound(s, s.copy().moved(Location((3, 0, 0))))
+    vertices, triangles = s.tessellate(1e-2)
+
+    # small chunks to write every block in several parts
+    f = io.BytesIO()
+    ThreeMFWriter(c, 1e-2, 0.1, chunksize=7).write3mf(f)
+
+    with ZipFile(f) as zf:
+        model = ET.fromstring(zf.read("3D/3dmodel.model"))
+
+    ns = {"m": "http://schemas.microsoft.com/3dmanufacturing/core/2015/02"}
+    meshes = model.findall("m:resources/m:object/m:mesh", ns)
+
+    assert len(meshes) == 2
+
+    for mesh in meshes:
+        vs = mesh.findall("m:vertices/m:vertex", ns)
+        ts = mesh.findall("m:triangles/m:triangle", ns)
+
+        assert len(vs) == len(vertices)
+        assert len(ts) == len(triangles)
+        assert tuple(int(ts[-1].get(k)) for k in ("v1", "v2", "v3")) == triangles[-1]
+
+    x0 = float(meshes[0].find("m:vertices/m:vertex", ns).get("x"))
+    x1 = float(meshes[1].find("m:vertices/m:vertex", ns).get("x"))
+
+    assert x0 == approx(vertices[0].x)
+    assert x1 == approx(vertices[0].x + 3)
+
+
+def test_3mf_amf_instances(tmpdir):
+
+    from zipfile import ZipFile
+    from xml.etree import ElementTree as ET
+
+    s = Workplane().box(1, 2, 3).val()
+    locs = [Location((3 * i, 0, 0), (0, 0, 1), 30 * i) for i in range(5)]
+    c = compound(Workplane().sphere(1).val(), *(s.moved(l) for l in locs))
+
+    exporters.export(c, str(tmpdir / "inst.3mf"))
+
+    with ZipFile(tmpdir / "inst.3mf") as zf:
+        model = ET.fromstring(zf.read("3D/3dmodel.model"))
+
+    ns = {"m": "http://schemas.microsoft.com/3dmanufacturing/core/2015/02"}
+    objects = model.findall("m:resources/m:object", ns)
+    components = model.findall(".//m:component", ns)
+
+    # sphere, box and the component
+    assert len(objects) == 3
+    assert len(components) == 6
+    assert "transform" not in components[0].attrib
+
+    # transformed mesh matches the moved shape
+    verts = [
+        [float(v.get(k)) for k in "xyz"]
+        for v in objects[1].findall("m:mesh/m:vertices/m:vertex", ns)
+    ]
+    m = [float(el) for el in components[-1].get("transform").split()]
+    x, y, z = verts[0]
+
+    ref = Vertex.makeVertex(x, y, z).moved(locs[-1]).Center()
+
+    assert (
+        x * m[0] + y * m[3] + z * m[6] + m[9],
+        x * m[1] + y * m[4] + z * m[7] + m[10],
+        x * m[2] + y * m[5] + z * m[8] + m[11],
+    ) == approx(ref.toTuple())
+
+    # AMF uses a constellation
+    exporters.export(c, str(tmpdir / "inst.amf"))
+    amf = ET.parse(tmpdir / "inst.amf").getroot()
+
+    assert len(amf.findall("object")) == 2
+    assert len(amf.findall("constellation/instance")) == 5
+    assert float(amf.find("constellation/instance[5]/rz").text) == approx(120)
+
+
+def test_tjs_buffers(tmpdir):
+
+    import json
+    from base64 import b64decode
+    from numpy import frombuffer, cross, einsum
+
+    def _read(fname, buffer=None):
+
+        with open(fname) as f:
+            doc = json.load(f)
+
+        if buffer is None:
+            buffer = b64decode(doc["buffers"][0]["uri"].split(",")[1])
+
+        def _array(acc, dtype):
+            return frombuffer(
+                buffer, dtype, acc["count"] * acc["itemSize"], acc["byteOffset"]
+            )
+
+        data = doc["data"]
+        attrs = data["attributes"]
+
+        return (
+            doc,
+            _array(attrs["position"], "<f4").reshape(-1, 3),
+            _array(attrs["normal"], "<f4").reshape(-1, 3)
+            if "normal" in attrs
+            else None,
+            _array(data["index"], "<u4").reshape(-1, 3),
+        )
+
+    box = Workplane().box(1, 2, 3)
+    verts, tris = box.val()._tessellateArrays(0.1)
+
+    # embedded buffer with normals and groups
+    exporters.export(
+        box,
+        str(tmpdir / "box.json"),
+        "TJS",
+        opt={"binary": True, "normals": True, "groups": True},
+    )
+    doc, pos, nor, idx = _read(tmpdir / "box.json")
+
+    assert doc["metadata"]["type"] == "BinaryMesh"
+    assert pos == approx(verts)
+    assert (idx == tris).all()
+    assert [g["count"] for g in doc["data"]["groups"]] == [6] * 6
+
+    # normals point to the same side as the triangles
+    tri = pos[idx]
+    fn = cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0])
+    assert (einsum("ij,ij->i", fn, nor[idx[:, 0]]) > 0).all()
+
+    # sidecar buffer
+    exporters.export(
+        box, str(tmpdir / "box2.json"), "TJS", opt={"binary": True, "buffers": "bin"}
+    )
+
+    with open(tmpdir / "box2.bin", "rb") as f:
+        doc, pos, nor, idx = _read(tmpdir / "box2.json", f.read())
+
+    assert doc["buffers"][0]["uri"] == "box2.bin"
+    assert nor is None
+    assert "groups" not in doc["data"]
+    assert (idx == tris).all()
+
+    # the binary format is selected explicitly
+    with pytest.raises(ValueError):
+        exporters.export(box, str(tmpdir / "box3.json"), "TJS", opt={"normals": True})
+
+
+@pytest.mark.parametrize(
+    "exportType",
+    ["STL", "STEP", "AMF", "SVG", "TJS", "DXF", "VRML", "VTP", "3MF", "BREP", "BIN"],
+)
+def test_export_stream(tmpdir, exportType):
+
+    from zipfile import ZipFile
+
+    box = Workplane().box(1, 2, 3)
+    fname = str(tmpdir / f"box.{exportType.lower()}")
+
+    exporters.export(box, fname, exportType)
+    data = exporters.toBytes(box, exportType)
+
+    with open(fname, "rb") as f:
+        ref = f.read()
+
+    if exportType == "STEP":
+        # the file contains a timestamp and ids counted per session
+        assert len(data) == len(ref)
+    elif exportType == "DXF":
+        # the header contains timestamps and a random id
+        assert len(ezdxf.read(io.StringIO(data.decode())).modelspace()) == len(
+            ezdxf.readfile(fname).modelspace()
+        )
+    elif exportType == "3MF":
+        # the archive and the model contain timestamps
+        date = re.compile(rb'"CreationDate">[^<]*')
+
+        with ZipFile(io.BytesIO(data)) as z1, ZipFile(fname) as z2:
+            assert z1.namelist() == z2.namelist()
+            assert [date.sub(b"", z1.read(n)) for n in z1.namelist()] == [
+                date.sub(b"", z2.read(n)) for n in z2.namelist()
+            ]
+    elif exportType == "BREP":
+        # files start with the name of the format
+        assert ref.endswith(data)
+    else:
+        assert data == ref
+
+    # user provided stream
+    with open(tmpdir / "stream", "wb") as f:
+        exporters.export(box, f, exportType)
+
+    assert os.path.getsize(tmpdir / "stream") > 0
+
+
+def test_export_stream_errors():
+
+    box = Workplane().box(1, 2, 3)
+
+    with pytest.raises(ValueError):
+        exporters.export(box, io.BytesIO())
+
+    with pytest.raises(ValueError):
+        exporters.toBytes(box, "TJS", opt={"binary": True, "buffers": "bin"})
+
+
+def test_stl_arrays(tmpdir):
+
+    from numpy import frombuffer, unique
+    from cadquery.occ_impl.exporters.stl import FACET, writeStl
+
+    box = Workplane().box(1, 1, 1).edges().fillet(0.2).val()
+    fname = str(tmpdir / "box.stl")
+
+    box.exportStl(fname, 1e-3)
+    vertices, triangles = box._tessellateArrays(1e-3)
+
+    data = io.BytesIO()
+    writeStl((vertices, triangles), data)
+
+    with open(fname, "rb") as f:
+        ref = frombuffer(f.read(), FACET, offset=84)
+
+    rv = frombuffer(data.getvalue(), FACET, offset=84)
+
+    assert len(data.getvalue()) == 84 + 50 * len(triangles)
+    assert len(rv) == len(ref) == len(triangles)
+
+    # same facets as StlAPI_Writer, normals of non-degenerate facets point outwards
+    assert unique(rv["vertices"].reshape(-1, 3), axis=0) == approx(
+        unique(ref["vertices"].reshape(-1, 3), axis=0)
+    )
+    lengths = (rv["normal"] ** 2).sum(1)
+    outwards = (rv["normal"] * rv["vertices"].mean(1)).sum(1)
+
+    assert lengths[lengths > 0] == approx(1, abs=1e-5)
+    assert outwards[lengths > 0].min() > 0
+
+    # degenerate triangles
+    data = io.BytesIO()
+    writeStl((vertices, triangles[:, (0, 0, 1)]), data)
+
+    assert not frombuffer(data.getvalue(), FACET, offset=84)["normal"].any()
+
+
+def test_tessellate_parallel():
+
+    from concurrent.futures import ThreadPoolExecutor
+    from cadquery.occ_impl.exporters.mesh import tessellateParallel
+
+    box = Workplane().box(1, 1, 1).edges().fillet(0.2).val()
+
+    vertices, triangles = box._tessellateArrays(1e-3)
+
+    # a thread pool avoids the startup cost of worker processes
+    with ThreadPoolExecutor(2) as ex:
+        rv = tessellateParallel(box, 1e-3, processes=2, executor=ex)
+
+    assert rv[0] == approx(vertices)
+    assert (rv[1] == triangles).all()
+
+    # serial fallback
+    rv = tessellateParallel(box, 1e-3, processes=1)
+
+    assert rv[0] == approx(vertices)
+    assert (rv[1] == triangles).all()
+
+
+def _crashingWrite(data, fname):
+
+    from cadquery.occ_impl.exporters import step
+
+    # simulates e.g. a segfault of the STEP writer
+    if fname.endswith("crash.step"):
+        os._exit(1)
+
+    return step._write(data, fname)
+
+
+def test_step_batch(tmpdir):
+
+    from OCP.Interface import Interface_Static
+    from OCP.STEPControl import STEPControl_Controller
+    from cadquery.occ_impl.exporters import exportStepBatch
+
+    STEPControl_Controller.Init_s()
+
+    boxes = [Workplane().box(i + 1, 1, 1).val() for i in range(5)]
+    items = [(b, str(tmpdir / f"box{i}.step")) for i, b in enumerate(boxes)]
+    items.insert(2, (boxes[0], str(tmpdir / "missing" / "box.step")))
+
+    mode = Interface_Static.IVal_s("write.surfacecurve.mode")
+
+    report = exportStepBatch(items, 2, unit="inch", precision=1e-3, write_pcurves=False)
+
+    # the calling process is not configured
+    assert Interface_Static.IVal_s("write.surfacecurve.mode") == mode
+
+    # results are reported per file in order
+    assert [r.fname for r in report.results] == [fname for _, fname in items]
+    assert [r.fname for r in report.failures] == [items[2][1]]
+    assert report.failures[0].error
+    assert report.throughput > 0
+
+    for r in report.results[:2] + report.results[3:]:
+        assert r.ok and r.size == os.path.getsize(r.fname)
+
+        with open(r.fname) as f:
+            content = f.read()
+
+        assert "INCH" in content
+        assert "PCURVE" not in content
+
+        # the precision is given in model units
+        precision = re.search(r"LENGTH_MEASURE\(([^)]*)\)", content).group(1)
+        assert float(precision) == approx(1e-3 / 25.4)
+
+    # values are scaled to the unit
+    assert importers.importStep(items[4][1]).val().BoundingBox().xlen == approx(4)
+
+    with pytest.raises(ValueError):
+        exportStepBatch(items, unit="parsec")
+
+
+def test_step_batch_crash(tmpdir, monkeypatch):
+
+    from cadquery.occ_impl.exporters import step, exportStepBatch
+
+    # workers import the replacement from this module
+    monkeypatch.setattr(step, "_write", _crashingWrite)
+
+    box = Workplane().box(1, 1, 1).val()
+    items = [(box, str(tmpdir / f"box{i}.step")) for i in range(5)]
+    items.insert(1, (box, str(tmpdir / "crash.step")))
+
+    report = exportStepBatch(items, 1)
+
+    # only the item that crashed the worker fails, the others are resubmitted
+    assert [r.fname for r in report.results] == [fname for _, fname in items]
+    assert [r.fname for r in report.failures] == [items[1][1]]
+    assert "BrokenProcessPool" in report.failures[0].error
+
+    for r in report.results[:1] + report.results[2:]:
+        assert r.ok and os.path.exists(r.fname)
+
+
+def test_svg_fast():
+
+    from cadquery.occ_impl.exporters.svg import getSVG
+
+    box = Workplane().box(1, 2, 3).val()
+
+    svg = getSVG(box, {"fast": True, "projectionDir": (0, 0, 1)})
+
+    # the outline of the box top is joined into one polyline
+    visible = svg.split("<!-- solid lines -->")[1]
+    assert visible.count("<path") == 1
+    assert visible.count("L") == 4
+
+    # an existing finer triangulation is used
+    sphere = Workplane().sphere(1).val()
+    coarse = getSVG(sphere.copy(), {"fast": True})
+
+    sphere.mesh(0.01, 0.05)
+    assert len(getSVG(sphere, {"fast": True})) > len(coarse)
+
+
+def test_svg_views(monkeypatch):
+
+    from cadquery.occ_impl.exporters import svg
+    from cadquery.occ_impl.exporters.svg import getSVG, getSVGViews
+
+    # workers are capped at the number of CPUs
+    monkeypatch.setattr(svg, "cpu_count", lambda: 2)
+
+    part = Workplane().box(10, 10, 2).faces(">Z").workplane().hole(3).val()
+    dirs = [(1, 0, 0), (0, 1, 0), (0, 0, 1), (1, 1, 1)]
+
+    expected = [getSVG(part, {"projectionDir": d}) for d in dirs]
+
+    # views sharing the HLR data structure match independent ones
+    assert getSVGViews(part, dirs, processes=1) == expected
+    assert getSVGViews(part, dirs, processes=2) == expected
+
+    fast = getSVGViews(part, dirs, {"fast": True}, processes=2)
+    assert fast == [getSVG(part, {"projectionDir": d, "fast": True}) for d in dirs]
+
+    # the pool is reused and does not fork
+    pool = svg._pools[2]
+    assert getSVGViews(part, dirs[:2], processes=4) == expected[:2]
+    assert svg._pools == {2: pool}
+    assert pool._mp_context.get_start_method() != "fork"
+
+    assert getSVGViews(part, []) == []
+
+
 def _dxf_spline_max_degree(fname):
 
     dxf = ezdxf.readfile(fname)
@@ -41,6 +41,7 @@ from cadquery.func import (
     check,
     Vector,
     closest,
+    PreparedShape,
     imprint,
     setThreads,
     project,
@@ -59,8 +60,9 @@ from cadquery.occ_impl.shapes import (
 
 from OCP.BOPAlgo import BOPAlgo_CheckStatus
 
-from pytest import approx, raises, fixture
+from pytest import approx, raises, fixture, mark
 from math import pi
+import gc
 
 #%% test utils
 
@@ -916,3 +918,59 @@ def test_closest():
     p1, p2 = closest(s1, s2)
 
     assert (p1 - p2).Length == approx(4)
+
+
+@mark.parametrize("threads", [None, 2])
+def test_prepared_shape(threads):
+
+    s = box(1, 1, 1)
+    others = [sphere(1).moved(x=x) for x in (5, 1.5, 10)]
+
+    ps = PreparedShape(s, threads)
+
+    assert ps.distance(others[0]) == approx(4)
+    assert ps.distances(*others) == approx([4, 0.5, 9])
+    assert ps.distances(*others) == approx(list(s.distances(*others)))
+
+    p1, p2 = ps.closest(others[1])
+    assert (p1 - p2).Length == approx(0.5)
+    assert p1.x == approx(0.5)
+
+    assert ps.clearance(others[1], 1)
+    assert not ps.clearance(others[1], 0.5)
+    assert not ps.clearance(others[2], 1)
+    assert ps.clearances(1, *others) == [False, True, False]
+
+    ix, d = ps.nearest(*others)
+    assert ix == 1
+    assert d == approx(0.5)
+
+    with raises(ValueError):
+        ps.nearest()
+
+    # batch queries reuse the threads and their prepared extrema
+    executor = ps._executor
+    ps.distances(*others)
+    assert ps._executor is executor
+
+    # threads are released
+    ps.close()
+    assert ps._executor is None
+    assert ps.distances(*others) == approx([4, 0.5, 9])
+
+    with PreparedShape(s, threads) as ps:
+        assert ps.clearances(1, *others) == [False, True, False]
+        executor = ps._executor
+
+    assert ps._executor is None
+
+    if threads:
+        assert executor._shutdown
+
+        ps = PreparedShape(s, threads)
+        ps.distances(*others)
+        executor = ps._executor
+
+        del ps
+        gc.collect()
+        assert executor._shutdown
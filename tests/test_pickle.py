@@ -1,5 +1,8 @@
+from io import BytesIO
 from pickle import loads, dumps
 
+from OCP.BinTools import BinTools_LocationSet
+
 from cadquery import (
     Vector,
     Matrix,
@@ -13,7 +16,7 @@ from cadquery import (
 )
 from cadquery.func import box
 
-from pytest import mark
+from pytest import mark, approx
 
 
 @mark.parametrize(
@@ -33,12 +36,67 @@ def test_simple(obj):
     assert isinstance(loads(dumps(obj)), type(obj))
 
 
+def test_location():
+
+    loc = Location(2, 3, 0) * Location((0, 0, 1), (0, 0, 1), 45)
+
+    T, R = loads(dumps(loc)).toTuple()
+
+    assert T == approx((2, 3, 1))
+    assert R == approx((0, 0, 45))
+
+    # identity is retained
+    assert loads(dumps(Location())).wrapped.IsIdentity()
+
+
+def test_legacy():
+
+    # states created by the previous pickling protocol can be still loaded
+    loc = Location(2, 3, 0) * Location((0, 0, 1), (0, 0, 1), 45)
+
+    stream = BytesIO()
+    ls = BinTools_LocationSet()
+    ls.Add(loc.wrapped)
+    ls.Write(stream)
+    stream.seek(0)
+
+    legacy = [
+        (Vector, (1.0, 2.0, 3.0)),
+        (Matrix, [[1.0, 0.0, 0.0, 1.0], [0.0, 1.0, 0.0, 2.0], [0.0, 0.0, 1.0, 3.0]]),
+        (Plane, (Vector(0, 1, 0), Vector(0, 0, 1), Vector(1, 0, 0), Vector(1, 2, 3))),
+        (Location, stream),
+    ]
+
+    objs = []
+
+    for cls, state in legacy:
+        obj = cls.__new__(cls)
+        obj.__setstate__(state)
+
+        # and are stored using the compact protocol
+        assert loads(dumps(obj)).__getstate__() == obj.__getstate__()
+
+        objs.append(obj)
+
+    v, m, pl, l = objs
+
+    assert v == Vector(1, 2, 3)
+    assert m[1, 3] == 2
+    assert pl == Plane((1, 2, 3), (0, 1, 0), (1, 0, 0))
+    assert l.toTuple()[0] == approx((2, 3, 1))
+
+
 def test_shape():
 
     s = Shape(box(1, 1, 1).wrapped)
 
     assert isinstance(loads(dumps(s)), Shape)
 
+    # subclasses are restored with downcasted OCCT objects
+    v = box(1, 1, 1).Vertices()[0]
+
+    assert loads(dumps(v)).Center() == v.Center()
+
 
 def test_assy():
 
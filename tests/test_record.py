@@ -0,0 +1,139 @@
+from unittest.mock import patch
+
+from pytest import approx, fixture, raises
+
+from cadquery import Workplane
+from cadquery.record import Param
+
+
+def model(length, diameter):
+
+    return (
+        Workplane()
+        .box(length, 4, 2)
+        .faces(">Z")
+        .workplane()
+        .rect(length / 2, 1)
+        .cutBlind(-1)
+        .union(Workplane().sphere(1))
+        .union(Workplane().box(1, 1, 10))
+        .faces(">Z")
+        .workplane()
+        .hole(diameter)
+    )
+
+
+@fixture
+def recorded():
+
+    L = Param("length", 10)
+    d = Param("diameter", 0.5)
+
+    return (
+        Workplane()
+        .record()
+        .box(L, 4, 2)
+        .faces(">Z")
+        .workplane()
+        .rect(L / 2, 1)
+        .cutBlind(-1)
+        .union(Workplane().sphere(1))
+        .union(Workplane().box(1, 1, 10))
+        .faces(">Z")
+        .workplane()
+        .hole(d)
+    )
+
+
+def test_record(recorded):
+
+    g = recorded.graph()
+
+    assert recorded.val().Volume() == approx(model(10, 0.5).val().Volume())
+    assert g.params() == {"length": 10, "diameter": 0.5}
+
+    r = g.replay(length=20, diameter=0.8)
+
+    assert isinstance(r, Workplane)
+    assert r.val().Volume() == approx(model(20, 0.8).val().Volume())
+
+    # defaults are used for missing parameters
+    assert g.replay().val().Volume() == approx(recorded.val().Volume())
+
+    # parents of the output are replayed too
+    assert r.end(5).val().Volume() == approx(model(20, 0.8).end(5).val().Volume())
+
+    with raises(ValueError):
+        g.replay(width=1)
+
+    with raises(ValueError):
+        Workplane().box(1, 1, 1).graph()
+
+
+def test_incremental(recorded):
+
+    g = recorded.graph()
+
+    # only the nodes downstream of a changed parameter are recomputed
+    with patch.object(
+        Workplane, "box", autospec=True, side_effect=Workplane.box
+    ) as box:
+        r = g.replay(diameter=0.8)
+
+        box.assert_not_called()
+
+    assert r.val().Volume() == approx(model(10, 0.8).val().Volume())
+
+    with patch.object(
+        Workplane, "box", autospec=True, side_effect=Workplane.box
+    ) as box:
+        r = g.replay(length=12, diameter=0.8)
+
+        box.assert_called_once()
+
+    assert r.val().Volume() == approx(model(12, 0.8).val().Volume())
+
+    # cached results are not modified by further operations
+    vol = r.val().Volume()
+    r.objects.clear()
+
+    assert g.replay(length=12, diameter=0.8).val().Volume() == approx(vol)
+
+
+def test_optimize(recorded):
+
+    g = recorded.graph()
+    o = g.optimize()
+
+    ops = [node.op for node in o.nodes]
+
+    # consecutive unions are merged
+    assert len(o) == len(g) - 1
+    assert ops.count("union") == 1
+
+    for params in ({}, {"length": 20, "diameter": 0.8}):
+        assert o.replay(**params).val().Volume() == approx(
+            g.replay(**params).val().Volume()
+        )
+
+
+def test_unused():
+
+    base = Workplane().record().box(1, 1, 1)
+
+    base.faces(">Z").workplane().circle(0.2).extrude(1)  # not used
+    r = base.faces("<Z").shell(0.1)
+
+    assert [node.op for node in r.graph().nodes] == [None, "box", "faces", "shell"]
+
+
+def test_expr():
+
+    a = Param("a", 2)
+    b = Param("b", 3)
+
+    e = (a + 1) * b - a / 2 + (-b) ** 2 + 1 - 2 * a
+
+    assert e.eval({}) == approx((2 + 1) * 3 - 1 + 9 + 1 - 4)
+    assert e.eval({"a": 4}) == approx((4 + 1) * 3 - 2 + 9 + 1 - 8)
+    assert e.params() == {"a": 2, "b": 3}
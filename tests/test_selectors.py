@@ -12,6 +12,7 @@ import math
 import unittest
 import sys
 import os.path
+from unittest.mock import patch
 
 # my modules
 from tests import BaseTest, makeUnitCube, makeUnitSquareWire
@@ -1102,6 +1103,141 @@ class TestCQSelectors(BaseTest):
 
         self.assertTupleAlmostEquals((0.0, 0.0, 1.0), v2.val().toTuple(), 3)
 
+    def testVectorizedSelectors(self):
+        """
+        Vectorized selectors give the same results as the scalar implementation
+        """
+
+        class ScalarParallel(ParallelDirSelector):
+            def test(self, vec):
+                return super().test(vec)
+
+        class ScalarDirection(DirectionSelector):
+            def test(self, vec):
+                return super().test(vec)
+
+        class ScalarPerpendicular(PerpendicularDirSelector):
+            def test(self, vec):
+                return super().test(vec)
+
+        class ScalarCenterNth(selectors.CenterNthSelector):
+            def key(self, obj):
+                return super().key(obj)
+
+        boxes = [
+            Solid.makeBox(1, 1, 1)
+            .rotate(Vector(), Vector(1, i % 3, i % 2), 45 * i + 0.5 * (i % 4))
+            .translate(Vector(i % 5, 0.25 * (i % 3), i // 10))
+            for i in range(40)
+        ]
+        shape = Compound.makeCompound(boxes)
+
+        def ids(objs):
+            return [id(o) for o in objs]
+
+        for objs in (shape.Faces(), shape.Edges()):
+            for d in (Vector(0, 0, 1), Vector(1, 1, 0), Vector(0.3, -0.2, 0.1)):
+                for tol in (1e-4, 0.3):
+                    for vectorized, scalar in (
+                        (ParallelDirSelector, ScalarParallel),
+                        (DirectionSelector, ScalarDirection),
+                        (PerpendicularDirSelector, ScalarPerpendicular),
+                    ):
+                        self.assertEqual(
+                            ids(vectorized(d, tol).filter(objs)),
+                            ids(scalar(d, tol).filter(objs)),
+                        )
+
+                    self.assertEqual(
+                        [
+                            ids(c)
+                            for c in selectors.CenterNthSelector(
+                                d, 0, True, tol
+                            ).cluster(objs)
+                        ],
+                        [
+                            ids(c)
+                            for c in ScalarCenterNth(d, 0, True, tol).cluster(objs)
+                        ],
+                    )
+
+        # objects without a key are dropped
+        with self.assertRaises(IndexError):
+            selectors.RadiusNthSelector(0).cluster(shape.Faces())
+
+    def testSelectorPlanner(self):
+        """
+        Compound selectors are planned without changing the results
+        """
+
+        w = Workplane().box(1, 2, 3).faces(">Z").workplane().hole(0.5)
+        faces = w.faces().vals()
+        edges = w.edges().vals()
+
+        def naive(sel, objs):
+            # evaluation of all operands on the full list
+            if isinstance(sel, selectors.StringSyntaxSelector):
+                return naive(sel.mySelector, objs)
+            elif isinstance(sel, selectors._SimpleStringSyntaxSelector):
+                return naive(sel.mySelector, objs)
+            elif isinstance(sel, selectors.BinarySelector):
+                return sel.filterResults(naive(sel.left, objs), naive(sel.right, objs))
+            elif isinstance(sel, selectors.InverseSelector):
+                return list(set(objs) - set(naive(sel.selector, objs)))
+            else:
+                return sel.filter(objs)
+
+        for expr, objs in (
+            ("(not >X[0] and #Z) or >Z[0]", faces),
+            ("%CYLINDER and >Z", faces),
+            ("#Z and %PLANE", faces),
+            ("not |Z", edges),
+            ("|Z exc %LINE", edges),
+            ("%CIRCLE exc <Z", edges),
+            ("(>Z or <Z) and %CIRCLE", edges),
+        ):
+            sel = selectors.StringSyntaxSelector(expr)
+            self.assertEqual(set(sel.filter(objs)), set(naive(sel, objs)))
+
+        # pointwise selectors are evaluated on the result of the other operand
+        plan = selectors.StringSyntaxSelector("%CYLINDER and >Z").explain(faces)
+        lines = plan.splitlines()
+
+        self.assertEqual(len(lines), 4)
+        self.assertTrue(lines[0].startswith("StringSyntaxSelector in=7 out=0"))
+        self.assertTrue(lines[1].startswith("  AndSelector in=7 out=0"))
+        self.assertTrue(
+            lines[2].startswith("    DirectionMinMaxSelector(>Z) in=7 out=1")
+        )
+        self.assertTrue(lines[3].startswith("    TypeSelector(%CYLINDER) in=1 out=0"))
+        self.assertTrue(lines[3].endswith("ms"))
+
+        # the cheaper of two pointwise selectors is evaluated first
+        plan = (ParallelDirSelector(Vector(0, 0, 1)) & TypeSelector("LINE")).explain(
+            edges
+        )
+        self.assertEqual(
+            [l.split(" in=")[0].strip() for l in plan.splitlines()],
+            ["AndSelector", "TypeSelector", "ParallelDirSelector"],
+        )
+
+        # empty intermediate results short-circuit the evaluation
+        plan = selectors.StringSyntaxSelector("%CONE and #Z").explain(faces)
+        self.assertTrue(plan.splitlines()[-1].endswith("skipped"))
+
+        plan = (
+            TypeSelector("CONE") - DirectionMinMaxSelector(Vector(0, 0, 1))
+        ).explain(faces)
+        self.assertTrue(plan.splitlines()[-1].endswith("skipped"))
+
+        # properties are computed once per object and call
+        center = Face.Center
+
+        with patch.object(Face, "Center", autospec=True, side_effect=center) as m:
+            sel = selectors.StringSyntaxSelector(">Z or <Z or >>Z[-2]")
+            self.assertEqual(len(sel.filter(faces)), len(faces))
+            self.assertEqual(m.call_count, len(faces))
+
     def testGrammar(self):
         """
         Test if reasonable string selector expressions parse without an error
@@ -1137,6 +1273,48 @@ class TestCQSelectors(BaseTest):
         for e in expressions:
             gram.parseString(e, parseAll=True)
 
+    def testSelectorCache(self):
+        """
+        Test that parsed selector strings are cached and reused
+        """
+
+        selectors.clearSelectorCache()
+
+        info = selectors.selectorCacheInfo()
+        self.assertEqual(info["currsize"], 0)
+        self.assertEqual(info["parses"], 0)
+        self.assertEqual(info["time"], 0)
+
+        s1 = selectors.StringSyntaxSelector("(not >X[0] and #XY) or >XY[0]")
+        s2 = selectors.StringSyntaxSelector("(not >X[0] and #XY) or >XY[0]")
+        s3 = selectors.StringSyntaxSelector(">Z")
+
+        self.assertIs(s1.mySelector, s2.mySelector)
+        self.assertIsNot(s1.mySelector, s3.mySelector)
+
+        info = selectors.selectorCacheInfo()
+        self.assertEqual(info["hits"], 1)
+        self.assertEqual(info["misses"], 2)
+        self.assertEqual(info["currsize"], 2)
+        self.assertEqual(info["parses"], 2)
+        self.assertGreater(info["time"], 0)
+        self.assertEqual(info["maxsize"], selectors.SELECTOR_CACHE_SIZE)
+
+        # shared selector trees give identical results
+        w = Workplane().box(1, 1, 1)
+        self.assertEqual(w.faces(">Z").size(), 1)
+        self.assertEqual(w.faces(">Z").val().Center().z, 0.5)
+        self.assertEqual(w.edges(">Z").size(), 4)
+
+        # invalid strings are not cached
+        with self.assertRaises(Exception):
+            selectors.StringSyntaxSelector(">Q")
+
+        self.assertEqual(selectors.selectorCacheInfo()["currsize"], 2)
+
+        selectors.clearSelectorCache()
+        self.assertEqual(selectors.selectorCacheInfo()["currsize"], 0)
+
     def testShape(self):
         """
         Test selectors with shapes
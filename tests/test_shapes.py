@@ -344,3 +344,54 @@ def test_addHole():
 
     assert len(f3.innerWires()) == 2
     assert f3.isValid()
+
+
+def test_tessellateArrays():
+
+    s = box(1, 1, 1).moved(x=1) + torus(5, 1)
+
+    verts, tris = s.tessellate(1e-2)
+    verts_arr, tris_arr = s._tessellateArrays(1e-2)
+
+    assert verts_arr.shape == (len(verts), 3)
+    assert tris_arr.shape == (len(tris), 3)
+    assert verts_arr.ravel().tolist() == approx([c for v in verts for c in v.toTuple()])
+    assert tris_arr.tolist() == [list(t) for t in tris]
+
+    verts_arr, tris_arr = compound()._tessellateArrays(1e-2)
+
+    assert verts_arr.shape == (0, 3)
+    assert tris_arr.shape == (0, 3)
+
+
+def test_array_input():
+
+    from numpy import array, linspace, meshgrid, stack
+
+    from cadquery.occ_impl.shapes import Edge, Face
+
+    pts = array([[0, 0, 0], [1, 1, 0], [2, 0, 1], [3, 2, 0]], dtype=float)
+    vecs = [Vector(*p) for p in pts.tolist()]
+
+    # arrays and Vectors give the same results
+    assert spline(pts).Length() == approx(spline(vecs).Length())
+    assert Edge.makeSpline(pts).Length() == approx(Edge.makeSpline(vecs).Length())
+    assert Edge.makeSpline(pts, parameters=array([0, 1, 2, 3])).Length() == approx(
+        Edge.makeSpline(vecs, parameters=[0, 1, 2, 3]).Length()
+    )
+    assert Edge.makeSplineApprox(pts).Length() == approx(
+        Edge.makeSplineApprox(vecs).Length()
+    )
+
+    # 2D points are placed in the XY plane
+    assert Edge.makeSpline(pts[:, :2]).Length() == approx(
+        Edge.makeSpline([Vector(x, y, 0) for x, y, _ in pts]).Length()
+    )
+
+    x, y = meshgrid(linspace(0, 1, 10), linspace(0, 1, 10), indexing="ij")
+    grid = stack((x, y, x ** 2), axis=-1)
+
+    f1 = Face.makeSplineApprox(grid)
+    f2 = Face.makeSplineApprox([[Vector(*p) for p in row] for row in grid.tolist()])
+
+    assert f1.Area() == approx(f2.Area())
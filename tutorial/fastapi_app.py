@@ -5,11 +5,11 @@ from typing import Dict, List, Optional
 import cadquery as cq
 from fastapi import Depends, FastAPI, File, HTTPException, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response
 from pydantic import BaseModel, validator
 
 from tutorial.sandbox.executor import execute_source
-from tutorial.sandbox.model_store import MODEL_STORE
+from tutorial.sandbox.model_store import CACHE_DIR, MODEL_STORE
 from tutorial.sandbox.selector import apply_selection, build_selection_preview
 
 BASE_DIR = Path(__file__).resolve().parent
@@ -164,7 +164,7 @@ async def compile_model(payload: CompileRequest = Depends(), file: UploadFile |
 @app.get('/api/model/{model_id}/mesh')
 async def download_mesh(model_id: str):
     record = MODEL_STORE.get(model_id)
-    return FileResponse(record.mesh_path, media_type='model/gltf-binary')
+    return Response(record.mesh, media_type='model/gltf-binary')
 
 
 @app.post('/api/selection/run')
@@ -196,8 +196,8 @@ async def run_selection(payload: SelectionRequest):
 
 @app.get('/api/selection/{model_id}/preview/{filename}')
 async def download_selection_preview(model_id: str, filename: str):
-    record = MODEL_STORE.get(model_id)
-    path = record.mesh_path.parent / filename
+    MODEL_STORE.get(model_id)
+    path = CACHE_DIR / filename
     if not path.exists():
         raise HTTPException(status_code=404, detail='Preview not found')
     return FileResponse(path, media_type='model/gltf-binary')
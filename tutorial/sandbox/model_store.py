@@ -1,7 +1,7 @@
 import os
-import tempfile
 import uuid
 from dataclasses import dataclass, field
+from io import BytesIO
 from pathlib import Path
 from typing import Dict
 
@@ -15,7 +15,7 @@ CACHE_DIR.mkdir(parents=True, exist_ok=True)
 class ModelRecord:
     model_id: str
     shape: cq.Shape
-    mesh_path: Path
+    mesh: bytes
     meta: Dict
     subshape_index: Dict[int, str] = field(default_factory=dict)
 
@@ -26,9 +26,11 @@ class ModelStore:
 
     def add(self, shape: cq.Shape, meta: Dict) -> ModelRecord:
         model_id = uuid.uuid4().hex
-        mesh_path = CACHE_DIR / f"{model_id}.glb"
-        cq.exporters.export(shape, str(mesh_path))
-        record = ModelRecord(model_id=model_id, shape=shape, mesh_path=mesh_path, meta=meta)
+        # the GLB is kept in memory and served directly, without a cache file;
+        # quantized meshes are decoded by the three.js GLTFLoader
+        mesh = BytesIO()
+        cq.Assembly().add(shape).export(mesh, 'GLB', quantize=True)
+        record = ModelRecord(model_id=model_id, shape=shape, mesh=mesh.getvalue(), meta=meta)
         record.subshape_index = self._build_index(shape)
         self._store[model_id] = record
         return record